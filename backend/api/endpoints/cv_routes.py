@@ -7,6 +7,8 @@ from datetime import datetime
 from services.mongodb_service import mongodb_service
 from modules.cv_processing.cv_parser import CVParser
 from modules.cv_processing.cv_validator import CVValidator
+from modules.employee_matching.feature_materializer import FeatureMaterializer
+from modules.employee_matching.ranking_cache import ranking_cache
 from utils.file_utils import allowed_file, save_file
 from utils.error_handlers import ValidationError, NotFoundError
 from utils.json_utils import serialize_mongo
@@ -58,9 +60,15 @@ def upload_cv():
         # Enhance the parsed data
         enhanced_cv = CVParser.enhance_parsed_data(parsed_cv)
 
+        # Materialize matching features so ranking doesn't re-derive them per request
+        FeatureMaterializer.materialize(enhanced_cv)
+
         # Store in MongoDB
         cv_id = mongodb_service.insert_one('Resumes', enhanced_cv)
 
+        # Add the new employee to the cached rankings it belongs in
+        ranking_cache.update_candidate(enhanced_cv)
+
         return jsonify({
             'success': True,
             'message': "CV uploaded and processed successfully",
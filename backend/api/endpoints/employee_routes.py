@@ -1,13 +1,23 @@
 from flask import Blueprint, request, jsonify
 from bson.objectid import ObjectId
+from datetime import datetime
 import json
 
 from services.mongodb_service import mongodb_service
 from services.openai_service import openai_service
+from services.allocation_service import allocation_service
 from modules.employee_matching.candidate_ranker import CandidateRanker
-from modules.employee_matching.skill_matcher import SkillMatcher
 from modules.employee_matching.experience_analyzer import ExperienceAnalyzer
+from modules.employee_matching.feature_materializer import FeatureMaterializer
+from modules.employee_matching.query_planner import CandidateQueryPlanner
+from modules.employee_matching.weight_profiles import WeightProfiles
+from modules.employee_matching.team_builder import TeamBuilder
+from modules.employee_matching.score_cache import ScoreCache
+from modules.employee_matching.ranking_cache import ranking_cache
+from modules.employee_matching.scoring_executor import scoring_executor
 from utils.error_handlers import ValidationError, NotFoundError
+from utils.pagination import make_fingerprint, paginate
+from utils.keyword_classifier import skill_category_classifier
 
 employee_blueprint = Blueprint('employees', __name__)
 
@@ -92,9 +102,17 @@ def update_employee(employee_id):
         if '_id' in data:
             del data['_id']
 
+        # Re-derive matching features from the updated resume
+        updated_employee = {**employee, **data}
+        FeatureMaterializer.materialize(updated_employee)
+        data['_derived'] = updated_employee['_derived']
+
         # Update the employee in MongoDB
         result = mongodb_service.update_one('Resumes', {'_id': object_id}, {'$set': data})
 
+        # Rescore only this employee in the cached rankings
+        ranking_cache.update_candidate(updated_employee)
+
         return jsonify({
             'success': True,
             'message': f"Employee updated successfully",
@@ -125,6 +143,7 @@ def delete_employee(employee_id):
 
         # Delete the employee from MongoDB
         result = mongodb_service.delete_one('Resumes', {'_id': object_id})
+        ranking_cache.remove_candidate(employee_id)
 
         return jsonify({
             'success': True,
@@ -162,27 +181,7 @@ def get_employee_skills(employee_id):
 
         # If no derived skill categories, create them
         if not skill_categories:
-            programming_keywords = ['python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php']
-            framework_keywords = ['react', 'angular', 'vue', 'django', 'flask', 'spring', 'laravel']
-            database_keywords = ['sql', 'mongodb', 'postgresql', 'mysql', 'oracle', 'nosql']
-
-            skill_categories = {
-                'programming': [],
-                'frameworks': [],
-                'databases': [],
-                'other': []
-            }
-
-            for skill in skills:
-                skill_lower = skill.lower()
-                if any(keyword in skill_lower for keyword in programming_keywords):
-                    skill_categories['programming'].append(skill)
-                elif any(keyword in skill_lower for keyword in framework_keywords):
-                    skill_categories['frameworks'].append(skill)
-                elif any(keyword in skill_lower for keyword in database_keywords):
-                    skill_categories['databases'].append(skill)
-                else:
-                    skill_categories['other'].append(skill)
+            skill_categories = skill_category_classifier.categorize(skills)
 
         # Prepare response
         skills_breakdown = {
@@ -203,6 +202,110 @@ def get_employee_skills(employee_id):
         }), 500
 
 
+@employee_blueprint.route('/weight-profiles', methods=['GET'])
+def get_weight_profiles():
+    """
+    Endpoint for listing built-in and stored scoring-weight profiles.
+    """
+    try:
+        stored_profiles = mongodb_service.find_many('WeightProfiles')
+
+        # Convert ObjectId to string for JSON serialization
+        for profile in stored_profiles:
+            profile['_id'] = str(profile['_id'])
+
+        builtin_profiles = [
+            {'name': name, 'weights': weights, 'builtin': True}
+            for name, weights in WeightProfiles.BUILTIN_PROFILES.items()
+        ]
+
+        return jsonify({
+            'success': True,
+            'data': builtin_profiles + stored_profiles
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Error retrieving weight profiles: {str(e)}"
+        }), 500
+
+
+@employee_blueprint.route('/weight-profiles/<profile_name>', methods=['PUT'])
+def save_weight_profile(profile_name):
+    """
+    Endpoint for creating or updating a named scoring-weight profile.
+    A profile with a project_type is used by default when matching for that project type.
+    """
+    try:
+        data = request.json
+
+        if not data or not data.get('weights'):
+            raise ValidationError("No weights provided")
+
+        try:
+            weights = WeightProfiles.normalize_weights(data['weights'])
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        profile = {
+            'name': profile_name,
+            'weights': weights,
+            'project_type': data.get('project_type'),
+            'updated_at': datetime.now()
+        }
+
+        mongodb_service.update_one('WeightProfiles', {'name': profile_name}, {'$set': profile}, upsert=True)
+
+        return jsonify({
+            'success': True,
+            'message': "Weight profile saved successfully",
+            'data': profile
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Error saving weight profile: {str(e)}"
+        }), 500
+
+
+@employee_blueprint.route('/details', methods=['POST'])
+def get_employee_details():
+    """
+    Endpoint for fetching several employees' details at once, e.g. after an ids_only match.
+    """
+    try:
+        data = request.json
+
+        if not data or not data.get('ids'):
+            raise ValidationError("No employee IDs provided")
+
+        object_ids = [ObjectId(employee_id) for employee_id in data['ids']]
+        employees = mongodb_service.find_many(
+            'Resumes', {'_id': {'$in': object_ids}}, CandidateQueryPlanner.build_detail_projection(data.get('fields'))
+        )
+
+        # Keep the requested order
+        employees_by_id = {str(employee['_id']): employee for employee in employees}
+        employees = [employees_by_id[employee_id] for employee_id in data['ids'] if employee_id in employees_by_id]
+
+        for employee in employees:
+            employee['_id'] = str(employee['_id'])
+
+        return jsonify({
+            'success': True,
+            'total': len(employees),
+            'data': employees
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Error retrieving employee details: {str(e)}"
+        }), 500
+
+
 @employee_blueprint.route('/match', methods=['POST'])
 def match_employees():
     """
@@ -223,47 +326,76 @@ def match_employees():
         # Get the number of employees to match
         people_count = int(project_criteria.get('people_count', 1))
 
-        # Get all employees from MongoDB
-        employees = mongodb_service.find_many('Resumes')
+        # Resolve scoring weights: explicit weights, a named profile, or the project type's stored profile
+        try:
+            weights = WeightProfiles.resolve_request_weights(data, project_criteria.get('project_type'))
+        except ValueError as e:
+            raise ValidationError(str(e))
 
-        # Filter employees by experience if field is specified
-        if 'field' in project_criteria and project_criteria['field']:
-            filtered_employees = []
-
-            for employee in employees:
-                experience_items = employee.get('Experience', [])
-                has_relevant_exp, _, _ = ExperienceAnalyzer.has_relevant_experience(
-                    experience_items, project_criteria['field']
-                )
+        # Re-materialize resumes left stale by an older features version, once per process
+        for resume in FeatureMaterializer.materialize_stale_once():
+            ranking_cache.update_candidate(resume)
 
-                if has_relevant_exp:
-                    filtered_employees.append(employee)
+        # Pin the resume and allocation versions the ranking is computed from; a cursor from an
+        # earlier version is rejected instead of slicing a ranking that has changed
+        ranking_version = [mongodb_service.get_version(ranking_cache.VERSION_NAME),
+                           mongodb_service.get_version(allocation_service.COLLECTION)]
 
-            employees = filtered_employees
-
-        if 'languages' in project_criteria and project_criteria['languages']:
-            filtered_employees = []
+        # Reuse the cached ranking for these criteria; resume updates keep it current
+        ranking_key = ScoreCache.criteria_key(project_criteria)
+        ranked_candidates = ranking_cache.get(ranking_key, project_criteria, weights)
 
-            for employee in employees:
-                employee_skills = employee.get('Skills', [])
-                project_languages = project_criteria.get('languages', '').split(',') if isinstance(
-                    project_criteria.get('languages'), str) else project_criteria.get('languages', [])
+        if ranked_candidates is None:
+            # Only plausible candidates, carrying just the fields scoring needs, come back from MongoDB
+            query_plan = CandidateQueryPlanner.plan(project_criteria)
+            employees = mongodb_service.find_many('Resumes', query_plan['filter'], query_plan['projection'])
 
-                # Check if employee has at least one required skill
-                similarity = SkillMatcher.calculate_skill_similarity(employee_skills, project_languages)
+            # Rank the candidates, across worker processes for large pools
+            ranked_candidates = scoring_executor.rank_candidates(employees, project_criteria, weights=weights)
+            ranking_cache.set(ranking_key, project_criteria, weights, ranked_candidates)
 
-                if similarity > 0:  # Employee has at least one matching skill
-                    # Add compatibility score to employee data
-                    employee['_compatibility'] = round(similarity * 100)
-                    filtered_employees.append(employee)
-
-            employees = filtered_employees
-
-        # Rank the candidates
-        ranked_candidates = CandidateRanker.rank_candidates(employees, project_criteria)
+        # Keep employees with experience relevant to the field if it is specified
+        if 'field' in project_criteria and project_criteria['field']:
+            ranked_candidates = [candidate_data for candidate_data in ranked_candidates
+                                 if candidate_data['scores']['experience_relevance'] >= 0.7]
 
-        # Select the top N candidates
-        top_candidates = CandidateRanker.select_best_candidates(ranked_candidates, count=people_count)
+        # Keep employees with at least one required skill
+        if 'languages' in project_criteria and project_criteria['languages']:
+            ranked_candidates = [candidate_data for candidate_data in ranked_candidates
+                                 if candidate_data['scores']['skill_match'] > 0]
+
+        # Exclude or down-rank employees fully booked on other projects
+        try:
+            ranked_candidates = allocation_service.get_index().apply_policy(
+                ranked_candidates, data.get('allocation_policy', 'exclude')
+            )
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        # Select the top N candidates, or the team that best covers the skills and roles together
+        team = None
+        if data.get('strategy') == 'team':
+            team = TeamBuilder.build_team(ranked_candidates, CandidateQueryPlanner.get_required_skills(project_criteria),
+                                          people_count, roles=data.get('roles'))
+            top_candidates = team['members']
+        else:
+            top_candidates = CandidateRanker.select_best_candidates(ranked_candidates, count=people_count)
+
+        # Page through the selected candidates
+        total_matches = len(top_candidates)
+        fingerprint = make_fingerprint(ScoreCache.criteria_key(project_criteria), weights, people_count,
+                                       data.get('strategy'), data.get('roles'), data.get('allocation_policy'),
+                                       ranking_version)
+        top_candidates, next_cursor = paginate(top_candidates, data.get('cursor'), data.get('page_size'), fingerprint)
+
+        # Fetch resume details for this page's candidates only, unless only IDs and scores are wanted
+        ids_only = bool(data.get('ids_only'))
+        if not ids_only:
+            top_ids = [candidate_data['candidate']['_id'] for candidate_data in top_candidates]
+            CandidateQueryPlanner.attach_details(
+                top_candidates, mongodb_service.find_many('Resumes', {'_id': {'$in': top_ids}},
+                                                          CandidateQueryPlanner.build_detail_projection(data.get('fields')))
+            )
 
         # Prepare response
         matched_employees = []
@@ -273,28 +405,51 @@ def match_employees():
             scores = candidate_data['scores']
             total_score = candidate_data['total_score']
 
-            # Convert ObjectId to string
-            candidate['_id'] = str(candidate['_id'])
-
-            # Get skill gap
-            candidate_skills = candidate.get('Skills', [])
-            project_languages = project_criteria.get('languages', '').split(',') if isinstance(
-                project_criteria.get('languages'), str) else project_criteria.get('languages', [])
-            skill_gap = SkillMatcher.get_skill_gap(candidate_skills, project_languages)
+            # Skill gap comes from the match explanation computed while scoring
+            skill_gap = scores['skill_compatibility']['missing_skills']
 
-            matched_employees.append({
-                'employee': candidate,
+            matched_employee = {
                 'scores': scores,
                 'total_score': total_score,
+                'allocation': candidate_data['allocation'],
                 'skill_gap': skill_gap
-            })
+            }
 
-        return jsonify({
+            if ids_only:
+                # Details are fetched lazily through /employees/details
+                matched_employee['employee_id'] = str(candidate['_id'])
+            else:
+                # Convert ObjectId to string on a copy, leaving the fetched or cached document as is
+                candidate = dict(candidate, _id=str(candidate['_id']))
+
+                # Add compatibility score to employee data
+                if project_criteria.get('languages'):
+                    candidate['_compatibility'] = round(scores['skill_match'] * 100)
+
+                matched_employee['employee'] = candidate
+
+            if team:
+                matched_employee['assigned_role'] = candidate_data['assigned_role']
+
+            matched_employees.append(matched_employee)
+
+        response = {
             'success': True,
             'matched_employees': matched_employees,
-            'total_candidates': len(employees),
-            'total_matches': len(matched_employees)
-        })
+            'weights': weights,
+            'total_candidates': len(ranked_candidates),
+            'total_matches': total_matches,
+            'next_cursor': next_cursor
+        }
+
+        if team:
+            response['team_coverage'] = {
+                'skill_coverage': team['skill_coverage'],
+                'uncovered_skills': team['uncovered_skills'],
+                'unfilled_roles': team['unfilled_roles']
+            }
+
+        return jsonify(response)
 
     except Exception as e:
         return jsonify({
@@ -350,6 +505,31 @@ def get_career_path(employee_id):
         }), 500
 
 
+@employee_blueprint.route('/<employee_id>/allocations', methods=['GET'])
+def get_employee_allocations(employee_id):
+    """
+    Endpoint for retrieving the projects, roles and date ranges an employee is allocated to.
+    """
+    try:
+        allocation_index = allocation_service.get_index()
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'allocations': allocation_index.get_allocations(employee_id),
+                'load': allocation_index.get_load(employee_id),
+                'capacity': allocation_index.capacity,
+                'over_allocated': allocation_index.is_over_allocated(employee_id)
+            }
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Error retrieving employee allocations: {str(e)}"
+        }), 500
+
+
 @employee_blueprint.route('/match-with-kpis', methods=['POST'])
 def match_employees_with_kpis():
     """
@@ -372,23 +552,67 @@ def match_employees_with_kpis():
         # Get the number of employees to match
         people_count = int(project_criteria.get('people_count', 5))
 
-        # Get all employees from MongoDB
-        employees = mongodb_service.find_many('Resumes')
-
         # Import candidate ranker here to avoid circular imports
         from modules.employee_matching.candidate_ranker import CandidateRanker
-        from modules.employee_matching.skill_matcher import SkillMatcher
         from modules.employee_matching.experience_analyzer import ExperienceAnalyzer
         from modules.kpi_generation.individual_kpi_generator import IndividualKPIGenerator
 
-        # Rank all candidates - include even those with partial matches
-        ranked_candidates = CandidateRanker.rank_candidates(
-            employees, project_criteria, include_all_matches=True
-        )
+        # Resolve scoring weights: explicit weights, a named profile, or the project type's stored profile
+        try:
+            weights = WeightProfiles.resolve_request_weights(data, project_criteria.get('project_type'))
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        # Re-materialize resumes left stale by an older features version, once per process
+        for resume in FeatureMaterializer.materialize_stale_once():
+            ranking_cache.update_candidate(resume)
+
+        # Pin the resume and allocation versions the ranking is computed from; a cursor from an
+        # earlier version is rejected instead of slicing a ranking that has changed
+        ranking_version = [mongodb_service.get_version(ranking_cache.VERSION_NAME),
+                           mongodb_service.get_version(allocation_service.COLLECTION)]
+
+        # Reuse the cached ranking for these criteria; resume updates keep it current
+        ranking_key = ScoreCache.criteria_key(project_criteria)
+        ranked_candidates = ranking_cache.get(ranking_key, project_criteria, weights)
+
+        if ranked_candidates is None:
+            # Only plausible candidates, carrying just the fields scoring needs, come back from MongoDB
+            query_plan = CandidateQueryPlanner.plan(project_criteria)
+            employees = mongodb_service.find_many('Resumes', query_plan['filter'], query_plan['projection'])
+
+            # Rank all candidates - include even those with partial matches
+            ranked_candidates = scoring_executor.rank_candidates(
+                employees, project_criteria, weights=weights, include_all_matches=True
+            )
+            ranking_cache.set(ranking_key, project_criteria, weights, ranked_candidates)
+
+        # Exclude or down-rank employees fully booked on other projects
+        try:
+            ranked_candidates = allocation_service.get_index().apply_policy(
+                ranked_candidates, data.get('allocation_policy', 'exclude')
+            )
+        except ValueError as e:
+            raise ValidationError(str(e))
 
         # Select the top N candidates
         top_candidates = CandidateRanker.select_best_candidates(ranked_candidates, count=people_count)
 
+        # Page through the selected candidates
+        total_matches = len(top_candidates)
+        fingerprint = make_fingerprint(ScoreCache.criteria_key(project_criteria), weights, people_count,
+                                       data.get('allocation_policy'), ranking_version)
+        top_candidates, next_cursor = paginate(top_candidates, data.get('cursor'), data.get('page_size'), fingerprint)
+
+        # Fetch resume details for this page's candidates only, unless only IDs and scores are wanted
+        ids_only = bool(data.get('ids_only'))
+        if not ids_only:
+            top_ids = [candidate_data['candidate']['_id'] for candidate_data in top_candidates]
+            CandidateQueryPlanner.attach_details(
+                top_candidates, mongodb_service.find_many('Resumes', {'_id': {'$in': top_ids}},
+                                                          CandidateQueryPlanner.build_detail_projection(data.get('fields')))
+            )
+
         # Prepare response
         matched_employees = []
 
@@ -398,36 +622,43 @@ def match_employees_with_kpis():
             total_score = candidate_data['total_score']
             compatibility_percentage = candidate_data.get('compatibility_percentage', 0)
 
-            # Convert ObjectId to string
-            candidate['_id'] = str(candidate['_id'])
+            # Compatibility details come from the match explanation computed while scoring
+            skill_compatibility = scores['skill_compatibility']
 
-            # Get skill gap and compatibility details
-            candidate_skills = candidate.get('Skills', [])
-            project_languages = project_criteria.get('languages', '').split(',') if isinstance(
-                project_criteria.get('languages'), str) else project_criteria.get('languages', [])
-            skill_compatibility = SkillMatcher.calculate_skill_compatibility(candidate_skills, project_languages)
-
-            # Generate specialized KPIs if project KPIs are provided
-            specialized_kpis = None
-            if project_kpis and role_criteria:
-                specialized_kpis = IndividualKPIGenerator.generate_individual_kpis(
-                    project_kpis, role_criteria, candidate
-                )
-
-            matched_employees.append({
-                'employee': candidate,
+            matched_employee = {
                 'scores': scores,
                 'total_score': total_score,
+                'allocation': candidate_data['allocation'],
                 'compatibility_percentage': compatibility_percentage,
-                'skill_compatibility': skill_compatibility,
-                'specialized_kpis': specialized_kpis
-            })
+                'skill_compatibility': skill_compatibility
+            }
+
+            if ids_only:
+                # Details and specialized KPIs are fetched lazily
+                matched_employee['employee_id'] = str(candidate['_id'])
+            else:
+                # Convert ObjectId to string on a copy, leaving the fetched or cached document as is
+                candidate = dict(candidate, _id=str(candidate['_id']))
+
+                # Generate specialized KPIs if project KPIs are provided
+                specialized_kpis = None
+                if project_kpis and role_criteria:
+                    specialized_kpis = IndividualKPIGenerator.generate_individual_kpis(
+                        project_kpis, role_criteria, candidate
+                    )
+
+                matched_employee['employee'] = candidate
+                matched_employee['specialized_kpis'] = specialized_kpis
+
+            matched_employees.append(matched_employee)
 
         return jsonify({
             'success': True,
             'matched_employees': matched_employees,
-            'total_candidates': len(employees),
-            'total_matches': len(matched_employees)
+            'weights': weights,
+            'total_candidates': len(ranked_candidates),
+            'total_matches': total_matches,
+            'next_cursor': next_cursor
         })
 
     except Exception as e:
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from flask import Blueprint, request, jsonify
 from bson.objectid import ObjectId
@@ -9,10 +9,18 @@ from services.chart_service import chart_service
 from modules.kpi_generation.kpi_generator import KPIGenerator
 from modules.kpi_generation.chart_generator import ChartGenerator
 from modules.kpi_generation.kpi_adjuster import KPIAdjuster
+from modules.kpi_generation.kpi_events import KPIEventProcessor
+from modules.kpi_generation.kpi_history import KPIHistory
+from modules.kpi_generation.kpi_recommender import KPIRecommender
+from modules.kpi_generation.project_scheduler import ProjectScheduler
+from modules.kpi_generation.kpi_rollups import KPIRollups
 from utils.error_handlers import ValidationError, NotFoundError
 
 kpi_blueprint = Blueprint('kpi', __name__)
 
+# How far back KPI history is read to find trends for recommendations, in days
+RECOMMENDATION_TREND_DAYS = 30
+
 
 @kpi_blueprint.route('/generate', methods=['POST'])
 def generate_kpis():
@@ -78,7 +86,7 @@ def create_project_kpis(project_id):
             raise NotFoundError(f"Project with ID {project_id} not found")
 
         # Generate KPIs
-        kpis = KPIGenerator.generate_kpis(data)
+        kpis = KPIGenerator.generate_kpis(data, project_id)
 
         # Generate Gantt chart data
         gantt_data = KPIGenerator.generate_gantt_chart_data(data)
@@ -145,6 +153,10 @@ def create_project_kpis(project_id):
             {'$set': {'kpi_id': kpi_id}}
         )
 
+        # Start the project's KPI history and add it to the portfolio rollups
+        KPIHistory.record(object_id, kpis, 'created', kpi_doc['created_at'])
+        KPIRollups.apply_change(None, kpis)
+
         return jsonify({
             'success': True,
             'message': "Project KPIs created successfully",
@@ -240,6 +252,68 @@ def get_project_chart(project_id, chart_type):
         }), 500
 
 
+@kpi_blueprint.route('/projects/<project_id>/schedule', methods=['POST'])
+def schedule_project(project_id):
+    """
+    Endpoint for timeline what-if scenarios: schedules the project locally with any of
+    project_type, project_timeline, project_sprints, project_team_size and
+    project_languages overridden, without changing the stored plan.
+    """
+    try:
+        data = request.json or {}
+
+        # Convert string ID to ObjectId
+        object_id = ObjectId(project_id)
+
+        # Get KPI document
+        kpi_doc = mongodb_service.find_one('ProjectKPIs', {'project_id': object_id})
+
+        if not kpi_doc:
+            raise NotFoundError(f"KPIs for project with ID {project_id} not found")
+
+        # Apply the scenario to the project details
+        details = dict(kpi_doc.get('project_details') or {})
+        details.update({key: value for key, value in data.items() if key in (
+            'project_type', 'project_timeline', 'project_sprints', 'project_team_size', 'project_languages'
+        )})
+
+        try:
+            project_type = details.get('project_type', 'Software Development')
+            timeline = int(details.get('project_timeline', 90))
+            sprints = int(details.get('project_sprints', 5))
+            team_size = int(details.get('project_team_size', 5))
+        except (TypeError, ValueError):
+            raise ValidationError("project_timeline, project_sprints and project_team_size must be integers")
+
+        if timeline <= 0 or sprints <= 0 or team_size <= 0:
+            raise ValidationError("project_timeline, project_sprints and project_team_size must be positive")
+
+        plan = ProjectScheduler.plan_project(project_type, timeline, sprints, team_size)
+        tasks = plan['tasks']
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'project_details': details,
+                'gantt_chart_data': [task.to_dict() for task in tasks],
+                'critical_path': [task.name for task in tasks if task.critical],
+                'duration': plan['duration'],
+                'fits_timeline': plan['fits_timeline'],
+                'overrun_days': plan['overrun_days'],
+                'sprint_breakdown': ProjectScheduler.plan_sprints(
+                    ProjectScheduler.build_sprint_tasks(project_type, details.get('project_languages', [])),
+                    sprints
+                )
+            }
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Error scheduling project: {str(e)}"
+        }), 500
+
+
 @kpi_blueprint.route('/projects/<project_id>/kpis/adjust', methods=['POST'])
 def adjust_project_kpis(project_id):
     """
@@ -260,35 +334,45 @@ def adjust_project_kpis(project_id):
         if not project:
             raise NotFoundError(f"Project with ID {project_id} not found")
 
-        # Get KPI document
-        kpi_doc = mongodb_service.find_one('ProjectKPIs', {'project_id': object_id})
-
-        if not kpi_doc:
-            raise NotFoundError(f"KPIs for project with ID {project_id} not found")
-
         # Extract project progress from request
         project_progress = data.get('project_progress', {})
 
         # Extract team performance from request
         team_performance = data.get('team_performance', None)
 
-        # Adjust KPIs based on progress
-        original_kpis = kpi_doc['kpis']
-        adjusted_kpis = KPIAdjuster.adjust_kpis_based_on_progress(
-            original_kpis,
-            project_progress,
-            team_performance
-        )
+        # Adjust the current KPIs and write them only if no other request changed them meanwhile;
+        # otherwise re-read and adjust them again
+        for _ in range(KPIEventProcessor.MAX_WRITE_ATTEMPTS):
+            kpi_doc = mongodb_service.find_one('ProjectKPIs', {'project_id': object_id})
 
-        # Update KPI document
-        mongodb_service.update_one(
-            'ProjectKPIs',
-            {'_id': kpi_doc['_id']},
-            {'$set': {
-                'kpis': adjusted_kpis,
-                'last_adjusted': datetime.now()
-            }}
-        )
+            if not kpi_doc:
+                raise NotFoundError(f"KPIs for project with ID {project_id} not found")
+
+            # Adjust KPIs based on progress
+            original_kpis = kpi_doc['kpis']
+            adjusted_kpis = KPIAdjuster.adjust_kpis_based_on_progress(
+                original_kpis,
+                project_progress,
+                team_performance
+            )
+
+            # Update KPI document
+            adjusted_at = datetime.now()
+            if mongodb_service.update_one(
+                    'ProjectKPIs',
+                    {'_id': kpi_doc['_id'], 'kpi_aggregates_version': kpi_doc.get('kpi_aggregates_version')},
+                    {'$set': {
+                        'kpis': adjusted_kpis,
+                        'last_adjusted': adjusted_at
+                    }, '$inc': {'kpi_aggregates_version': 1}}
+            ):
+                break
+        else:
+            raise ValidationError("KPIs were updated concurrently; please retry")
+
+        # Append the adjusted KPIs to the project's history
+        KPIHistory.record(object_id, adjusted_kpis, 'progress', adjusted_at)
+        KPIRollups.apply_change(original_kpis, adjusted_kpis)
 
         return jsonify({
             'success': True,
@@ -306,6 +390,90 @@ def adjust_project_kpis(project_id):
         }), 500
 
 
+@kpi_blueprint.route('/projects/kpis/adjust-batch', methods=['POST'])
+def adjust_kpis_batch():
+    """
+    Endpoint for rule-based adjustment of the KPIs of many projects at once, e.g. a nightly recalibration.
+    Expects {"projects": [{"project_id", "project_progress", "team_performance"}, ...]}.
+    """
+    try:
+        data = request.json
+
+        if not data or not isinstance(data.get('projects'), list) or not data['projects']:
+            raise ValidationError("projects must be a non-empty list")
+
+        try:
+            object_ids = [ObjectId(entry['project_id']) for entry in data['projects']]
+        except Exception:
+            raise ValidationError("Every project needs a valid project_id")
+
+        original_kpis = [None] * len(object_ids)
+        adjusted_kpis = [None] * len(object_ids)
+        adjusted_at = datetime.now()
+
+        # Adjust every project's KPIs in one batch, writing each only if no other request changed it
+        # meanwhile; projects that lost the race are re-read and adjusted again
+        pending = list(range(len(object_ids)))
+        for _ in range(KPIEventProcessor.MAX_WRITE_ATTEMPTS):
+            pending_ids = [object_ids[i] for i in pending]
+
+            # Get the pending KPI documents at once
+            kpi_docs = {kpi_doc['project_id']: kpi_doc
+                        for kpi_doc in mongodb_service.find_many('ProjectKPIs', {'project_id': {'$in': pending_ids}})}
+
+            missing_ids = [str(object_id) for object_id in pending_ids if object_id not in kpi_docs]
+            if missing_ids:
+                raise NotFoundError(f"KPIs not found for projects: {', '.join(missing_ids)}")
+
+            batch_kpis = KPIAdjuster.adjust_kpis_for_projects(
+                [kpi_docs[object_id]['kpis'] for object_id in pending_ids],
+                [data['projects'][i].get('project_progress') or {} for i in pending],
+                [data['projects'][i].get('team_performance') for i in pending]
+            )
+            for i, kpis in zip(pending, batch_kpis):
+                original_kpis[i] = kpi_docs[object_ids[i]]['kpis']
+                adjusted_kpis[i] = kpis
+
+            # Update all pending KPI documents in one round trip
+            modified = mongodb_service.bulk_update('ProjectKPIs', [
+                ({'_id': kpi_docs[object_ids[i]]['_id'],
+                  'kpi_aggregates_version': kpi_docs[object_ids[i]].get('kpi_aggregates_version')},
+                 {'$set': {'kpis': adjusted_kpis[i], 'last_adjusted': adjusted_at},
+                  '$inc': {'kpi_aggregates_version': 1}})
+                for i in pending
+            ])
+            if modified == len(pending):
+                break
+
+            # Projects whose stored KPIs aren't the ones just written were changed concurrently
+            stored = {kpi_doc['project_id']: kpi_doc['kpis']
+                      for kpi_doc in mongodb_service.find_many('ProjectKPIs', {'project_id': {'$in': pending_ids}},
+                                                               {'project_id': 1, 'kpis': 1})}
+            pending = [i for i in pending if stored.get(object_ids[i]) != adjusted_kpis[i]]
+            if not pending:
+                break
+        else:
+            raise ValidationError("KPIs were updated concurrently; please retry")
+
+        KPIHistory.record_many(list(zip(object_ids, adjusted_kpis)), 'batch_adjustment', adjusted_at)
+        KPIRollups.apply_changes(list(zip(original_kpis, adjusted_kpis)))
+
+        return jsonify({
+            'success': True,
+            'message': f"KPIs of {len(object_ids)} projects adjusted successfully",
+            'data': [
+                {'project_id': str(object_id), 'adjusted_kpis': kpis}
+                for object_id, kpis in zip(object_ids, adjusted_kpis)
+            ]
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Error adjusting KPIs: {str(e)}"
+        }), 500
+
+
 @kpi_blueprint.route('/projects/<project_id>/kpis/adjust-for-changes', methods=['POST'])
 def adjust_project_kpis_for_changes(project_id):
     """
@@ -326,46 +494,70 @@ def adjust_project_kpis_for_changes(project_id):
         if not project:
             raise NotFoundError(f"Project with ID {project_id} not found")
 
-        # Get KPI document
-        kpi_doc = mongodb_service.find_one('ProjectKPIs', {'project_id': object_id})
-
-        if not kpi_doc:
-            raise NotFoundError(f"KPIs for project with ID {project_id} not found")
-
         # Extract updated project details from request
         updated_project = data.get('updated_project', {})
 
         if not updated_project:
             raise ValidationError("No updated project details provided")
 
-        # Get original project details
-        original_project = kpi_doc['project_details']
+        # Diff against the current KPIs and write them only if no other request changed them
+        # meanwhile; otherwise re-read and diff them again
+        for _ in range(KPIEventProcessor.MAX_WRITE_ATTEMPTS):
+            kpi_doc = mongodb_service.find_one('ProjectKPIs', {'project_id': object_id})
 
-        # Adjust KPIs based on project changes
-        original_kpis = kpi_doc['kpis']
-        adjusted_kpis = KPIAdjuster.adjust_kpis_for_project_changes(
-            original_kpis,
-            original_project,
-            updated_project
-        )
+            if not kpi_doc:
+                raise NotFoundError(f"KPIs for project with ID {project_id} not found")
 
-        # Update KPI document
-        mongodb_service.update_one(
-            'ProjectKPIs',
-            {'_id': kpi_doc['_id']},
-            {'$set': {
-                'kpis': adjusted_kpis,
-                'project_details': updated_project,
-                'last_adjusted': datetime.now()
-            }}
-        )
+            # Get original project details
+            original_project = kpi_doc['project_details']
+
+            # Recompute only the KPIs that depend on the changed parameters
+            original_kpis = kpi_doc['kpis']
+            changed_kpis = KPIAdjuster.diff_kpis_for_project_changes(
+                original_kpis,
+                original_project,
+                updated_project
+            )
+
+            # Update only the changed KPIs and project details, dropping details the client removed
+            adjusted_at = datetime.now()
+            update = {f'kpis.{category}.{name}': kpi for (category, name), kpi in changed_kpis.items()}
+            update.update({f'project_details.{key}': value for key, value in updated_project.items()
+                           if original_project.get(key) != value})
+            update['last_adjusted'] = adjusted_at
+            operations = {'$set': update, '$inc': {'kpi_aggregates_version': 1}}
+
+            removed = {f'project_details.{key}': '' for key in original_project if key not in updated_project}
+            if removed:
+                operations['$unset'] = removed
+
+            if mongodb_service.update_one(
+                    'ProjectKPIs',
+                    {'_id': kpi_doc['_id'], 'kpi_aggregates_version': kpi_doc.get('kpi_aggregates_version')},
+                    operations
+            ):
+                break
+        else:
+            raise ValidationError("KPIs were updated concurrently; please retry")
+
+        KPIRollups.apply_kpi_changes(original_kpis, changed_kpis)
+
+        adjusted_kpis = {category: dict(kpis) if isinstance(kpis, dict) else kpis
+                         for category, kpis in original_kpis.items()}
+        for (category, name), kpi in changed_kpis.items():
+            adjusted_kpis.setdefault(category, {})[name] = kpi
+
+        # Append the adjusted KPIs to the project's history
+        if changed_kpis:
+            KPIHistory.record(object_id, adjusted_kpis, 'project_change', adjusted_at)
 
         return jsonify({
             'success': True,
             'message': "Project KPIs adjusted for changes successfully",
             'data': {
                 'original_kpis': original_kpis,
-                'adjusted_kpis': adjusted_kpis
+                'adjusted_kpis': adjusted_kpis,
+                'changed_kpis': [f'{category}.{name}' for category, name in changed_kpis]
             }
         })
 
@@ -376,6 +568,197 @@ def adjust_project_kpis_for_changes(project_id):
         }), 500
 
 
+@kpi_blueprint.route('/projects/<project_id>/kpis/events', methods=['POST'])
+def apply_project_kpi_events(project_id):
+    """
+    Endpoint for incrementally updating KPIs from project progress events.
+    Only the KPIs affected by the events are recalculated and written; AI-based
+    recalibration stays with the adjust endpoint.
+    """
+    try:
+        data = request.json
+
+        if not data:
+            raise ValidationError("No data provided")
+
+        # Accept a single event or a list of events
+        events = data.get('events', [data] if 'type' in data else [])
+
+        if not events:
+            raise ValidationError("No events provided")
+
+        # Convert string ID to ObjectId
+        object_id = ObjectId(project_id)
+
+        # Apply the events to the current KPIs and aggregates, and write them only if no other
+        # request changed the aggregates meanwhile; otherwise re-read and apply them again
+        for _ in range(KPIEventProcessor.MAX_WRITE_ATTEMPTS):
+            kpi_doc = mongodb_service.find_one('ProjectKPIs', {'project_id': object_id})
+
+            if not kpi_doc:
+                raise NotFoundError(f"KPIs for project with ID {project_id} not found")
+
+            try:
+                updated_kpis, aggregates = KPIEventProcessor.apply_events(
+                    kpi_doc['kpis'],
+                    kpi_doc.get('kpi_aggregates'),
+                    events
+                )
+            except ValueError as e:
+                raise ValidationError(str(e))
+
+            # Update only the affected KPIs and the running aggregates
+            updated_at = datetime.now()
+            update = {f'kpis.{category}.{name}': kpi for (category, name), kpi in updated_kpis.items()}
+            update.update({'kpi_aggregates': aggregates, 'last_event_at': updated_at})
+            if mongodb_service.update_one(
+                    'ProjectKPIs',
+                    {'_id': kpi_doc['_id'], 'kpi_aggregates_version': kpi_doc.get('kpi_aggregates_version')},
+                    {'$set': update, '$inc': {'kpi_aggregates_version': 1}}
+            ):
+                break
+        else:
+            raise ValidationError("KPIs were updated concurrently; please retry")
+
+        KPIRollups.apply_kpi_changes(kpi_doc['kpis'], updated_kpis)
+
+        kpis = kpi_doc['kpis']
+        for (category, name), kpi in updated_kpis.items():
+            kpis[category][name] = kpi
+
+        # Append the updated KPIs to the project's history
+        if updated_kpis:
+            KPIHistory.record(object_id, kpis, 'event', updated_at)
+
+        return jsonify({
+            'success': True,
+            'message': f"Applied {len(events)} event(s) to project KPIs",
+            'data': {
+                'updated_kpis': {f'{category}.{name}': kpi for (category, name), kpi in updated_kpis.items()},
+                'aggregates': aggregates
+            }
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Error applying KPI events: {str(e)}"
+        }), 500
+
+
+@kpi_blueprint.route('/portfolio/rollups', methods=['GET'])
+def get_portfolio_kpi_rollups():
+    """
+    Endpoint for KPI status and aggregates across all projects.
+    Served from the materialised rollups; pass refresh=true to recompute them from every project.
+    """
+    try:
+        if request.args.get('refresh', 'false').lower() == 'true':
+            KPIRollups.rebuild()
+
+        return jsonify({
+            'success': True,
+            'data': KPIRollups.get_portfolio()
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Error retrieving KPI rollups: {str(e)}"
+        }), 500
+
+
+@kpi_blueprint.route('/portfolio/recommendations', methods=['GET'])
+def get_portfolio_kpi_recommendations():
+    """
+    Endpoint for KPI recommendations across every project.
+    Optional query parameter priority limits the recommendations to one priority, e.g. "high".
+    """
+    try:
+        priority = request.args.get('priority')
+
+        kpi_docs = mongodb_service.find_many('ProjectKPIs', {}, {
+            'project_id': 1, 'kpis': 1, 'project_details': 1, 'kpi_aggregates': 1
+        })
+
+        # Read the recent history of every project at once
+        samples_by_project = KPIHistory.get_range_many(
+            [kpi_doc['project_id'] for kpi_doc in kpi_docs],
+            datetime.now() - timedelta(days=RECOMMENDATION_TREND_DAYS)
+        )
+
+        recommendations = KPIRecommender.recommend_many([
+            (
+                kpi_doc.get('kpis', {}),
+                KPIRecommender.trends_from_samples(samples_by_project.get(kpi_doc['project_id'], [])),
+                KPIRecommender.project_attributes(kpi_doc.get('project_details'), kpi_doc.get('kpi_aggregates'))
+            )
+            for kpi_doc in kpi_docs
+        ])
+
+        return jsonify({
+            'success': True,
+            'data': [
+                {
+                    'project_id': str(kpi_doc['project_id']),
+                    'recommendations': [recommendation for recommendation in project_recommendations
+                                        if not priority or recommendation['priority'] == priority]
+                }
+                for kpi_doc, project_recommendations in zip(kpi_docs, recommendations)
+            ]
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Error retrieving portfolio KPI recommendations: {str(e)}"
+        }), 500
+
+
+@kpi_blueprint.route('/projects/<project_id>/kpis/history', methods=['GET'])
+def get_project_kpi_history(project_id):
+    """
+    Endpoint for retrieving a project's KPI history.
+    Query parameters: start and end (ISO dates), kpis (comma-separated "category.name" keys)
+    and interval ("day", "week", "sprint", "month" or a number of days) to downsample.
+    """
+    try:
+        # Convert string ID to ObjectId
+        object_id = ObjectId(project_id)
+
+        try:
+            start = datetime.fromisoformat(request.args['start']) if request.args.get('start') else None
+            end = datetime.fromisoformat(request.args['end']) if request.args.get('end') else None
+        except ValueError:
+            raise ValidationError("start and end must be ISO dates")
+
+        kpi_keys = [key.strip() for key in request.args.get('kpis', '').split(',') if key.strip()]
+
+        samples = KPIHistory.get_range(object_id, start, end, kpi_keys or None)
+
+        interval = request.args.get('interval')
+        if interval:
+            try:
+                interval = float(interval)
+            except ValueError:
+                pass
+            try:
+                samples = KPIHistory.downsample(samples, interval, origin=start)
+            except ValueError as e:
+                raise ValidationError(str(e))
+
+        return jsonify({
+            'success': True,
+            'data': [dict(sample, t=sample['t'].isoformat()) for sample in samples]
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Error retrieving KPI history: {str(e)}"
+        }), 500
+
+
 @kpi_blueprint.route('/projects/<project_id>/recommendations', methods=['GET'])
 def get_project_kpi_recommendations(project_id):
     """
@@ -397,25 +780,14 @@ def get_project_kpi_recommendations(project_id):
         if not kpi_doc:
             raise NotFoundError(f"KPIs for project with ID {project_id} not found")
 
-        # Generate recommendations based on current KPIs
+        # Generate recommendations from current KPIs, their recent trends and the project
         try:
-            kpis = kpi_doc.get('kpis', {})
-            recommendations = []
-
-            # Check for KPIs that are at risk or below target
-            for category, metrics in kpis.items():
-                for metric_name, metric_data in metrics.items():
-                    if metric_data.get('status') in ['At Risk', 'Below Target']:
-                        recommendations.append({
-                            'title': f"Improve {metric_name.replace('_', ' ').title()}",
-                            'description': f"This {category} metric is currently {metric_data.get('status').lower()}. Current value: {metric_data.get('value')}, Target: {metric_data.get('target')}.",
-                            'actionItems': [
-                                f"Review {category} practices related to {metric_name.replace('_', ' ')}",
-                                f"Consider adjusting the target if it's unrealistic for this project"
-                            ],
-                            'priority': 'high' if metric_data.get('status') == 'Below Target' else 'medium',
-                            'category': category
-                        })
+            samples = KPIHistory.get_range(object_id, datetime.now() - timedelta(days=RECOMMENDATION_TREND_DAYS))
+            recommendations = KPIRecommender.recommend(
+                kpi_doc.get('kpis', {}),
+                KPIRecommender.trends_from_samples(samples),
+                KPIRecommender.project_attributes(kpi_doc.get('project_details'), kpi_doc.get('kpi_aggregates'))
+            )
 
             return jsonify({
                 'success': True,
@@ -4,7 +4,10 @@ import json
 from datetime import datetime
 
 from services.mongodb_service import mongodb_service
+from services.allocation_service import allocation_service
+from modules.kpi_generation.kpi_rollups import KPIRollups
 from utils.error_handlers import ValidationError, NotFoundError
+from utils.pagination import make_fingerprint, paginate
 
 project_blueprint = Blueprint('projects', __name__)
 
@@ -140,6 +143,15 @@ def update_project(project_id):
         # Update the project in MongoDB
         result = mongodb_service.update_one('Projects', {'_id': object_id}, {'$set': data})
 
+        # Keep allocations in step when the team, dates or status change
+        if any(key in data for key in ('team', 'status', 'start_date', 'end_date', 'project_timeline')):
+            project.update(data)
+            try:
+                allocation_service.sync_project(project)
+            except Exception as e:
+                # The project is saved either way; its allocations catch up on the next team change
+                print(f"Error syncing allocations for project {project_id}: {str(e)}")
+
         return jsonify({
             'success': True,
             'message': f"Project updated successfully",
@@ -170,10 +182,17 @@ def delete_project(project_id):
 
         # Delete any related KPIs
         if 'kpi_id' in project and project['kpi_id']:
-            mongodb_service.delete_one('ProjectKPIs', {'_id': project['kpi_id']})
+            kpi_doc = mongodb_service.find_one('ProjectKPIs', {'_id': project['kpi_id']})
+            if kpi_doc:
+                mongodb_service.delete_one('ProjectKPIs', {'_id': kpi_doc['_id']})
+                KPIRollups.apply_change(kpi_doc.get('kpis'), None)
 
         # Delete the project from MongoDB
         result = mongodb_service.delete_one('Projects', {'_id': object_id})
+        allocation_service.remove_project(project_id)
+
+        from modules.employee_matching.ranking_cache import ranking_cache
+        ranking_cache.invalidate(project_id)
 
         return jsonify({
             'success': True,
@@ -238,6 +257,7 @@ def get_project_team(project_id):
 def match_employees_to_project(project_id):
     """
     Endpoint for matching employees to a project.
+    The first page matches and stores the project's team; later pages are served from that team.
     """
     try:
         # Convert string ID to ObjectId
@@ -249,93 +269,366 @@ def match_employees_to_project(project_id):
         if not project:
             raise NotFoundError(f"Project with ID {project_id} not found")
 
-        # Get all employees from MongoDB
-        employees = mongodb_service.find_many('Resumes')
-
-        # Get project criteria
-        project_criteria = {
-            'languages': project.get('project_languages', ''),
-            'field': project.get('project_type', 'Software Development'),
-            'people_count': project.get('project_team_size', 1),
-            'project_type': project.get('project_type', 'Software Development')
-        }
-
         # Import candidate ranker here to avoid circular imports
         from modules.employee_matching.candidate_ranker import CandidateRanker
-        from modules.employee_matching.skill_matcher import SkillMatcher
-        from modules.employee_matching.experience_analyzer import ExperienceAnalyzer
-
-        # Filter employees by experience if field is specified
-        if 'field' in project_criteria and project_criteria['field']:
-            filtered_employees = []
+        from modules.employee_matching.feature_materializer import FeatureMaterializer
+        from modules.employee_matching.query_planner import CandidateQueryPlanner
+        from modules.employee_matching.weight_profiles import WeightProfiles
+        from modules.employee_matching.team_builder import TeamBuilder
+        from modules.employee_matching.allocation_index import AllocationIndex
+        from modules.employee_matching.ranking_cache import ranking_cache
+        from modules.employee_matching.scoring_executor import scoring_executor
 
-            for employee in employees:
-                experience_items = employee.get('Experience', [])
-                has_relevant_exp, _, _ = ExperienceAnalyzer.has_relevant_experience(
-                    experience_items, project_criteria['field']
+        # Get project criteria
+        project_criteria = CandidateQueryPlanner.get_project_criteria(project)
+
+        request_data = request.get_json(silent=True) or {}
+
+        # Resolve scoring weights: explicit weights, a named profile, or the project type's stored profile
+        try:
+            weights = WeightProfiles.resolve_request_weights(request_data, project_criteria.get('project_type'))
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        query_plan = CandidateQueryPlanner.plan(project_criteria)
+        allocation_policy = request_data.get('allocation_policy', 'exclude')
+
+        if request_data.get('cursor'):
+            # Later pages come from the team stored with the first page: the match is not re-run,
+            # the team is not rewritten, and the order cannot shift between pages
+            team_data = project.get('team', {})
+            employee_ids = team_data.get('employee_ids', [])
+            match_summary = team_data.get('match') or {}
+
+            fingerprint = make_fingerprint(project_id, employee_ids, weights)
+            page_employee_ids, next_cursor = paginate(employee_ids, request_data.get('cursor'),
+                                                      request_data.get('page_size'), fingerprint)
+
+            # Take the page's scores from the cached ranking, scoring members missing from it
+            cached = {str(candidate_data['candidate']['_id']): candidate_data
+                      for candidate_data in ranking_cache.get(project_id, project_criteria, weights) or []}
+            missing_ids = [ObjectId(employee_id) for employee_id in page_employee_ids if employee_id not in cached]
+            if missing_ids:
+                missing_employees = mongodb_service.find_many('Resumes', {'_id': {'$in': missing_ids}},
+                                                              query_plan['projection'])
+                for candidate_data in CandidateRanker.rank_candidates(missing_employees, project_criteria,
+                                                                      weights=weights):
+                    cached[str(candidate_data['candidate']['_id'])] = candidate_data
+
+            # Members already passed the allocation policy when the team was matched
+            try:
+                page = allocation_service.get_index().apply_policy(
+                    [cached[employee_id] for employee_id in page_employee_ids if employee_id in cached],
+                    'ignore' if allocation_policy == 'exclude' else allocation_policy, exclude_project_id=project_id
                 )
-
-                if has_relevant_exp:
-                    filtered_employees.append(employee)
-
-            employees = filtered_employees
-
-        # Rank the candidates
-        ranked_candidates = CandidateRanker.rank_candidates(employees, project_criteria)
-
-        # Select the top N candidates
-        people_count = int(project_criteria.get('people_count', 1))
-        top_candidates = CandidateRanker.select_best_candidates(ranked_candidates, count=people_count)
+            except ValueError as e:
+                raise ValidationError(str(e))
+            page.sort(key=lambda candidate_data: page_employee_ids.index(str(candidate_data['candidate']['_id'])))
+
+            team_coverage = match_summary.get('team_coverage')
+            assigned_roles = match_summary.get('assigned_roles', {})
+            if team_coverage is not None:
+                for candidate_data in page:
+                    candidate_data['assigned_role'] = assigned_roles.get(str(candidate_data['candidate']['_id']))
+
+            total_candidates = match_summary.get('total_candidates', len(employee_ids))
+            total_matches = len(employee_ids)
+        else:
+            # Re-materialize resumes left stale by an older features version, once per process
+            for resume in FeatureMaterializer.materialize_stale_once():
+                ranking_cache.update_candidate(resume)
+
+            # Reuse the project's cached ranking; resume updates keep it current
+            ranked_candidates = ranking_cache.get(project_id, project_criteria, weights)
+
+            if ranked_candidates is None:
+                # Only plausible candidates, carrying just the fields scoring needs, come back from MongoDB
+                employees = mongodb_service.find_many('Resumes', query_plan['filter'], query_plan['projection'])
+
+                # Rank the candidates, across worker processes for large pools
+                ranked_candidates = scoring_executor.rank_candidates(employees, project_criteria, weights=weights)
+                ranking_cache.set(project_id, project_criteria, weights, ranked_candidates)
+
+            # Keep employees with experience relevant to the field if it is specified
+            if 'field' in project_criteria and project_criteria['field']:
+                ranked_candidates = [candidate_data for candidate_data in ranked_candidates
+                                     if candidate_data['scores']['experience_relevance'] >= 0.7]
+
+            # Exclude or down-rank employees fully booked on other projects
+            try:
+                ranked_candidates = allocation_service.get_index().apply_policy(
+                    ranked_candidates, allocation_policy, exclude_project_id=project_id
+                )
+            except ValueError as e:
+                raise ValidationError(str(e))
+
+            people_count = int(project_criteria.get('people_count', 1))
+
+            if request_data.get('strategy') == 'team':
+                # Assemble the team that best covers the skills and roles together,
+                # keeping employees already assigned to a role on the project
+                role_assignments = AllocationIndex.get_role_assignments(project.get('team'))
+                roles = request_data.get('roles') or [assignment['roleName'] for assignment in role_assignments
+                                                      if assignment.get('roleName')]
+
+                assigned_roles = {assignment['employeeId']: assignment.get('roleName')
+                                  for assignment in role_assignments if assignment.get('employeeId')}
+                existing_members = []
+                if assigned_roles:
+                    existing_employees = mongodb_service.find_many(
+                        'Resumes', {'_id': {'$in': [ObjectId(employee_id) for employee_id in assigned_roles]}},
+                        query_plan['projection']
+                    )
+                    existing_members = allocation_service.get_index().apply_policy(
+                        CandidateRanker.rank_candidates(existing_employees, project_criteria, weights=weights),
+                        'ignore', exclude_project_id=project_id
+                    )
+                    for member in existing_members:
+                        member['assigned_role'] = assigned_roles.get(str(member['candidate']['_id']))
+
+                team = TeamBuilder.build_team(ranked_candidates,
+                                              CandidateQueryPlanner.get_required_skills(project_criteria),
+                                              people_count, roles=roles, existing_members=existing_members)
+                top_candidates = team['members']
+                team_coverage = {
+                    'skill_coverage': team['skill_coverage'],
+                    'uncovered_skills': team['uncovered_skills'],
+                    'unfilled_roles': team['unfilled_roles']
+                }
+            else:
+                # Select the top N candidates
+                team_coverage = None
+                top_candidates = CandidateRanker.select_best_candidates(ranked_candidates, count=people_count)
+
+            # Update project with matched employees
+            employee_ids = [str(candidate_data['candidate']['_id']) for candidate_data in top_candidates]
+            total_candidates = len(ranked_candidates)
+            total_matches = len(top_candidates)
+
+            # Update the project in MongoDB, keeping existing role assignments; the match summary
+            # lets later pages be served without matching again
+            mongodb_service.update_one(
+                'Projects',
+                {'_id': object_id},
+                {'$set': {
+                    'team.employee_ids': employee_ids,
+                    'team.match': {
+                        'assigned_roles': {str(candidate_data['candidate']['_id']): candidate_data.get('assigned_role')
+                                           for candidate_data in top_candidates} if team_coverage else {},
+                        'team_coverage': team_coverage,
+                        'total_candidates': total_candidates
+                    },
+                    'team.updated_at': datetime.now()
+                }}
+            )
+
+            project.setdefault('team', {})['employee_ids'] = employee_ids
+            try:
+                allocation_service.sync_project(project)
+            except Exception as e:
+                # The team is saved either way; its allocations catch up on the next team change
+                print(f"Error syncing allocations for project {project_id}: {str(e)}")
+
+            # Page through the selected candidates
+            fingerprint = make_fingerprint(project_id, employee_ids, weights)
+            page, next_cursor = paginate(top_candidates, None, request_data.get('page_size'), fingerprint)
+
+        # Fetch resume details for this page's candidates only, unless only IDs and scores are wanted
+        ids_only = bool(request_data.get('ids_only'))
+        if not ids_only:
+            page_ids = [candidate_data['candidate']['_id'] for candidate_data in page]
+            CandidateQueryPlanner.attach_details(
+                page, mongodb_service.find_many('Resumes', {'_id': {'$in': page_ids}},
+                                                CandidateQueryPlanner.build_detail_projection(request_data.get('fields')))
+            )
 
         # Prepare response
         matched_employees = []
 
-        for candidate_data in top_candidates:
+        for candidate_data in page:
             candidate = candidate_data['candidate']
             scores = candidate_data['scores']
             total_score = candidate_data['total_score']
 
-            # Convert ObjectId to string
-            candidate['_id'] = str(candidate['_id'])
+            # Skill gap comes from the match explanation computed while scoring
+            skill_gap = scores['skill_compatibility']['missing_skills']
 
-            # Get skill gap
-            candidate_skills = candidate.get('Skills', [])
-            project_languages = project_criteria.get('languages', '').split(',') if isinstance(project_criteria.get('languages'), str) else project_criteria.get('languages', [])
-            skill_gap = SkillMatcher.get_skill_gap(candidate_skills, project_languages)
-
-            matched_employees.append({
-                'employee': candidate,
+            matched_employee = {
                 'scores': scores,
                 'total_score': total_score,
+                'allocation': candidate_data['allocation'],
                 'skill_gap': skill_gap
-            })
+            }
 
-        # Update project with matched employees
-        employee_ids = [candidate_data['employee']['_id'] for candidate_data in matched_employees]
+            if ids_only:
+                # Details are fetched lazily through /employees/details
+                matched_employee['employee_id'] = str(candidate['_id'])
+            else:
+                # Convert ObjectId to string on a copy, leaving the fetched or cached document as is
+                candidate = dict(candidate, _id=str(candidate['_id']))
+                matched_employee['employee'] = candidate
 
-        # Update the project in MongoDB
-        mongodb_service.update_one(
-            'Projects',
-            {'_id': object_id},
-            {'$set': {
-                'team': {
-                    'employee_ids': employee_ids,
-                    'updated_at': datetime.now()
+            if team_coverage is not None:
+                matched_employee['assigned_role'] = candidate_data.get('assigned_role')
+
+            matched_employees.append(matched_employee)
+
+        response = {
+            'success': True,
+            'matched_employees': matched_employees,
+            'weights': weights,
+            'total_candidates': total_candidates,
+            'total_matches': total_matches,
+            'next_cursor': next_cursor
+        }
+
+        if team_coverage is not None:
+            response['team_coverage'] = team_coverage
+
+        return jsonify(response)
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f"Error matching employees to project: {str(e)}"
+        }), 500
+
+
+@project_blueprint.route('/batch-match', methods=['POST'])
+def batch_match_employees():
+    """
+    Endpoint for matching employees to several projects at once, e.g. for portfolio planning.
+    Candidates are loaded once and scored against every project in one pass.
+    Project teams are not updated.
+    """
+    try:
+        request_data = request.get_json(silent=True) or {}
+
+        project_ids = request_data.get('project_ids')
+        if not project_ids or not isinstance(project_ids, list):
+            raise ValidationError("project_ids must be a non-empty list")
+
+        try:
+            object_ids = [ObjectId(project_id) for project_id in project_ids]
+        except Exception:
+            raise ValidationError("project_ids must be valid project IDs")
+
+        projects_by_id = {str(project['_id']): project
+                          for project in mongodb_service.find_many('Projects', {'_id': {'$in': object_ids}})}
+        missing_ids = [project_id for project_id in project_ids if project_id not in projects_by_id]
+        if missing_ids:
+            raise NotFoundError(f"Projects not found: {', '.join(missing_ids)}")
+
+        # Import matching modules here to avoid circular imports
+        from modules.employee_matching.batch_matcher import BatchMatcher
+        from modules.employee_matching.feature_materializer import FeatureMaterializer
+        from modules.employee_matching.query_planner import CandidateQueryPlanner
+        from modules.employee_matching.ranking_cache import ranking_cache
+        from modules.employee_matching.weight_profiles import WeightProfiles
+
+        projects = [projects_by_id[project_id] for project_id in project_ids]
+        criteria_list = [CandidateQueryPlanner.get_project_criteria(project) for project in projects]
+
+        # Resolve each project's weights: explicit weights, a named profile, or its type's stored profile
+        stored_profiles = {}
+        weights_list = []
+        for project_criteria in criteria_list:
+            try:
+                weights_list.append(WeightProfiles.resolve_request_weights(
+                    request_data, project_criteria.get('project_type'), stored_profiles
+                ))
+            except ValueError as e:
+                raise ValidationError(str(e))
+
+        # Re-materialize resumes left stale by an older features version, once per process
+        for resume in FeatureMaterializer.materialize_stale_once():
+            ranking_cache.update_candidate(resume)
+
+        # Load every plausible candidate for any of the projects once
+        employees = mongodb_service.find_many('Resumes', CandidateQueryPlanner.build_union_filter(criteria_list),
+                                              CandidateQueryPlanner.build_projection())
+
+        # Score the candidate-by-project matrix, keeping employees relevant to each project's field
+        ranked_lists = BatchMatcher.rank_projects(employees, criteria_list, weights_list, min_relevance=0.7)
+
+        # Exclude or down-rank employees fully booked on other projects
+        allocation_index = allocation_service.get_index()
+        try:
+            ranked_lists = [
+                allocation_index.apply_policy(ranked, request_data.get('allocation_policy', 'exclude'),
+                                              exclude_project_id=project_id)
+                for ranked, project_id in zip(ranked_lists, project_ids)
+            ]
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        # Select each project's top candidates, optionally assigning every employee at most once
+        top_k = request_data.get('top_k')
+        try:
+            counts = [int(top_k) if top_k is not None else int(project_criteria.get('people_count', 1))
+                      for project_criteria in criteria_list]
+        except (TypeError, ValueError):
+            raise ValidationError("top_k must be an integer")
+
+        selections = BatchMatcher.select(ranked_lists, counts, exclusive=bool(request_data.get('exclusive')))
+        BatchMatcher.add_skill_compatibility(selections, criteria_list)
+
+        # Fetch resume details for the selected candidates only, unless only IDs and scores are wanted
+        ids_only = bool(request_data.get('ids_only'))
+        if not ids_only:
+            selected_ids = list({candidate_data['candidate']['_id']: None
+                                 for selected in selections for candidate_data in selected})
+            documents = mongodb_service.find_many(
+                'Resumes', {'_id': {'$in': selected_ids}},
+                CandidateQueryPlanner.build_detail_projection(request_data.get('fields'))
+            )
+            for document in documents:
+                document['_id'] = str(document['_id'])
+            for selected in selections:
+                CandidateQueryPlanner.attach_details(selected, documents)
+
+        # Prepare response
+        results = []
+
+        for project_id, project, ranked, selected, weights in zip(project_ids, projects, ranked_lists,
+                                                                  selections, weights_list):
+            matched_employees = []
+
+            for candidate_data in selected:
+                matched_employee = {
+                    'scores': candidate_data['scores'],
+                    'total_score': candidate_data['total_score'],
+                    'allocation': candidate_data['allocation'],
+                    'skill_gap': candidate_data['scores']['skill_compatibility']['missing_skills']
                 }
-            }}
-        )
+
+                if ids_only:
+                    # Details are fetched lazily through /employees/details
+                    matched_employee['employee_id'] = str(candidate_data['candidate']['_id'])
+                else:
+                    matched_employee['employee'] = candidate_data['candidate']
+
+                matched_employees.append(matched_employee)
+
+            results.append({
+                'project_id': project_id,
+                'project_name': project.get('name'),
+                'matched_employees': matched_employees,
+                'weights': weights,
+                'total_candidates': len(ranked)
+            })
 
         return jsonify({
             'success': True,
-            'matched_employees': matched_employees,
-            'total_candidates': len(employees),
-            'total_matches': len(matched_employees)
+            'results': results,
+            'candidates_scored': len(employees),
+            'exclusive': bool(request_data.get('exclusive'))
         })
 
     except Exception as e:
         return jsonify({
             'success': False,
-            'message': f"Error matching employees to project: {str(e)}"
+            'message': f"Error batch matching employees to projects: {str(e)}"
         }), 500
 
 
@@ -396,25 +689,36 @@ def add_employee_to_team(project_id):
         elif 'role_assignments' not in project['team']:
             project['team']['role_assignments'] = []
 
-        # Check if employee already assigned to this role
-        existing = next((item for item in project['team'].get('role_assignments', [])
-                         if item.get('roleId') == role_id), None)
-
-        if existing:
-            # Update existing role assignment
-            existing['employeeId'] = employee_id
-            existing['updated_at'] = datetime.now()
-            print(f"Updated existing role assignment: {existing}")
+        role_assignments = project['team']['role_assignments']
+
+        if isinstance(role_assignments, dict):
+            # Teams saved by the project editor map role names to employee IDs
+            employee_ids = role_assignments.get(role_name) or []
+            if not isinstance(employee_ids, list):
+                employee_ids = [employee_ids]
+            if employee_id not in employee_ids:
+                employee_ids.append(employee_id)
+            role_assignments[role_name] = employee_ids
+            print(f"Added employee {employee_id} to role {role_name}")
         else:
-            # Add new role assignment
-            assignment = {
-                'roleId': role_id,
-                'roleName': role_name,
-                'employeeId': employee_id,
-                'updated_at': datetime.now()
-            }
-            project['team']['role_assignments'].append(assignment)
-            print(f"Added new role assignment: {assignment}")
+            # Check if employee already assigned to this role
+            existing = next((item for item in role_assignments if item.get('roleId') == role_id), None)
+
+            if existing:
+                # Update existing role assignment
+                existing['employeeId'] = employee_id
+                existing['updated_at'] = datetime.now()
+                print(f"Updated existing role assignment: {existing}")
+            else:
+                # Add new role assignment
+                assignment = {
+                    'roleId': role_id,
+                    'roleName': role_name,
+                    'employeeId': employee_id,
+                    'updated_at': datetime.now()
+                }
+                role_assignments.append(assignment)
+                print(f"Added new role assignment: {assignment}")
 
         # Make sure employee_id is in the overall team list
         if 'employee_ids' not in project['team']:
@@ -431,6 +735,11 @@ def add_employee_to_team(project_id):
             {'_id': object_id},
             {'$set': {'team': project['team']}}
         )
+        try:
+            allocation_service.sync_project(project)
+        except Exception as e:
+            # The assignment is saved either way; its allocations catch up on the next team change
+            print(f"Error syncing allocations for project {project_id}: {str(e)}")
 
         return jsonify({
             'success': True,
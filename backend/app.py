@@ -33,6 +33,9 @@ def create_app(config_object=active_config):
     # Register additional routes
     register_additional_routes(app)
 
+    # Bring stored resume features up to the current version before serving matches
+    materialize_resume_features(app)
+
     return app
 
 
@@ -83,6 +86,22 @@ def ensure_directories(app):
     app.logger.info("Application directories initialized")
 
 
+def materialize_resume_features(app):
+    """Re-materialize resumes whose matching features predate the current features version."""
+    try:
+        from modules.employee_matching.feature_materializer import FeatureMaterializer
+        from modules.employee_matching.ranking_cache import ranking_cache
+
+        resumes = FeatureMaterializer.materialize_stale_once()
+        for resume in resumes:
+            ranking_cache.update_candidate(resume)
+
+        app.logger.info(f"Materialized matching features for {len(resumes)} resumes")
+    except Exception as e:
+        # Match requests retry the materialization if the database isn't reachable yet
+        app.logger.error(f"Error materializing resume features: {str(e)}")
+
+
 def register_additional_routes(app):
     """Register additional application routes."""
 
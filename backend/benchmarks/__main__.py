@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+"""
+Run the matching benchmark suite.
+
+Usage (from the backend directory):
+    python -m benchmarks --sizes 1000 10000 100000 --json results.json
+    python -m benchmarks --sizes 100000 --skip-endpoints --workers 1 2 4 8
+"""
+
+import argparse
+
+from benchmarks.harness import format_report, write_json
+from benchmarks.matching import run_suite
+from benchmarks.parallel import run_parallel_cases
+from benchmarks.generators import generate_resumes, generate_projects
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark employee matching')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='Numbers of synthetic employees')
+    parser.add_argument('--projects', type=int, default=5, help='Number of projects each case is timed on')
+    parser.add_argument('--uri', default=None, help='MongoDB URI (defaults to in-memory mongomock)')
+    parser.add_argument('--skip-endpoints', action='store_true', help='Only time the matching modules')
+    parser.add_argument('--workers', type=int, nargs='+', default=None,
+                        help='Also time parallel scoring with these numbers of worker processes')
+    parser.add_argument('--json', default=None, help='Also write the results to this JSON file')
+
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.projects, args.uri, endpoints=not args.skip_endpoints)
+
+    if args.workers:
+        for size in args.sizes:
+            results.extend(run_parallel_cases(generate_resumes(size), generate_projects(args.projects),
+                                              args.workers))
+
+    print(format_report(results))
+    if args.json:
+        write_json(results, args.json)
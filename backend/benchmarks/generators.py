@@ -0,0 +1,155 @@
+"""
+Synthetic employee and project generators for the matching benchmarks.
+Skills come from SkillMatcher.get_related_skills and the role hierarchy, so resumes use
+the same aliases and spelling variants the matcher has to resolve in production.
+"""
+
+import random
+
+from modules.employee_matching.skill_matcher import SkillMatcher
+from modules.employee_matching.feature_materializer import FeatureMaterializer
+from modules.skill_recommendation.role_hierarchy import RoleHierarchy
+
+SENIORITIES = ["Junior", "", "", "Senior", "Lead"]
+SPECIALIZATIONS = ["Frontend", "Backend", "Full Stack", "Mobile", "Data", "Cloud", "DevOps", "QA"]
+PROJECT_TYPES = ["Web Development", "Mobile Development", "Data Science", "Cloud", "Enterprise"]
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+RESPONSIBILITY_TEMPLATES = [
+    "Developed web application features using {skill}",
+    "Built backend services and REST APIs with {skill}",
+    "Maintained mobile application releases written in {skill}",
+    "Implemented data analysis pipelines in {skill}",
+    "Automated cloud infrastructure deployments with {skill}",
+    "Migrated enterprise CRM modules to {skill}",
+    "Mentored team members on {skill} best practices"
+]
+
+
+def get_skill_vocabulary():
+    """
+    Get the skills resumes are generated from, grouped by canonical form.
+
+    Returns:
+        list: Lists of interchangeable spellings, one list per canonical skill.
+    """
+    variants = {}
+
+    for skill_1, skill_2 in SkillMatcher.get_related_skills():
+        for skill in (skill_1, skill_2):
+            variants.setdefault(SkillMatcher.canonicalize_skill(skill), set()).add(skill)
+
+    for role in RoleHierarchy.DEFAULT_HIERARCHY.values():
+        for skill in role["required_skills"]["technical"]:
+            variants.setdefault(SkillMatcher.canonicalize_skill(skill["name"]), set()).add(skill["name"])
+
+    return [sorted(spellings) for _, spellings in sorted(variants.items())]
+
+
+def get_roles():
+    """
+    Get the role titles resumes are generated from.
+
+    Returns:
+        list: Role hierarchy titles plus specialized developer titles.
+    """
+    roles = list(RoleHierarchy.DEFAULT_HIERARCHY.keys())
+    roles.extend(f"{specialization} Developer" for specialization in SPECIALIZATIONS)
+
+    return roles
+
+
+def format_duration(rng, start_year, start_month, end_year, end_month, is_current):
+    """Format an experience duration in one of the styles found in parsed CVs."""
+    end = "Present" if is_current else None
+    style = rng.randint(0, 2)
+
+    if style == 0:
+        return f"{start_year}-{start_month:02d} - {end or f'{end_year}-{end_month:02d}'}"
+    if style == 1:
+        return f"{MONTH_NAMES[start_month - 1]} {start_year} - {end or f'{MONTH_NAMES[end_month - 1]} {end_year}'}"
+    return f"{start_year} - {end or end_year}"
+
+
+def generate_resumes(count, seed=42, materialize=True):
+    """
+    Generate synthetic resumes.
+
+    Args:
+        count: Number of resumes.
+        seed: Random seed, so runs are comparable.
+        materialize: Whether to store derived matching features, as the write path does.
+
+    Returns:
+        list: Resume documents.
+    """
+    rng = random.Random(seed)
+    vocabulary = get_skill_vocabulary()
+    roles = get_roles()
+    resumes = []
+
+    for i in range(count):
+        skills = [rng.choice(spellings) for spellings in rng.sample(vocabulary, rng.randint(3, 10))]
+
+        experience = []
+        year = rng.randint(2000, 2018)
+        positions = rng.randint(1, 5)
+        for position in range(positions):
+            end_year = min(year + rng.randint(1, 4), 2025)
+            role = f"{rng.choice(SENIORITIES)} {rng.choice(roles)}".strip()
+            experience.append({
+                "Role": role,
+                "Company": f"Company {rng.randint(1, 2000)}",
+                "Duration": format_duration(rng, year, rng.randint(1, 12), end_year, rng.randint(1, 12),
+                                            is_current=position == positions - 1 and rng.random() < 0.6),
+                "Responsibilities": [rng.choice(RESPONSIBILITY_TEMPLATES).format(skill=rng.choice(skills))
+                                     for _ in range(rng.randint(1, 3))]
+            })
+            year = end_year
+
+        resume = {
+            "Name": f"Employee {i}",
+            "Email": f"employee{i}@example.com",
+            "Skills": skills,
+            "Experience": list(reversed(experience)),
+            "Education": [{"Degree": "B.S. Computer Science", "Institution": f"University {rng.randint(1, 50)}"}]
+        }
+        resumes.append(FeatureMaterializer.materialize(resume) if materialize else resume)
+
+    return resumes
+
+
+def generate_projects(count, seed=7):
+    """
+    Generate synthetic projects with matching criteria.
+
+    Args:
+        count: Number of projects.
+        seed: Random seed, so runs are comparable.
+
+    Returns:
+        list: Project documents.
+    """
+    rng = random.Random(seed)
+    vocabulary = get_skill_vocabulary()
+    roles = get_roles()
+
+    return [{
+        "name": f"Project {i}",
+        "project_type": rng.choice(PROJECT_TYPES),
+        "project_languages": [spellings[0] for spellings in rng.sample(vocabulary, rng.randint(2, 5))],
+        "project_team_size": rng.randint(3, 8),
+        "project_timeline": rng.choice([30, 60, 90, 120, 180]),
+        "field": rng.choice(roles),
+        "status": "Planning"
+    } for i in range(count)]
+
+
+def get_project_criteria(project):
+    """Build the matching criteria the match endpoints derive for a project."""
+    return {
+        "languages": project["project_languages"],
+        "field": project["field"],
+        "project_type": project["project_type"],
+        "people_count": project["project_team_size"]
+    }
@@ -0,0 +1,95 @@
+"""
+Timing harness for the benchmarks.
+Measures latency percentiles and throughput over a list of inputs, and peak memory in a
+separate traced pass so tracing overhead doesn't distort the timings.
+"""
+
+import json
+import time
+import tracemalloc
+
+import numpy as np
+
+
+def measure(name, size, func, inputs, setup=None, warmup=False, trace_memory=True):
+    """
+    Time func on every input.
+
+    Args:
+        name: Case name.
+        size: Number of employees the case ran against.
+        func: Callable taking one input.
+        inputs: Inputs to run func on, one timed call each.
+        setup: Callable run before every call, untimed (optional), e.g. to clear caches.
+        warmup: Whether to call func on every input once, untimed, before timing.
+        trace_memory: Whether to measure peak memory of one extra traced call.
+
+    Returns:
+        dict: Case results.
+    """
+    latencies = []
+
+    if warmup:
+        for item in inputs:
+            func(item)
+
+    for item in inputs:
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - start)
+
+    peak_memory = None
+    if trace_memory and inputs:
+        if setup:
+            setup()
+        tracemalloc.start()
+        func(inputs[0])
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    latencies_ms = np.array(latencies) * 1000.0
+    total = float(np.sum(latencies))
+
+    return {
+        "case": name,
+        "employees": size,
+        "calls": len(latencies),
+        "throughput_per_s": round(len(latencies) / total, 2) if total else None,
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 2) if latencies else None,
+        "p95_ms": round(float(np.percentile(latencies_ms, 95)), 2) if latencies else None,
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 2) if latencies else None,
+        "peak_memory_mb": round(peak_memory / (1024 * 1024), 2) if peak_memory is not None else None
+    }
+
+
+def format_report(results):
+    """
+    Format results as a fixed-width table.
+
+    Args:
+        results: List of case results from measure.
+
+    Returns:
+        str: Report text.
+    """
+    columns = ["case", "employees", "calls", "throughput_per_s", "p50_ms", "p95_ms", "p99_ms", "peak_memory_mb"]
+    if any("speedup" in result for result in results):
+        columns.append("speedup")
+    rows = [[str(result.get(column) if result.get(column) is not None else "-") for column in columns]
+            for result in results]
+    widths = [max(len(column), *(len(row[i]) for row in rows)) if rows else len(column)
+              for i, column in enumerate(columns)]
+
+    lines = ["  ".join(column.ljust(width) for column, width in zip(columns, widths)),
+             "  ".join("-" * width for width in widths)]
+    lines.extend("  ".join(value.ljust(width) for value, width in zip(row, widths)) for row in rows)
+
+    return "\n".join(lines)
+
+
+def write_json(results, path):
+    """Write results as JSON, so runs can be compared across commits."""
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
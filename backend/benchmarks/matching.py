@@ -0,0 +1,195 @@
+"""
+Matching benchmark suite.
+Times the core of each match path separately (SkillMatcher, ExperienceAnalyzer,
+CandidateRanker) and end to end through the match endpoints, against MongoDB at
+--uri or an in-memory mongomock database.
+"""
+
+from pymongo import ASCENDING
+
+from benchmarks.generators import generate_resumes, generate_projects, get_project_criteria
+from benchmarks.harness import measure
+from modules.employee_matching.batch_matcher import BatchMatcher
+from modules.employee_matching.candidate_ranker import CandidateRanker
+from modules.employee_matching.experience_analyzer import ExperienceAnalyzer
+from modules.employee_matching.feature_materializer import FeatureMaterializer
+from modules.employee_matching.query_planner import CandidateQueryPlanner
+from modules.employee_matching.ranking_cache import ranking_cache
+from modules.employee_matching.score_cache import score_cache
+from modules.employee_matching.skill_matcher import SkillMatcher
+
+BENCHMARK_DB = 'KPIResearchBenchmark'
+
+
+def clear_caches():
+    """Clear the in-process matching caches so every call takes the cold path."""
+    score_cache.clear()
+    ranking_cache.clear()
+
+
+def run_core_cases(resumes, projects):
+    """
+    Time the matching modules directly on in-memory resumes.
+
+    Args:
+        resumes: Resume documents with materialized features.
+        projects: Project documents.
+
+    Returns:
+        list: Case results.
+    """
+    size = len(resumes)
+    criteria = [get_project_criteria(project) for project in projects]
+    features = [FeatureMaterializer.get_features(resume) for resume in resumes]
+
+    def skill_matcher(project_criteria):
+        for candidate_features in features:
+            SkillMatcher.calculate_skill_compatibility(candidate_features["canonical_skills"],
+                                                       project_criteria["languages"])
+
+    def experience_analyzer(project_criteria):
+        for resume in resumes:
+            ExperienceAnalyzer.get_years_of_experience(resume["Experience"], project_criteria["field"])
+
+    def candidate_ranker(project_criteria):
+        CandidateRanker.rank_candidates(resumes, project_criteria)
+
+    def batch_matcher(criteria_list):
+        BatchMatcher.rank_projects(resumes, criteria_list)
+
+    return [
+        measure("skill_matcher", size, skill_matcher, criteria),
+        measure("experience_analyzer", size, experience_analyzer, criteria),
+        measure("candidate_ranker_cold", size, candidate_ranker, criteria, setup=clear_caches),
+        measure("candidate_ranker_warm", size, candidate_ranker, criteria, warmup=True),
+        # One call scores every project
+        measure("batch_matcher_all_projects", size, batch_matcher, [criteria])
+    ]
+
+
+def use_database(uri=None):
+    """
+    Point the application's MongoDB service at the benchmark database.
+
+    Args:
+        uri: MongoDB URI of a local mongod, or None for an in-memory mongomock database.
+
+    Returns:
+        Database: The benchmark database.
+    """
+    from services.mongodb_service import mongodb_service
+    from services.allocation_service import allocation_service
+
+    if uri:
+        from pymongo import MongoClient
+        client = MongoClient(uri)
+    else:
+        import mongomock
+        client = mongomock.MongoClient()
+
+    mongodb_service.client = client
+    mongodb_service.db = client[BENCHMARK_DB]
+    allocation_service._version = None
+
+    return mongodb_service.db
+
+
+def load_database(db, resumes, projects, batch_size=10000):
+    """
+    Load resumes and projects into the benchmark database.
+
+    Returns:
+        list: Inserted project IDs as strings.
+    """
+    for collection in ['Resumes', 'Projects', 'Allocations', 'WeightProfiles']:
+        db.drop_collection(collection)
+
+    for start in range(0, len(resumes), batch_size):
+        db['Resumes'].insert_many([dict(resume) for resume in resumes[start:start + batch_size]])
+    for field in CandidateQueryPlanner.INDEXES:
+        db['Resumes'].create_index([(field, ASCENDING)])
+
+    project_ids = db['Projects'].insert_many([dict(project) for project in projects]).inserted_ids
+    return [str(project_id) for project_id in project_ids]
+
+
+def run_endpoint_cases(resumes, projects, uri=None):
+    """
+    Time the match endpoints end to end through the Flask test client.
+
+    Args:
+        resumes: Resume documents with materialized features.
+        projects: Project documents.
+        uri: MongoDB URI, or None for mongomock.
+
+    Returns:
+        list: Case results.
+    """
+    from app import create_app
+
+    size = len(resumes)
+    db = use_database(uri)
+    project_ids = load_database(db, resumes, projects)
+    client = create_app().test_client()
+
+    criteria = [get_project_criteria(project) for project in projects]
+
+    def post(url, payload):
+        response = client.post(url, json=payload)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} failed: {response.get_json()}")
+
+    def employees_match(project_criteria):
+        post('/api/employees/match', {'project_criteria': project_criteria, 'allocation_policy': 'ignore'})
+
+    def employees_match_with_kpis(project_criteria):
+        post('/api/employees/match-with-kpis', {'project_criteria': project_criteria, 'allocation_policy': 'ignore'})
+
+    def projects_match_employees(project_id):
+        post(f'/api/projects/{project_id}/match-employees', {'allocation_policy': 'ignore'})
+
+    results = [
+        measure("endpoint_employees_match_cold", size, employees_match, criteria, setup=clear_caches),
+        measure("endpoint_employees_match_warm", size, employees_match, criteria, warmup=True),
+        measure("endpoint_match_with_kpis_cold", size, employees_match_with_kpis, criteria, setup=clear_caches),
+        measure("endpoint_project_match_cold", size, projects_match_employees, project_ids, setup=clear_caches)
+    ]
+
+    for collection in ['Resumes', 'Projects', 'Allocations']:
+        db.drop_collection(collection)
+
+    return results
+
+
+def run_suite(sizes, project_count=5, uri=None, endpoints=True, seed=42):
+    """
+    Run every case for each employee count.
+
+    Args:
+        sizes: Employee counts, e.g. [1000, 10000, 100000].
+        project_count: Number of projects each case is timed on.
+        uri: MongoDB URI, or None for mongomock.
+        endpoints: Whether to run the end-to-end endpoint cases.
+        seed: Random seed for the generators.
+
+    Returns:
+        list: Case results for every size.
+    """
+    projects = generate_projects(project_count, seed=seed)
+    results = []
+
+    for size in sizes:
+        print(f"Generating {size} synthetic resumes...")
+        resumes = generate_resumes(size, seed=seed)
+        for i, resume in enumerate(resumes):
+            resume['_id'] = f"benchmark-{i}"
+
+        results.extend(run_core_cases(resumes, projects))
+
+        if endpoints:
+            for resume in resumes:
+                del resume['_id']
+            results.extend(run_endpoint_cases(resumes, projects, uri))
+
+    clear_caches()
+    return results
@@ -0,0 +1,47 @@
+"""
+Parallel scoring benchmark.
+Times ScoringExecutor ranking cold candidate pools with different numbers of worker
+processes, and reports each worker count's speedup over in-process scoring.
+"""
+
+from benchmarks.generators import get_project_criteria
+from benchmarks.harness import measure
+from benchmarks.matching import clear_caches
+from modules.employee_matching.scoring_executor import ScoringExecutor
+
+
+def run_parallel_cases(resumes, projects, worker_counts):
+    """
+    Time ranking every project's candidates with each worker count.
+
+    Args:
+        resumes: Resume documents with materialized features.
+        projects: Project documents.
+        worker_counts: Numbers of worker processes, e.g. [1, 2, 4, 8]. 1 scores in-process.
+
+    Returns:
+        list: Case results, with the speedup over in-process scoring.
+    """
+    size = len(resumes)
+    criteria = [get_project_criteria(project) for project in projects]
+    results = []
+
+    for workers in worker_counts:
+        executor = ScoringExecutor(workers=workers, threshold=0)
+
+        def rank(project_criteria):
+            executor.rank_candidates(resumes, project_criteria)
+
+        # Start the worker processes before timing
+        rank(criteria[0])
+
+        results.append(dict(measure(f"parallel_ranker_{workers}_workers", size, rank, criteria,
+                                    setup=clear_caches, trace_memory=False), workers=workers))
+        executor.shutdown()
+
+    baseline = next((result["p50_ms"] for result in results if result["workers"] == 1), None)
+    for result in results:
+        result["speedup"] = round(baseline / result["p50_ms"], 2) if baseline and result["p50_ms"] else None
+
+    clear_caches()
+    return results
@@ -24,6 +24,18 @@ class Config:
     ALLOWED_EXTENSIONS = {'pdf', 'jpg', 'jpeg', 'png'}
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
 
+    # Employee matching settings
+    SEMANTIC_MATCHING = os.getenv('SEMANTIC_MATCHING', 'false').lower() == 'true'
+
+    # Candidate pools with at least PARALLEL_SCORING_THRESHOLD uncached candidates are
+    # scored across SCORING_WORKERS processes (0 or 1 scores in-process)
+    SCORING_WORKERS = int(os.getenv('SCORING_WORKERS', str(os.cpu_count() or 1)))
+    PARALLEL_SCORING_THRESHOLD = int(os.getenv('PARALLEL_SCORING_THRESHOLD', '20000'))
+
+    # Seed rule-based KPI and chart generation from the project id and parameters,
+    # so identical inputs give identical results
+    SEEDED_GENERATION = os.getenv('SEEDED_GENERATION', 'true').lower() == 'true'
+
 
 class DevelopmentConfig(Config):
     """Development configuration."""
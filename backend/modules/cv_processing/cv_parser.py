@@ -1,6 +1,8 @@
 import json
 from services.openai_service import openai_service
 from modules.cv_processing.cv_extractor import CVExtractor
+from utils import date_utils
+from utils.keyword_classifier import skill_category_classifier
 
 
 class CVParser:
@@ -61,53 +63,17 @@ class CVParser:
 
         # Calculate total years of experience
         if 'Experience' in enhanced_data and isinstance(enhanced_data['Experience'], list):
-            total_experience = 0
-            for exp in enhanced_data['Experience']:
-                if 'Duration' in exp and '-' in exp['Duration']:
-                    try:
-                        start, end = exp['Duration'].split('-')
-
-                        # Handle "Present" or current positions
-                        end = end.lower().replace('present', '2023').strip()
-                        start = start.strip()
-
-                        # Extract years
-                        if len(start) >= 4 and len(end) >= 4:
-                            start_year = int(start[-4:])
-                            end_year = int(end[-4:])
-                            duration = end_year - start_year
-                            total_experience += duration
-                    except Exception:
-                        # If we can't parse the duration, just continue
-                        continue
+            # Parse all durations at once; overlapping positions are only counted once
+            durations = [exp.get('Duration', '') for exp in enhanced_data['Experience']]
+            total_experience = date_utils.total_years_of_experience(durations)
 
             enhanced_data['_derived'] = enhanced_data.get('_derived', {})
             enhanced_data['_derived']['total_years_experience'] = total_experience
 
         # Extract primary skills category
         if 'Skills' in enhanced_data and isinstance(enhanced_data['Skills'], list):
-            # Group skills into categories (this is a simple example, can be more sophisticated)
-            programming_keywords = ['python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php']
-            framework_keywords = ['react', 'angular', 'vue', 'django', 'flask', 'spring', 'laravel']
-            database_keywords = ['sql', 'mongodb', 'postgresql', 'mysql', 'oracle', 'nosql']
-
-            skills_categories = {
-                'programming': [],
-                'frameworks': [],
-                'databases': [],
-                'other': []
-            }
-
-            for skill in enhanced_data['Skills']:
-                skill_lower = skill.lower()
-                if any(keyword in skill_lower for keyword in programming_keywords):
-                    skills_categories['programming'].append(skill)
-                elif any(keyword in skill_lower for keyword in framework_keywords):
-                    skills_categories['frameworks'].append(skill)
-                elif any(keyword in skill_lower for keyword in database_keywords):
-                    skills_categories['databases'].append(skill)
-                else:
-                    skills_categories['other'].append(skill)
+            # Group skills into categories with the shared keyword classifier
+            skills_categories = skill_category_classifier.categorize(enhanced_data['Skills'])
 
             enhanced_data['_derived'] = enhanced_data.get('_derived', {})
             enhanced_data['_derived']['skill_categories'] = skills_categories
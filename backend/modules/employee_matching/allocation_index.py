@@ -0,0 +1,276 @@
+import threading
+from datetime import datetime, timedelta
+
+
+class AllocationIndex:
+    """
+    In-memory index of employee allocations to projects.
+    Holds one entry per (employee, project) with the roles and date range of the allocation,
+    and keeps each employee's active allocation total so over-allocation checks are O(1).
+    """
+
+    # Project statuses whose team no longer books anyone
+    INACTIVE_STATUSES = {"Completed", "Cancelled"}
+
+    # Fraction of an employee's time a project allocation takes unless stated otherwise
+    DEFAULT_ALLOCATION = 1.0
+
+    def __init__(self, capacity=1.0):
+        """Initialize an empty index where an employee's total allocation may reach capacity."""
+        self.capacity = capacity
+        self._by_employee = {}
+        self._by_project = {}
+        self._load = {}
+        self._next_expiry = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def get_role_assignments(team):
+        """
+        Get a team's role assignments as a list of assignment objects.
+        Teams store either a list of {roleName, employeeId} objects or, as saved by the project
+        editor, a mapping from role name to one or more employee IDs.
+
+        Args:
+            team: Team document.
+
+        Returns:
+            list: Assignments with 'roleName' and a string 'employeeId', plus any other stored fields.
+        """
+        role_assignments = (team or {}).get("role_assignments") or []
+
+        if isinstance(role_assignments, dict):
+            role_assignments = [{"roleName": role_name, "employeeId": employee_id}
+                                for role_name, employee_ids in role_assignments.items()
+                                for employee_id in (employee_ids if isinstance(employee_ids, list) else [employee_ids])]
+
+        return [dict(assignment, employeeId=str(assignment["employeeId"]) if assignment.get("employeeId") else None)
+                for assignment in role_assignments if isinstance(assignment, dict)]
+
+    @staticmethod
+    def parse_date(value):
+        """
+        Parse a stored project date, which may be a datetime or an ISO 8601 string sent by the client.
+
+        Args:
+            value: Datetime, date string or None.
+
+        Returns:
+            datetime: Naive datetime, or None if the value is missing or can't be parsed.
+        """
+        if isinstance(value, str):
+            try:
+                value = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+            except ValueError:
+                return None
+
+        if not isinstance(value, datetime):
+            return None
+
+        # Compare with datetime.now(), which is naive local time
+        return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+    @staticmethod
+    def build_entries(project):
+        """
+        Build the allocation entries implied by a project's team.
+
+        Args:
+            project: Project document with an optional 'team'.
+
+        Returns:
+            list: Allocation entries (employee_id, project_id, roles, allocation, start_date, end_date).
+        """
+        if project.get("status") in AllocationIndex.INACTIVE_STATUSES:
+            return []
+
+        team = project.get("team") or {}
+        project_id = str(project["_id"])
+
+        # The project runs from its start (or creation) for project_timeline days
+        start_date = AllocationIndex.parse_date(project.get("start_date") or project.get("created_at"))
+        end_date = AllocationIndex.parse_date(project.get("end_date"))
+        if not end_date and start_date and project.get("project_timeline"):
+            try:
+                end_date = start_date + timedelta(days=int(project["project_timeline"]))
+            except (TypeError, ValueError):
+                end_date = None
+
+        entries = {}
+        for employee_id in team.get("employee_ids", []):
+            entries[str(employee_id)] = {"roles": [], "allocation": AllocationIndex.DEFAULT_ALLOCATION}
+
+        for assignment in AllocationIndex.get_role_assignments(team):
+            employee_id = assignment.get("employeeId")
+            if not employee_id:
+                continue
+
+            entry = entries.setdefault(str(employee_id), {"roles": [], "allocation": AllocationIndex.DEFAULT_ALLOCATION})
+            if assignment.get("roleName") and assignment["roleName"] not in entry["roles"]:
+                entry["roles"].append(assignment["roleName"])
+            if assignment.get("allocation") is not None:
+                entry["allocation"] = float(assignment["allocation"])
+
+        return [{
+            "employee_id": employee_id,
+            "project_id": project_id,
+            "roles": entry["roles"],
+            "allocation": entry["allocation"],
+            "start_date": start_date,
+            "end_date": end_date
+        } for employee_id, entry in entries.items()]
+
+    @staticmethod
+    def is_active(entry, now):
+        """Check whether an allocation entry still books the employee at the given time."""
+        return entry.get("end_date") is None or entry["end_date"] >= now
+
+    def _refresh_employee(self, employee_id, now):
+        """Recompute an employee's active allocation total and when it next changes."""
+        entries = self._by_employee.get(employee_id, {}).values()
+        active = [entry for entry in entries if AllocationIndex.is_active(entry, now)]
+
+        self._load[employee_id] = sum((entry["allocation"] for entry in active), 0.0)
+        end_dates = [entry["end_date"] for entry in active if entry.get("end_date") is not None]
+        self._next_expiry[employee_id] = min(end_dates) if end_dates else None
+
+    def load(self, entries):
+        """
+        Replace the index contents with the given allocation entries.
+
+        Args:
+            entries: Allocation entries, as produced by build_entries.
+        """
+        with self._lock:
+            self._by_employee.clear()
+            self._by_project.clear()
+            self._load.clear()
+            self._next_expiry.clear()
+
+            for entry in entries:
+                # Entries written before dates were parsed may hold date strings
+                entry = dict(entry, start_date=AllocationIndex.parse_date(entry.get("start_date")),
+                             end_date=AllocationIndex.parse_date(entry.get("end_date")))
+                self._by_employee.setdefault(entry["employee_id"], {})[entry["project_id"]] = entry
+                self._by_project.setdefault(entry["project_id"], set()).add(entry["employee_id"])
+
+            now = datetime.now()
+            for employee_id in self._by_employee:
+                self._refresh_employee(employee_id, now)
+
+    def sync_project(self, project_id, entries):
+        """
+        Replace the allocations of one project, touching only the employees involved.
+
+        Args:
+            project_id: Project ID.
+            entries: The project's current allocation entries.
+
+        Returns:
+            list: IDs of employees who are no longer allocated to the project.
+        """
+        project_id = str(project_id)
+        now = datetime.now()
+
+        with self._lock:
+            previous = self._by_project.pop(project_id, set())
+            current = {entry["employee_id"] for entry in entries}
+
+            for employee_id in previous - current:
+                self._by_employee.get(employee_id, {}).pop(project_id, None)
+
+            for entry in entries:
+                self._by_employee.setdefault(entry["employee_id"], {})[project_id] = entry
+
+            if current:
+                self._by_project[project_id] = current
+
+            for employee_id in previous | current:
+                self._refresh_employee(employee_id, now)
+
+        return list(previous - current)
+
+    def remove_project(self, project_id):
+        """Remove every allocation to a project."""
+        self.sync_project(project_id, [])
+
+    def get_allocations(self, employee_id):
+        """
+        Get an employee's allocations.
+
+        Args:
+            employee_id: Employee ID.
+
+        Returns:
+            list: Allocation entries, one per project.
+        """
+        return list(self._by_employee.get(str(employee_id), {}).values())
+
+    def get_load(self, employee_id, exclude_project_id=None):
+        """
+        Get the fraction of an employee's time booked by active projects.
+
+        Args:
+            employee_id: Employee ID.
+            exclude_project_id: Project whose own allocation doesn't count (optional),
+                                e.g. when re-matching that project's team.
+
+        Returns:
+            float: Total active allocation.
+        """
+        employee_id = str(employee_id)
+        load = self._load.get(employee_id)
+        if load is None:
+            return 0.0
+
+        # Totals only change when an allocation ends, so they are refreshed lazily
+        next_expiry = self._next_expiry.get(employee_id)
+        if next_expiry is not None and next_expiry < datetime.now():
+            with self._lock:
+                self._refresh_employee(employee_id, datetime.now())
+                load = self._load[employee_id]
+
+        if exclude_project_id is not None:
+            entry = self._by_employee[employee_id].get(str(exclude_project_id))
+            if entry and AllocationIndex.is_active(entry, datetime.now()):
+                load -= entry["allocation"]
+
+        return max(load, 0.0)
+
+    def is_over_allocated(self, employee_id, exclude_project_id=None):
+        """Check whether an employee has no capacity left for another project."""
+        return self.get_load(employee_id, exclude_project_id) >= self.capacity
+
+    def apply_policy(self, ranked_candidates, policy="exclude", exclude_project_id=None):
+        """
+        Exclude or down-rank ranked candidates by their current allocation.
+
+        Args:
+            ranked_candidates: List of ranked candidates with scores.
+            policy: 'exclude' drops fully booked candidates, 'penalize' scales each total
+                    score by the capacity left, 'ignore' only reports the allocation.
+            exclude_project_id: Project being staffed, whose own allocation doesn't count (optional).
+
+        Returns:
+            list: Candidates with an 'allocation' key, sorted by total score.
+        """
+        if policy not in ("exclude", "penalize", "ignore"):
+            raise ValueError(f"Unknown allocation policy: {policy}")
+
+        result = []
+        for candidate_data in ranked_candidates:
+            load = self.get_load(candidate_data["candidate"]["_id"], exclude_project_id)
+            candidate_data["allocation"] = round(load, 4)
+
+            if policy == "exclude" and load >= self.capacity:
+                continue
+
+            if policy == "penalize" and load > 0:
+                candidate_data["total_score"] *= max(1.0 - load / self.capacity, 0.0)
+
+            result.append(candidate_data)
+
+        if policy == "penalize":
+            result.sort(key=lambda x: x["total_score"], reverse=True)
+
+        return result
@@ -0,0 +1,337 @@
+import numpy as np
+
+from modules.employee_matching.skill_matcher import SkillMatcher
+from modules.employee_matching.experience_analyzer import ExperienceAnalyzer
+from modules.employee_matching.fuzzy_matching import FuzzyMatcher
+from modules.employee_matching.feature_materializer import FeatureMaterializer
+from modules.employee_matching.query_planner import CandidateQueryPlanner
+from modules.employee_matching.score_cache import ScoreCache
+from modules.employee_matching.weight_profiles import WeightProfiles
+from modules.employee_matching.semantic_matcher import SemanticMatcher
+
+
+class BatchMatcher:
+    """
+    Class for scoring one pool of candidates against many projects in a single pass.
+    Candidate skills, roles and project types are indexed into vocabularies once, each
+    similarity is computed once per (project term, vocabulary entry), and the results are
+    gathered per candidate into candidate-by-project score matrices. Scores are the same
+    as CandidateRanker.calculate_candidate_scores gives for each pair.
+    """
+
+    @staticmethod
+    def _build_vocabulary(values_per_candidate):
+        """
+        Index the values of every candidate into one vocabulary.
+
+        Args:
+            values_per_candidate: One list of values per candidate.
+
+        Returns:
+            tuple: (vocabulary list, concatenated vocabulary indices, number of values per candidate)
+        """
+        vocabulary = {}
+        flat_index = []
+        lengths = []
+
+        for values in values_per_candidate:
+            flat_index.extend(vocabulary.setdefault(value, len(vocabulary)) for value in values)
+            lengths.append(len(values))
+
+        return list(vocabulary), np.array(flat_index, dtype=np.int64), np.array(lengths, dtype=np.int64)
+
+    @staticmethod
+    def _segment_reduce(matrix, flat_index, lengths, ufunc):
+        """
+        Combine the vocabulary columns of each candidate.
+
+        Args:
+            matrix: Array of shape (rows, vocabulary size).
+            flat_index: Concatenated vocabulary indices of every candidate.
+            lengths: Number of indices per candidate.
+            ufunc: numpy ufunc combining the columns, e.g. np.maximum.
+
+        Returns:
+            numpy.ndarray: Array of shape (rows, candidates); 0 for candidates without values.
+        """
+        result = np.zeros((matrix.shape[0], len(lengths)), dtype=matrix.dtype)
+        non_empty = lengths > 0
+
+        if non_empty.any():
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            result[:, non_empty] = ufunc.reduceat(matrix[:, flat_index], offsets[non_empty], axis=1)
+
+        return result
+
+    @staticmethod
+    def get_project_languages(project_criteria):
+        """Get the required skills exactly as CandidateRanker passes them to the skill matcher."""
+        languages = project_criteria.get("languages", "")
+        return languages.split(",") if isinstance(languages, str) else languages or []
+
+    @staticmethod
+    def _skill_scores(canonical_skills, criteria_list):
+        """
+        Calculate skill_match and the planner's skill filter for every (project, candidate).
+
+        Returns:
+            tuple: (skill_match of shape (projects, candidates), boolean skill filter of the same shape)
+        """
+        vocabulary, flat_index, lengths = BatchMatcher._build_vocabulary(canonical_skills)
+
+        # Required skills are canonicalized and deduplicated as CandidateRanker does
+        required_lists = [SkillMatcher.canonicalize_skills(
+            skill.strip() for skill in BatchMatcher.get_project_languages(criteria) if skill and skill.strip()
+        ) for criteria in criteria_list]
+        required_vocabulary = sorted({skill for required in required_lists for skill in required})
+        related = SkillMatcher.get_related_canonical_skills()
+
+        # A required skill matches once, on a whole-word partial match or a related skill
+        hits = np.array([[SkillMatcher.is_partial_match(required, skill) or skill in related.get(required, ())
+                          for skill in vocabulary]
+                         for required in required_vocabulary], dtype=np.int8).reshape(-1, len(vocabulary))
+        hits = BatchMatcher._segment_reduce(hits, flat_index, lengths, np.maximum)
+
+        required_index = {skill: i for i, skill in enumerate(required_vocabulary)}
+        occurrences = np.zeros((len(criteria_list), len(required_vocabulary)))
+        for j, required in enumerate(required_lists):
+            for skill in required:
+                occurrences[j, required_index[skill]] = 1
+
+        matches = occurrences @ hits.astype(float)
+        required_counts = np.array([max(len(required), 1) for required in required_lists], dtype=float)[:, None]
+        skill_match = np.where(matches > 0, np.minimum(1.0, np.maximum(0.1, matches / required_counts)), 0.0)
+
+        # The planner's prefilter: at least one expanded required skill
+        skill_filter = np.ones((len(criteria_list), len(canonical_skills)), dtype=bool)
+        vocabulary_index = {skill: i for i, skill in enumerate(vocabulary)}
+        for j, criteria in enumerate(criteria_list):
+            required_skills = CandidateQueryPlanner.get_required_skills(criteria)
+            if not required_skills:
+                continue
+            expanded = np.zeros((1, len(vocabulary)), dtype=np.int8)
+            for skill in CandidateQueryPlanner.expand_skills(required_skills):
+                if skill in vocabulary_index:
+                    expanded[0, vocabulary_index[skill]] = 1
+            skill_filter[j] = BatchMatcher._segment_reduce(expanded, flat_index, lengths, np.maximum)[0] > 0
+
+        return skill_match, skill_filter
+
+    @staticmethod
+    def _experience_scores(features, criteria_list):
+        """
+        Calculate experience_relevance and years_experience for every (project, candidate).
+
+        Returns:
+            tuple: Two arrays of shape (projects, candidates).
+        """
+        vocabulary, flat_index, lengths = BatchMatcher._build_vocabulary(
+            [candidate_features["roles"] for candidate_features in features]
+        )
+        fields = [criteria.get("field", "") for criteria in criteria_list]
+
+        # Every distinct role is scored against every field once, rounded as score_choices does
+        if vocabulary:
+            role_similarities = np.round(FuzzyMatcher.cdist(fields, vocabulary, method='token_set_ratio'))
+        else:
+            role_similarities = np.zeros((len(fields), 0))
+
+        relevance = BatchMatcher._segment_reduce(role_similarities, flat_index, lengths, np.maximum) / 100.0
+
+        # Years only count periods in roles relevant to the field; each distinct
+        # selection of a candidate's periods is measured once
+        years = np.zeros((len(criteria_list), len(features)))
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+        for i, candidate_features in enumerate(features):
+            periods = candidate_features["experience_periods"]
+            if not periods:
+                continue
+
+            roles = flat_index[offsets[i]:offsets[i] + lengths[i]]
+            measured = {}
+
+            for j, field in enumerate(fields):
+                if field:
+                    selected = tuple(np.flatnonzero(role_similarities[j, roles] >= 70))
+                else:
+                    selected = tuple(range(len(periods)))
+
+                if selected not in measured:
+                    measured[selected] = ExperienceAnalyzer.get_years_from_periods(
+                        [periods[k] for k in selected if k < len(periods)]
+                    )
+                years[j, i] = min(measured[selected] / 10.0, 1.0)
+
+        return relevance, years
+
+    @staticmethod
+    def _project_type_scores(features, criteria_list):
+        """Calculate project_type_match for every (project, candidate)."""
+        vocabulary, flat_index, lengths = BatchMatcher._build_vocabulary(
+            [[candidate_features["most_common_type"]] if candidate_features["most_common_type"] else []
+             for candidate_features in features]
+        )
+        project_types = [criteria.get("project_type", "") for criteria in criteria_list]
+
+        if not vocabulary:
+            return np.zeros((len(criteria_list), len(features)))
+
+        similarities = np.round(FuzzyMatcher.cdist(project_types, vocabulary, method='token_set_ratio')) / 100.0
+        similarities[[j for j, project_type in enumerate(project_types) if not project_type]] = 0.0
+
+        return BatchMatcher._segment_reduce(similarities, flat_index, lengths, np.maximum)
+
+    @staticmethod
+    def build_score_tensor(candidates, criteria_list):
+        """
+        Score every candidate against every project.
+
+        Args:
+            candidates: List of candidate data.
+            criteria_list: List of project criteria dictionaries.
+
+        Returns:
+            tuple: (scores of shape (candidates, projects, len(WeightProfiles.COMPONENTS)),
+                    boolean matrix of shape (candidates, projects) marking the candidates
+                    CandidateQueryPlanner would select for each project)
+        """
+        features = [FeatureMaterializer.get_features(candidate) for candidate in candidates]
+        components = {}
+
+        components["skill_match"], skill_filter = BatchMatcher._skill_scores(
+            [candidate_features["canonical_skills"] for candidate_features in features], criteria_list
+        )
+        components["experience_relevance"], components["years_experience"] = BatchMatcher._experience_scores(
+            features, criteria_list
+        )
+        components["project_type_match"] = BatchMatcher._project_type_scores(features, criteria_list)
+
+        components["semantic_match"] = np.zeros((len(criteria_list), len(candidates)))
+        if SemanticMatcher.is_enabled():
+            for i, (candidate, candidate_features) in enumerate(zip(candidates, features)):
+                for j, criteria in enumerate(criteria_list):
+                    components["semantic_match"][j, i] = SemanticMatcher.calculate_semantic_match(
+                        candidate_features, BatchMatcher.get_project_languages(criteria), criteria.get("field", ""),
+                        candidate_key=ScoreCache.candidate_key(candidate)
+                    )
+
+        # Candidates the planner's min_years_experience filter would drop
+        total_years = np.array([FeatureMaterializer.get_total_years(candidate_features)
+                                for candidate_features in features], dtype=float)
+        for j, criteria in enumerate(criteria_list):
+            if criteria.get("min_years_experience"):
+                skill_filter[j] &= total_years >= float(criteria["min_years_experience"])
+
+        tensor = np.stack([components[component] for component in WeightProfiles.COMPONENTS], axis=-1)
+
+        return tensor.transpose(1, 0, 2), skill_filter.T
+
+    @staticmethod
+    def rank_projects(candidates, criteria_list, weights_list=None, min_relevance=None):
+        """
+        Rank one pool of candidates for every project.
+
+        Args:
+            candidates: List of candidate data, e.g. loaded once with a union filter.
+            criteria_list: List of project criteria dictionaries.
+            weights_list: Weights per project (optional). Defaults to the "balanced" profile.
+            min_relevance: Minimum experience_relevance for projects with a field (optional).
+
+        Returns:
+            list: For each project, its candidates sorted by total score, in the
+                  CandidateRanker.rank_candidates format without skill_compatibility.
+        """
+        if not candidates or not criteria_list:
+            return [[] for _ in criteria_list]
+
+        weights_list = weights_list or [None] * len(criteria_list)
+        weight_matrix = np.array([
+            [WeightProfiles.resolve_weights(weights)[component] for component in WeightProfiles.COMPONENTS]
+            for weights in weights_list
+        ])
+
+        tensor, eligible = BatchMatcher.build_score_tensor(candidates, criteria_list)
+
+        # Candidate-by-project total scores in one weighted sum
+        totals = np.einsum('cpk,pk->cp', tensor, weight_matrix)
+
+        relevance_index = WeightProfiles.COMPONENTS.index("experience_relevance")
+        for j, criteria in enumerate(criteria_list):
+            if min_relevance is not None and criteria.get("field"):
+                eligible[:, j] &= tensor[:, j, relevance_index] >= min_relevance
+
+        ranked_lists = []
+        for j in range(len(criteria_list)):
+            rows = np.flatnonzero(eligible[:, j])
+            rows = rows[np.argsort(-totals[rows, j], kind='stable')]
+
+            ranked_lists.append([{
+                "candidate": candidates[i],
+                "scores": dict(zip(WeightProfiles.COMPONENTS, tensor[i, j].tolist())),
+                "total_score": float(totals[i, j])
+            } for i in rows])
+
+        return ranked_lists
+
+    @staticmethod
+    def select(ranked_lists, counts, exclusive=False):
+        """
+        Select the top candidates of every project.
+
+        Args:
+            ranked_lists: For each project, candidates sorted by total score.
+            counts: Number of candidates to select per project.
+            exclusive: Whether an employee may be selected for at most one project.
+                       Selections are then made greedily across all projects by score.
+
+        Returns:
+            list: For each project, its selected candidates sorted by total score.
+        """
+        if not exclusive:
+            return [ranked[:count] for ranked, count in zip(ranked_lists, counts)]
+
+        pairs = [(candidate_data["total_score"], j, position)
+                 for j, ranked in enumerate(ranked_lists)
+                 for position, candidate_data in enumerate(ranked)]
+        pairs.sort(key=lambda pair: (-pair[0], pair[1], pair[2]))
+
+        selections = [[] for _ in ranked_lists]
+        assigned = set()
+
+        for _, j, position in pairs:
+            candidate_data = ranked_lists[j][position]
+            employee_id = str(candidate_data["candidate"]["_id"])
+
+            if len(selections[j]) >= counts[j] or employee_id in assigned:
+                continue
+
+            selections[j].append(candidate_data)
+            assigned.add(employee_id)
+
+        return selections
+
+    @staticmethod
+    def add_skill_compatibility(selections, criteria_list):
+        """
+        Add the detailed skill compatibility to selected candidates only.
+
+        Args:
+            selections: For each project, its selected candidates.
+            criteria_list: List of project criteria dictionaries.
+
+        Returns:
+            list: The selections, updated in place.
+        """
+        for selected, criteria in zip(selections, criteria_list):
+            project_languages = BatchMatcher.get_project_languages(criteria)
+
+            for candidate_data in selected:
+                skill_compatibility = SkillMatcher.calculate_skill_compatibility(
+                    FeatureMaterializer.get_features(candidate_data["candidate"])["canonical_skills"],
+                    project_languages
+                )
+                candidate_data["scores"]["skill_compatibility"] = skill_compatibility
+                candidate_data["compatibility_percentage"] = skill_compatibility.get("compatibility_percentage", 0)
+
+        return selections
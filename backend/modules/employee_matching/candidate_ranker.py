@@ -1,7 +1,12 @@
+import numpy as np
+
 from modules.employee_matching.skill_matcher import SkillMatcher
 from modules.employee_matching.experience_analyzer import ExperienceAnalyzer
 from modules.employee_matching.fuzzy_matching import FuzzyMatcher
-
+from modules.employee_matching.feature_materializer import FeatureMaterializer
+from modules.employee_matching.score_cache import ScoreCache, score_cache
+from modules.employee_matching.weight_profiles import WeightProfiles
+from modules.employee_matching.semantic_matcher import SemanticMatcher
 
 
 class CandidateRanker:
@@ -14,12 +19,14 @@ class CandidateRanker:
         """
         Rank candidates based on their match to project criteria.
         Includes all candidates with at least one matching skill when include_all_matches is True.
+        Component scores are cached per (project criteria, candidate revision), so ranking the
+        same candidates under different weights only recomputes the weighted sum.
 
         Args:
             candidates: List of candidate data.
             project_criteria: Dictionary of project requirements.
             weights: Dictionary of weights for different criteria.
-                    Default is equal weighting.
+                    Default is the "balanced" weight profile.
             include_all_matches: Include candidates with at least one matching skill.
 
         Returns:
@@ -28,23 +35,19 @@ class CandidateRanker:
         if not candidates or not project_criteria:
             return []
 
-        # Default weights if not provided
-        if not weights:
-            weights = {
-                "skill_match": 0.4,
-                "experience_relevance": 0.3,
-                "years_experience": 0.2,
-                "project_type_match": 0.1
-            }
+        weights = WeightProfiles.resolve_weights(weights)
 
+        criteria_key = ScoreCache.criteria_key(project_criteria)
         ranked_candidates = []
 
         for candidate in candidates:
-            # Calculate various scores
-            scores = CandidateRanker.calculate_candidate_scores(candidate, project_criteria)
+            # Reuse cached component scores for this candidate revision when available
+            candidate_key = ScoreCache.candidate_key(candidate)
+            scores = score_cache.get(criteria_key, candidate_key)
 
-            # Calculate weighted total score
-            total_score = sum(weights.get(key, 0) * scores.get(key, 0) for key in weights)
+            if scores is None:
+                scores = CandidateRanker.calculate_candidate_scores(candidate, project_criteria)
+                score_cache.set(criteria_key, candidate_key, scores)
 
             # Check if candidate has any matching skills
             skill_compatibility = scores.get("skill_compatibility", {})
@@ -56,10 +59,49 @@ class CandidateRanker:
                 ranked_candidates.append({
                     "candidate": candidate,
                     "scores": scores,
-                    "total_score": total_score,
+                    "total_score": 0.0,
                     "compatibility_percentage": skill_compatibility.get("compatibility_percentage", 0)
                 })
 
+        return CandidateRanker.rerank(ranked_candidates, weights)
+
+    @staticmethod
+    def build_score_matrix(ranked_candidates):
+        """
+        Build the candidate-by-component score matrix.
+
+        Args:
+            ranked_candidates: List of ranked candidates with scores.
+
+        Returns:
+            numpy.ndarray: Matrix of shape (len(ranked_candidates), len(WeightProfiles.COMPONENTS)).
+        """
+        return np.array([
+            [candidate_data["scores"].get(component, 0.0) for component in WeightProfiles.COMPONENTS]
+            for candidate_data in ranked_candidates
+        ], dtype=float).reshape(len(ranked_candidates), len(WeightProfiles.COMPONENTS))
+
+    @staticmethod
+    def rerank(ranked_candidates, weights):
+        """
+        Recompute total scores under new weights and re-sort, without rescoring candidates.
+
+        Args:
+            ranked_candidates: List of ranked candidates with scores.
+            weights: Dictionary of weights for the score components.
+
+        Returns:
+            list: Candidates sorted by their new total score.
+        """
+        weights = WeightProfiles.resolve_weights(weights)
+        weight_vector = np.array([weights[component] for component in WeightProfiles.COMPONENTS])
+
+        # Weighted sum over the cached score matrix
+        total_scores = CandidateRanker.build_score_matrix(ranked_candidates) @ weight_vector
+
+        for candidate_data, total_score in zip(ranked_candidates, total_scores):
+            candidate_data["total_score"] = float(total_score)
+
         # Sort candidates by total score (descending)
         ranked_candidates.sort(key=lambda x: x["total_score"], reverse=True)
 
@@ -79,14 +121,22 @@ class CandidateRanker:
         """
         scores = {}
 
+        # Use the features materialized at write time instead of re-parsing raw text
+        features = FeatureMaterializer.get_features(candidate)
+
         # 1. Skill Match Score
         # Get skills from candidate and project
-        candidate_skills = candidate.get("Skills", [])
+        candidate_skills = features["canonical_skills"]
         project_languages = project_criteria.get("languages", "").split(",") if isinstance(
             project_criteria.get("languages"), str) else project_criteria.get("languages", [])
 
+        # Canonicalize the required skills once, as the candidate's skills already are
+        required_skills = SkillMatcher.canonicalize_skills(
+            skill.strip() for skill in project_languages or [] if skill and skill.strip()
+        )
+
         # Calculate skill match score
-        skill_match = SkillMatcher.calculate_skill_similarity(candidate_skills, project_languages)
+        skill_match = SkillMatcher.calculate_skill_similarity(candidate_skills, required_skills)
         scores["skill_match"] = skill_match
 
         # Calculate detailed skill compatibility
@@ -94,37 +144,49 @@ class CandidateRanker:
         scores["skill_compatibility"] = skill_compatibility
 
         # 2. Experience Relevance Score
-        experience_items = candidate.get("Experience", [])
+        experience_periods = features["experience_periods"]
         field = project_criteria.get("field", "")
 
-        # Check if candidate has relevant experience
-        has_relevant_exp, best_match, best_score = ExperienceAnalyzer.has_relevant_experience(
-            experience_items, field
-        )
+        # Score every role against the field once; reused for years of experience below
+        role_similarities = FuzzyMatcher.score_choices(field, features["roles"], method='token_set_ratio')
+        best_score = max(role_similarities, default=0)
 
         # Normalize score to 0-1 range
         scores["experience_relevance"] = best_score / 100.0 if best_score else 0.0
 
         # 3. Years of Experience Score
-        years_experience = ExperienceAnalyzer.get_years_of_experience(experience_items, field)
+        # Only periods in roles relevant to the field count; "Present" is evaluated now
+        if field:
+            experience_periods = [period for period, similarity in zip(experience_periods, role_similarities)
+                                  if similarity >= 70]
+        years_experience = ExperienceAnalyzer.get_years_from_periods(experience_periods)
 
         # Normalize years of experience (assuming 10+ years is max)
         normalized_years = min(years_experience / 10.0, 1.0)
         scores["years_experience"] = normalized_years
 
         # 4. Project Type Match Score
-        project_analysis = ExperienceAnalyzer.analyze_project_experience(experience_items)
+        most_common_type = features["most_common_type"]
         project_type = project_criteria.get("project_type", "")
 
         # If project type is specified, calculate match score
-        if project_type and project_analysis["most_common_type"]:
+        if project_type and most_common_type:
             project_type_similarity = FuzzyMatcher.get_similarity(
-                project_type, project_analysis["most_common_type"], method='token_set_ratio'
+                project_type, most_common_type, method='token_set_ratio'
             ) / 100.0
             scores["project_type_match"] = project_type_similarity
         else:
             scores["project_type_match"] = 0.0
 
+        # 5. Semantic Match Score
+        # Catches close terms that string similarity misses (e.g., "K8s" and "Kubernetes")
+        if SemanticMatcher.is_enabled():
+            scores["semantic_match"] = SemanticMatcher.calculate_semantic_match(
+                features, project_languages, field, candidate_key=ScoreCache.candidate_key(candidate)
+            )
+        else:
+            scores["semantic_match"] = 0.0
+
         return scores
 
     @staticmethod
@@ -1,4 +1,8 @@
+from datetime import datetime
+
 from modules.employee_matching.fuzzy_matching import FuzzyMatcher
+from utils import date_utils
+from utils.keyword_classifier import project_type_classifier
 
 
 class ExperienceAnalyzer:
@@ -25,14 +29,12 @@ class ExperienceAnalyzer:
         best_match = None
         best_score = 0
 
-        # Extract roles from experience items
-        for exp in experience_items:
-            role = exp.get("Role", "")
-
-            # Check similarity of role to the target field
-            similarity = FuzzyMatcher.get_similarity(field, role, method='token_set_ratio')
+        # Score all roles against the target field in one batched call
+        roles = [exp.get("Role", "") for exp in experience_items]
+        similarities = FuzzyMatcher.score_choices(field, roles, method='token_set_ratio')
 
-            # Track the best match
+        # Track the best match
+        for exp, similarity in zip(experience_items, similarities):
             if similarity > best_score:
                 best_score = similarity
                 best_match = exp
@@ -58,39 +60,52 @@ class ExperienceAnalyzer:
         if not experience_items:
             return 0.0
 
-        total_years = 0.0
+        # If a field is specified, score every role against it up front
+        if field:
+            roles = [exp.get("Role", "") for exp in experience_items]
+            similarities = FuzzyMatcher.score_choices(field, roles, method='token_set_ratio')
+            experience_items = [exp for exp, similarity in zip(experience_items, similarities)
+                                if similarity >= min_similarity]
+
+        # Parse all durations at once; overlapping positions are only counted once
+        durations = [exp.get("Duration", "") for exp in experience_items]
+        return date_utils.total_years_of_experience(durations)
 
-        for exp in experience_items:
-            # If a field is specified, check if this experience is relevant
-            if field:
-                similarity = FuzzyMatcher.get_similarity(field, exp.get("Role", ""), method='token_set_ratio')
-                if similarity < min_similarity:
-                    continue
+    @staticmethod
+    def get_years_from_periods(experience_periods, now=None):
+        """
+        Calculate the years of experience covered by derived experience periods.
+
+        Args:
+            experience_periods: List of periods with start_date and exclusive end_date
+                                (end_date is None for current positions).
+            now: Date used as the end of current positions. Defaults to today.
+
+        Returns:
+            float: Years of experience, counting overlapping periods once.
+        """
+        # Current positions run through the end of this month
+        current_end = date_utils.date_to_month_index(now or datetime.now()) + 1
 
-            # Try to calculate duration from the Duration field
-            duration = exp.get("Duration", "")
-            if duration and '-' in duration:
-                try:
-                    start, end = duration.split('-')
+        starts = [date_utils.date_to_month_index(period["start_date"]) for period in experience_periods
+                  if period.get("start_date")]
+        ends = [date_utils.date_to_month_index(period["end_date"]) if period.get("end_date") else current_end
+                for period in experience_periods if period.get("start_date")]
 
-                    # Handle "Present" or current positions
-                    end = end.lower().replace('present', '2023').strip()
-                    start = start.strip()
+        return date_utils.total_years(starts, ends)
 
-                    # Extract years
-                    if len(start) >= 4 and len(end) >= 4:
-                        start_year = int(start[-4:])
-                        end_year = int(end[-4:])
-                        years = end_year - start_year
+    @staticmethod
+    def normalize_role(role):
+        """
+        Normalize a role title for matching.
 
-                        # Don't count negative durations
-                        if years > 0:
-                            total_years += years
-                except Exception:
-                    # If we can't parse the duration, just continue
-                    continue
+        Args:
+            role: Role title from an experience item.
 
-        return total_years
+        Returns:
+            str: Lowercased role title with collapsed whitespace.
+        """
+        return " ".join(str(role or "").lower().split())
 
     @staticmethod
     def get_experience_level(years_experience):
@@ -123,33 +138,17 @@ class ExperienceAnalyzer:
         Returns:
             dict: Project type analysis results.
         """
-        # Project type keywords
-        project_types = {
-            "Web Development": ["web", "frontend", "backend", "full stack", "website", "web application"],
-            "Mobile Development": ["mobile", "android", "ios", "app development", "mobile application"],
-            "Data Science": ["data science", "machine learning", "data analysis", "big data", "analytics"],
-            "Cloud": ["cloud", "aws", "azure", "gcp", "devops", "infrastructure"],
-            "Enterprise": ["enterprise", "erp", "crm", "business application", "saas"]
-        }
-
         # Initialize project type counts
-        project_experience = {project_type: 0 for project_type in project_types}
-
-        # Go through each experience item
-        for exp in experience_items:
-            role = exp.get("Role", "").lower()
-            responsibilities = [r.lower() for r in exp.get("Responsibilities", [])]
-            company = exp.get("Company", "").lower()
-
-            # Combine all text for analysis
-            all_text = " ".join([role] + responsibilities + [company])
-
-            # Count project types found in the experience
-            for project_type, keywords in project_types.items():
-                for keyword in keywords:
-                    if keyword in all_text:
-                        project_experience[project_type] += 1
-                        break  # Count each project type only once per experience
+        project_experience = {project_type: 0 for project_type in project_type_classifier.categories}
+
+        # Combine all text of each experience item for analysis
+        texts = [" ".join([exp.get("Role", "")] + list(exp.get("Responsibilities", [])) + [exp.get("Company", "")])
+                 for exp in experience_items]
+
+        # Classify every experience in one scan; each project type counts once per experience
+        for project_types in project_type_classifier.classify_many(texts):
+            for project_type in project_types:
+                project_experience[project_type] += 1
 
         # Calculate the most common project type
         most_common_type = max(project_experience.items(), key=lambda x: x[1])[0] if any(
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import math
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from modules.employee_matching.skill_matcher import SkillMatcher
+from modules.employee_matching.experience_analyzer import ExperienceAnalyzer
+from utils import date_utils
+
+
+class FeatureMaterializer:
+    """
+    Class for deriving the matching features of a resume once, at write time.
+    Features are stored under the resume's `_derived` key and read by the ranker
+    instead of re-parsing experience and skills on every match request.
+    """
+
+    # Bump when the shape or meaning of the derived features changes
+    FEATURES_VERSION = 5
+
+    # Features version this process has already re-materialized stored resumes for
+    _materialized_version = None
+    _materialize_lock = threading.Lock()
+
+    @staticmethod
+    def current_query():
+        """
+        Build the MongoDB filter selecting resumes with current features.
+        Features written by a newer version count as current, so resumes stay visible
+        to every worker while a deployment rolls out.
+
+        Returns:
+            dict: MongoDB filter.
+        """
+        return {"_derived.features_version": {"$gte": FeatureMaterializer.FEATURES_VERSION}}
+
+    @staticmethod
+    def stale_query():
+        """
+        Build the MongoDB filter selecting resumes whose features are missing or outdated.
+
+        Returns:
+            dict: MongoDB filter.
+        """
+        return {"_derived.features_version": {"$not": {"$gte": FeatureMaterializer.FEATURES_VERSION}}}
+
+    @staticmethod
+    def is_current(derived):
+        """Check whether derived features were written by this or a newer features version."""
+        return (derived or {}).get("features_version", 0) >= FeatureMaterializer.FEATURES_VERSION
+
+    @staticmethod
+    def get_total_years(derived, now=None):
+        """
+        Get the years of experience in derived features as of a given date.
+        Resumes with a current position keep accruing experience after their features are written.
+
+        Args:
+            derived: Derived features.
+            now: Date to evaluate current positions at. Defaults to today.
+
+        Returns:
+            float: Years of experience, rounded to one decimal place.
+        """
+        derived = derived or {}
+
+        experience_start = derived.get("current_experience_start")
+        if not experience_start:
+            return derived.get("total_years_experience", 0) or 0
+
+        current_end = date_utils.date_to_month_index(now or datetime.now()) + 1
+        return date_utils.total_years([date_utils.date_to_month_index(experience_start)], [current_end])
+
+    @staticmethod
+    def min_years_query(min_years, now=None):
+        """
+        Build the MongoDB filter selecting resumes with at least the given years of experience.
+
+        Args:
+            min_years: Minimum years of experience.
+            now: Date to evaluate current positions at. Defaults to today.
+
+        Returns:
+            dict: MongoDB filter.
+        """
+        min_years = float(min_years)
+
+        # Latest start that still reaches min_years once rounded to one decimal like total_years
+        current_end = date_utils.date_to_month_index(now or datetime.now()) + 1
+        latest_start = current_end - math.ceil(min_years * 12 - 0.6)
+
+        return {"$or": [
+            {"_derived.total_years_experience": {"$gte": min_years}},
+            {"_derived.current_experience_start": {"$lte": date_utils.month_index_to_date(latest_start)}}
+        ]}
+
+    @staticmethod
+    def derive_features(employee):
+        """
+        Derive matching features from an employee's resume.
+
+        Args:
+            employee: Employee/resume document.
+
+        Returns:
+            dict: Derived features.
+        """
+        experience_items = employee.get("Experience") or []
+
+        # Parse every duration in one pass
+        durations = [exp.get("Duration", "") for exp in experience_items]
+        now = datetime.now()
+        starts, ends, current = date_utils.parse_date_ranges(durations, now)
+
+        experience_periods = []
+
+        for exp, start, end, is_current in zip(experience_items, starts, ends, current):
+            parsed = not np.isnan(start)
+
+            # Current positions keep no end date so "Present" is evaluated when read
+            experience_periods.append({
+                "role": ExperienceAnalyzer.normalize_role(exp.get("Role", "")),
+                "start_date": date_utils.month_index_to_date(start) if parsed else None,
+                "end_date": date_utils.month_index_to_date(end) if parsed and not is_current else None,
+                "is_current": bool(is_current)
+            })
+
+        # Overlapping positions are only counted once
+        total_months = date_utils.total_months(starts, ends)
+
+        # With a current position the total grows a month per month, so store where it would
+        # have started as one unbroken run and evaluate it when read
+        current_experience_start = None
+        if any(current):
+            current_end = date_utils.date_to_month_index(now) + 1
+            current_experience_start = date_utils.month_index_to_date(current_end - total_months)
+
+        project_analysis = ExperienceAnalyzer.analyze_project_experience(experience_items)
+
+        responsibilities = [str(responsibility).strip() for exp in experience_items
+                            for responsibility in exp.get("Responsibilities", []) or []
+                            if str(responsibility).strip()]
+
+        return {
+            "features_version": FeatureMaterializer.FEATURES_VERSION,
+            "revision": FeatureMaterializer.get_revision(employee),
+            "roles": [period["role"] for period in experience_periods],
+            "responsibilities": responsibilities,
+            "experience_periods": experience_periods,
+            "total_years_experience": round(total_months / 12.0, 1),
+            "current_experience_start": current_experience_start,
+            "project_type_counts": project_analysis["project_type_counts"],
+            "most_common_type": project_analysis["most_common_type"],
+            "canonical_skills": SkillMatcher.canonicalize_skills(employee.get("Skills", []))
+        }
+
+    @staticmethod
+    def get_revision(employee):
+        """
+        Get a revision identifier for the resume fields that matching depends on.
+
+        Args:
+            employee: Employee/resume document.
+
+        Returns:
+            str: Content hash that changes whenever skills or experience change.
+        """
+        source = json.dumps({
+            "Skills": employee.get("Skills", []),
+            "Experience": employee.get("Experience", [])
+        }, sort_keys=True, default=str)
+
+        return hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def materialize(employee):
+        """
+        Store derived features on an employee document, keeping other derived fields.
+
+        Args:
+            employee: Employee/resume document. Updated in place.
+
+        Returns:
+            dict: The updated employee document.
+        """
+        derived = dict(employee.get("_derived") or {})
+        derived.update(FeatureMaterializer.derive_features(employee))
+        employee["_derived"] = derived
+
+        return employee
+
+    @staticmethod
+    def get_features(employee):
+        """
+        Get the derived features of an employee, computing them if missing or stale.
+
+        Args:
+            employee: Employee/resume document.
+
+        Returns:
+            dict: Derived features.
+        """
+        derived = employee.get("_derived") or {}
+
+        if FeatureMaterializer.is_current(derived):
+            return derived
+
+        return FeatureMaterializer.derive_features(employee)
+
+    @staticmethod
+    def materialize_stale():
+        """
+        Re-materialize the stored resumes whose features are missing or outdated, e.g. resumes
+        written before the current features version was deployed, so candidate queries find them.
+
+        Returns:
+            list: The updated resume documents.
+        """
+        from services.mongodb_service import mongodb_service
+
+        resumes = mongodb_service.find_many('Resumes', FeatureMaterializer.stale_query())
+        for resume in resumes:
+            FeatureMaterializer.materialize(resume)
+
+        mongodb_service.bulk_update('Resumes', [({'_id': resume['_id']}, {'$set': {'_derived': resume['_derived']}})
+                                                for resume in resumes])
+        return resumes
+
+    @staticmethod
+    def materialize_stale_once():
+        """
+        Re-materialize stale resumes once per features version in this process. Later calls
+        return immediately, so match requests don't query for stale resumes every time.
+
+        Returns:
+            list: The updated resume documents, empty once this version has been materialized.
+        """
+        if FeatureMaterializer._materialized_version == FeatureMaterializer.FEATURES_VERSION:
+            return []
+
+        with FeatureMaterializer._materialize_lock:
+            if FeatureMaterializer._materialized_version == FeatureMaterializer.FEATURES_VERSION:
+                return []
+
+            resumes = FeatureMaterializer.materialize_stale()
+            FeatureMaterializer._materialized_version = FeatureMaterializer.FEATURES_VERSION
+            return resumes
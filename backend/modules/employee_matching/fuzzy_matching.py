@@ -1,11 +1,41 @@
-from fuzzywuzzy import fuzz, process
+from rapidfuzz import fuzz, process
+
+
+def normalize(text):
+    """
+    Prepare a string for matching: lowercase and trim it, but keep symbols so that
+    skills such as "C", "C#" and "C++" stay distinct.
+    """
+    return text.lower().strip()
 
 
 class FuzzyMatcher:
     """
     Class for performing fuzzy string matching and similarity calculations.
+    Backed by rapidfuzz, which scores a query against many choices in a single native call.
     """
 
+    # Supported matching methods mapped to their rapidfuzz scorers
+    SCORERS = {
+        'ratio': fuzz.ratio,
+        'partial_ratio': fuzz.partial_ratio,
+        'token_sort_ratio': fuzz.token_sort_ratio,
+        'token_set_ratio': fuzz.token_set_ratio
+    }
+
+    @staticmethod
+    def get_scorer(method='partial_ratio'):
+        """
+        Get the scorer function for a matching method.
+
+        Args:
+            method: Matching method ('ratio', 'partial_ratio', 'token_sort_ratio', 'token_set_ratio').
+
+        Returns:
+            callable: Scorer function. Defaults to partial_ratio for unknown methods.
+        """
+        return FuzzyMatcher.SCORERS.get(method, fuzz.partial_ratio)
+
     @staticmethod
     def get_similarity(str1, str2, method='partial_ratio'):
         """
@@ -23,19 +53,9 @@ class FuzzyMatcher:
         if not str1 or not str2:
             return 0
 
-        str1 = str(str1).lower()
-        str2 = str(str2).lower()
+        scorer = FuzzyMatcher.get_scorer(method)
 
-        if method == 'ratio':
-            return fuzz.ratio(str1, str2)
-        elif method == 'partial_ratio':
-            return fuzz.partial_ratio(str1, str2)
-        elif method == 'token_sort_ratio':
-            return fuzz.token_sort_ratio(str1, str2)
-        elif method == 'token_set_ratio':
-            return fuzz.token_set_ratio(str1, str2)
-        else:
-            return fuzz.partial_ratio(str1, str2)  # Default to partial_ratio
+        return round(scorer(str(str1), str(str2), processor=normalize))
 
     @staticmethod
     def find_best_match(query, choices, method='partial_ratio', threshold=70):
@@ -54,31 +74,23 @@ class FuzzyMatcher:
         if not query or not choices:
             return None, 0
 
-        query = str(query).lower()
-
-        # Select the appropriate fuzz function
-        if method == 'ratio':
-            scorer = fuzz.ratio
-        elif method == 'partial_ratio':
-            scorer = fuzz.partial_ratio
-        elif method == 'token_sort_ratio':
-            scorer = fuzz.token_sort_ratio
-        elif method == 'token_set_ratio':
-            scorer = fuzz.token_set_ratio
-        else:
-            scorer = fuzz.partial_ratio  # Default to partial_ratio
-
-        # Find the best match
-        best_match, score = process.extractOne(query, choices, scorer=scorer)
+        # score_cutoff lets the scorer skip choices that cannot reach the threshold
+        result = process.extractOne(
+            str(query), choices,
+            scorer=FuzzyMatcher.get_scorer(method),
+            processor=normalize,
+            score_cutoff=threshold
+        )
 
         # Return the match only if it meets the threshold
-        if score >= threshold:
-            return best_match, score
-        else:
+        if result is None:
             return None, 0
 
+        best_match, score, _ = result
+        return best_match, round(score)
+
     @staticmethod
-    def filter_matches(query, choices, method='partial_ratio', threshold=70):
+    def filter_matches(query, choices, method='partial_ratio', threshold=70, limit=5):
         """
         Filter a list of choices based on similarity to a query.
 
@@ -87,6 +99,7 @@ class FuzzyMatcher:
             choices: List of possible choices.
             method: Matching method ('ratio', 'partial_ratio', 'token_sort_ratio', 'token_set_ratio').
             threshold: Minimum similarity score to consider a match (0-100).
+            limit: Maximum number of matches to return. None returns all matches.
 
         Returns:
             list: List of tuples (match, score) for matches above threshold.
@@ -94,20 +107,62 @@ class FuzzyMatcher:
         if not query or not choices:
             return []
 
-        query = str(query).lower()
-
-        # Select the appropriate fuzz function
-        if method == 'ratio':
-            scorer = fuzz.ratio
-        elif method == 'partial_ratio':
-            scorer = fuzz.partial_ratio
-        elif method == 'token_sort_ratio':
-            scorer = fuzz.token_sort_ratio
-        elif method == 'token_set_ratio':
-            scorer = fuzz.token_set_ratio
-        else:
-            scorer = fuzz.partial_ratio  # Default to partial_ratio
-
-        # Find all matches above threshold
-        matches = process.extract(query, choices, scorer=scorer)
-        return [(match, score) for match, score in matches if score >= threshold]
\ No newline at end of file
+        # Find all matches above threshold, best first
+        matches = process.extract(
+            str(query), choices,
+            scorer=FuzzyMatcher.get_scorer(method),
+            processor=normalize,
+            score_cutoff=threshold,
+            limit=limit
+        )
+        return [(match, round(score)) for match, score, _ in matches]
+
+    @staticmethod
+    def score_choices(query, choices, method='partial_ratio', threshold=0):
+        """
+        Score a query against every choice in a single batched call.
+
+        Args:
+            query: The string to match.
+            choices: List of possible choices.
+            method: Matching method ('ratio', 'partial_ratio', 'token_sort_ratio', 'token_set_ratio').
+            threshold: Scores below this value are reported as 0 (0-100).
+
+        Returns:
+            list: Similarity scores (0-100), aligned with choices.
+        """
+        if not choices:
+            return []
+
+        if not query:
+            return [0] * len(choices)
+
+        # Empty choices score 0, matching get_similarity
+        choices = [str(choice) if choice else "" for choice in choices]
+
+        scores = FuzzyMatcher.cdist([query], choices, method=method, threshold=threshold)
+        return [round(score) for score in scores[0]]
+
+    @staticmethod
+    def cdist(queries, choices, method='partial_ratio', threshold=0, workers=1):
+        """
+        Score many queries against many choices.
+
+        Args:
+            queries: List of query strings.
+            choices: List of possible choices.
+            method: Matching method ('ratio', 'partial_ratio', 'token_sort_ratio', 'token_set_ratio').
+            threshold: Scores below this value are reported as 0 (0-100).
+            workers: Number of threads used for scoring. -1 uses all cores.
+
+        Returns:
+            numpy.ndarray: Score matrix of shape (len(queries), len(choices)).
+        """
+        return process.cdist(
+            [str(query) for query in queries],
+            [str(choice) for choice in choices],
+            scorer=FuzzyMatcher.get_scorer(method),
+            processor=normalize,
+            score_cutoff=threshold,
+            workers=workers
+        )
@@ -0,0 +1,260 @@
+from modules.employee_matching.skill_matcher import SkillMatcher
+from modules.employee_matching.feature_materializer import FeatureMaterializer
+from modules.employee_matching.semantic_matcher import SemanticMatcher
+
+
+class CandidateQueryPlanner:
+    """
+    Class for turning project criteria into a MongoDB query over materialized resume features.
+    Only plausible candidates are returned, carrying only the fields scoring needs.
+    """
+
+    # Fields read by CandidateRanker.calculate_candidate_scores
+    SCORING_FIELDS = [
+        "Name",
+        "_derived.features_version",
+        "_derived.revision",
+        "_derived.roles",
+        "_derived.responsibilities",
+        "_derived.experience_periods",
+        "_derived.total_years_experience",
+        "_derived.current_experience_start",
+        "_derived.project_type_counts",
+        "_derived.most_common_type",
+        "_derived.canonical_skills"
+    ]
+
+    # Indexes on Resumes that back the generated filters
+    INDEXES = [
+        "_derived.canonical_skills",
+        "_derived.total_years_experience",
+        "_derived.current_experience_start",
+        "_derived.features_version"
+    ]
+
+    @staticmethod
+    def get_project_criteria(project):
+        """
+        Build the matching criteria for a stored project.
+
+        Args:
+            project: Project document.
+
+        Returns:
+            dict: Project criteria.
+        """
+        return {
+            "languages": project.get("project_languages", ""),
+            "field": project.get("project_type", "Software Development"),
+            "people_count": project.get("project_team_size", 1),
+            "project_type": project.get("project_type", "Software Development")
+        }
+
+    @staticmethod
+    def get_required_skills(project_criteria):
+        """
+        Get the list of required skills from project criteria.
+
+        Args:
+            project_criteria: Dictionary of project requirements.
+
+        Returns:
+            list: Required skills with blanks removed.
+        """
+        languages = project_criteria.get("languages", [])
+        if isinstance(languages, str):
+            languages = languages.split(",")
+
+        return [skill.strip() for skill in languages or [] if skill and skill.strip()]
+
+    @staticmethod
+    def expand_skills(required_skills):
+        """
+        Expand required skills with their related skills, in canonical form.
+        With semantic matching enabled, the semantic index's nearest skills are added too.
+
+        Args:
+            required_skills: List of required skills.
+
+        Returns:
+            list: Canonical skills a plausible candidate has at least one of.
+        """
+        canonical_required = SkillMatcher.canonicalize_skills(required_skills)
+        expanded = list(canonical_required)
+
+        # A related skill on either side of a pair counts as a match during scoring
+        for rel_1, rel_2 in SkillMatcher.get_related_skills():
+            canonical_1 = SkillMatcher.canonicalize_skill(rel_1)
+            canonical_2 = SkillMatcher.canonicalize_skill(rel_2)
+
+            if canonical_1 in canonical_required and canonical_2 not in expanded:
+                expanded.append(canonical_2)
+            if canonical_2 in canonical_required and canonical_1 not in expanded:
+                expanded.append(canonical_1)
+
+        for skill in SemanticMatcher.expand_skills(required_skills):
+            if skill not in expanded:
+                expanded.append(skill)
+
+        return expanded
+
+    @staticmethod
+    def build_filter(project_criteria):
+        """
+        Build the MongoDB filter selecting plausible candidates for the project.
+
+        Args:
+            project_criteria: Dictionary of project requirements. Uses 'languages'
+                              and the optional 'min_years_experience'.
+
+        Returns:
+            dict: MongoDB filter.
+        """
+        query = FeatureMaterializer.current_query()
+
+        required_skills = CandidateQueryPlanner.get_required_skills(project_criteria)
+        if required_skills:
+            query["_derived.canonical_skills"] = {"$in": CandidateQueryPlanner.expand_skills(required_skills)}
+
+        min_years = project_criteria.get("min_years_experience")
+        if min_years:
+            query.update(FeatureMaterializer.min_years_query(min_years))
+
+        return query
+
+    @staticmethod
+    def build_union_filter(criteria_list):
+        """
+        Build the MongoDB filter selecting plausible candidates for any of several projects.
+
+        Args:
+            criteria_list: List of project criteria dictionaries.
+
+        Returns:
+            dict: MongoDB filter.
+        """
+        filters = []
+        for project_criteria in criteria_list:
+            query = CandidateQueryPlanner.build_filter(project_criteria)
+            if query not in filters:
+                filters.append(query)
+
+        return filters[0] if len(filters) == 1 else {"$or": filters}
+
+    @staticmethod
+    def build_projection():
+        """
+        Build the MongoDB projection limiting candidates to the fields scoring needs.
+
+        Returns:
+            dict: MongoDB projection.
+        """
+        return {field: 1 for field in CandidateQueryPlanner.SCORING_FIELDS}
+
+    @staticmethod
+    def build_detail_projection(fields=None):
+        """
+        Build the MongoDB projection for the resume details returned to clients.
+
+        Args:
+            fields: Resume fields to return (optional). Defaults to every field
+                    except the internal materialized features.
+
+        Returns:
+            dict: MongoDB projection.
+        """
+        if isinstance(fields, str):
+            fields = fields.split(",")
+
+        fields = [field.strip() for field in fields or [] if field and field.strip()]
+        if not fields:
+            return {"_derived": 0}
+
+        return {field: 1 for field in fields}
+
+    @staticmethod
+    def plan(project_criteria):
+        """
+        Plan the candidate query for the project criteria.
+
+        Args:
+            project_criteria: Dictionary of project requirements.
+
+        Returns:
+            dict: 'filter' and 'projection' to pass to find_many on Resumes.
+        """
+        return {
+            "filter": CandidateQueryPlanner.build_filter(project_criteria),
+            "projection": CandidateQueryPlanner.build_projection()
+        }
+
+    @staticmethod
+    def matches(project_criteria, candidate):
+        """
+        Check in Python whether a candidate passes the filter built for the project criteria.
+
+        Args:
+            project_criteria: Dictionary of project requirements.
+            candidate: Candidate document with materialized features.
+
+        Returns:
+            bool: True if the planned query would return the candidate.
+        """
+        derived = candidate.get("_derived") or {}
+        if not FeatureMaterializer.is_current(derived):
+            return False
+
+        required_skills = CandidateQueryPlanner.get_required_skills(project_criteria)
+        if required_skills:
+            expanded = set(CandidateQueryPlanner.expand_skills(required_skills))
+            if not expanded.intersection(derived.get("canonical_skills", [])):
+                return False
+
+        min_years = project_criteria.get("min_years_experience")
+        if min_years and FeatureMaterializer.get_total_years(derived) < float(min_years):
+            return False
+
+        return True
+
+    @staticmethod
+    def project(candidate):
+        """
+        Reduce a full candidate document to the fields the planned projection returns.
+
+        Args:
+            candidate: Candidate document.
+
+        Returns:
+            dict: Document with only '_id' and the scoring fields.
+        """
+        projected = {"_id": candidate["_id"]}
+
+        for field in CandidateQueryPlanner.SCORING_FIELDS:
+            source, target, keys = candidate, projected, field.split(".")
+            for key in keys[:-1]:
+                source = source.get(key) or {}
+                target = target.setdefault(key, {})
+            if keys[-1] in source:
+                target[keys[-1]] = source[keys[-1]]
+
+        return projected
+
+    @staticmethod
+    def attach_details(ranked_candidates, documents):
+        """
+        Replace projected candidates with their full resume documents.
+
+        Args:
+            ranked_candidates: Ranked candidates holding projected documents.
+            documents: Full resume documents for (at least) those candidates.
+
+        Returns:
+            list: The ranked candidates, updated in place.
+        """
+        documents_by_id = {str(document["_id"]): document for document in documents}
+
+        for candidate_data in ranked_candidates:
+            candidate_id = str(candidate_data["candidate"]["_id"])
+            candidate_data["candidate"] = documents_by_id.get(candidate_id, candidate_data["candidate"])
+
+        return ranked_candidates
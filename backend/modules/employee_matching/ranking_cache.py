@@ -0,0 +1,178 @@
+import threading
+from collections import OrderedDict
+
+from services.mongodb_service import mongodb_service
+from modules.employee_matching.candidate_ranker import CandidateRanker
+from modules.employee_matching.query_planner import CandidateQueryPlanner
+from modules.employee_matching.score_cache import ScoreCache
+
+
+class RankingCache:
+    """
+    In-process LRU cache of complete candidate rankings, one per project or criteria.
+    Each ranking keeps every candidate's score vector in rank order. When a resume changes,
+    only that candidate is rescored and moved to its new position in the affected rankings.
+    Resume changes also bump the resumes' version, so other worker processes drop their
+    rankings instead of serving stale ones.
+    """
+
+    # Version counter of the resumes the rankings were built from
+    VERSION_NAME = 'Resumes'
+
+    def __init__(self, max_rankings=64):
+        """Initialize an empty cache holding at most max_rankings rankings."""
+        self.max_rankings = max_rankings
+        self._rankings = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _copy(ranked_candidates):
+        """Copy ranked entries, their candidates and scores so callers can annotate and re-sort them freely."""
+        return [dict(candidate_data, candidate=dict(candidate_data["candidate"]), scores=dict(candidate_data["scores"]))
+                for candidate_data in ranked_candidates]
+
+    def _check_version(self):
+        """Drop every ranking if another process changed resumes since they were cached. Requires the lock."""
+        version = mongodb_service.get_version(self.VERSION_NAME)
+        if version != self._version:
+            self._rankings.clear()
+            self._version = version
+
+    def _written(self):
+        """
+        Record a resume change this process applies to its rankings. Requires the lock.
+        If another process also changed resumes meanwhile, the rankings are dropped.
+        """
+        version = mongodb_service.bump_version(self.VERSION_NAME)
+        if self._version is not None and version == self._version + 1:
+            self._version = version
+        else:
+            self._rankings.clear()
+            self._version = version
+
+    @staticmethod
+    def _insert(ranked_candidates, candidate_data):
+        """Insert a ranked entry after every entry with a higher or equal total score."""
+        low, high = 0, len(ranked_candidates)
+        while low < high:
+            middle = (low + high) // 2
+            if ranked_candidates[middle]["total_score"] >= candidate_data["total_score"]:
+                low = middle + 1
+            else:
+                high = middle
+        ranked_candidates.insert(low, candidate_data)
+
+    def get(self, key, project_criteria, weights):
+        """
+        Get a cached ranking.
+
+        Args:
+            key: Ranking key, e.g. the project ID.
+            project_criteria: Dictionary of project requirements the ranking must match.
+            weights: Normalized weights to rank with.
+
+        Returns:
+            list: Copies of the ranked candidates, or None if no usable ranking is cached.
+        """
+        criteria_key = ScoreCache.criteria_key(project_criteria)
+
+        with self._lock:
+            self._check_version()
+
+            ranking = self._rankings.get(key)
+            if ranking is None or ranking["criteria_key"] != criteria_key or \
+                    ranking["project_criteria"].get("min_years_experience") != \
+                    project_criteria.get("min_years_experience"):
+                return None
+
+            self._rankings.move_to_end(key)
+
+            # Reorder the stored score vectors only when the weights changed
+            if ranking["weights"] != weights:
+                CandidateRanker.rerank(ranking["ranked"], weights)
+                ranking["weights"] = dict(weights)
+
+            return RankingCache._copy(ranking["ranked"])
+
+    def set(self, key, project_criteria, weights, ranked_candidates):
+        """
+        Cache a ranking.
+
+        Args:
+            key: Ranking key, e.g. the project ID.
+            project_criteria: Dictionary of project requirements the ranking was built for.
+            weights: Normalized weights the ranking was built with.
+            ranked_candidates: Every candidate returned by the planned query, ranked.
+        """
+        with self._lock:
+            self._check_version()
+
+            self._rankings[key] = {
+                "criteria_key": ScoreCache.criteria_key(project_criteria),
+                "project_criteria": dict(project_criteria),
+                "weights": dict(weights),
+                "ranked": RankingCache._copy(ranked_candidates)
+            }
+            self._rankings.move_to_end(key)
+
+            while len(self._rankings) > self.max_rankings:
+                self._rankings.popitem(last=False)
+
+    def update_candidate(self, candidate):
+        """
+        Rescore one changed candidate in every cached ranking.
+
+        Args:
+            candidate: The candidate's full, updated document with materialized features.
+
+        Returns:
+            int: Number of rankings updated.
+        """
+        candidate = CandidateQueryPlanner.project(candidate)
+        candidate_id = str(candidate["_id"])
+
+        with self._lock:
+            self._written()
+
+            for ranking in self._rankings.values():
+                ranked = ranking["ranked"]
+                ranking["ranked"] = [candidate_data for candidate_data in ranked
+                                     if str(candidate_data["candidate"]["_id"]) != candidate_id]
+
+                # The candidate may have started or stopped passing the project's pre-filter
+                if CandidateQueryPlanner.matches(ranking["project_criteria"], candidate):
+                    rescored = CandidateRanker.rank_candidates([candidate], ranking["project_criteria"],
+                                                               weights=ranking["weights"])
+                    for candidate_data in rescored:
+                        RankingCache._insert(ranking["ranked"], candidate_data)
+
+            return len(self._rankings)
+
+    def remove_candidate(self, candidate_id):
+        """Remove a deleted candidate from every cached ranking."""
+        candidate_id = str(candidate_id)
+
+        with self._lock:
+            self._written()
+
+            for ranking in self._rankings.values():
+                ranking["ranked"] = [candidate_data for candidate_data in ranking["ranked"]
+                                     if str(candidate_data["candidate"]["_id"]) != candidate_id]
+
+    def invalidate(self, key):
+        """Drop the ranking cached under key."""
+        with self._lock:
+            self._rankings.pop(key, None)
+
+    def clear(self):
+        """Drop every cached ranking."""
+        with self._lock:
+            self._rankings.clear()
+
+    def __len__(self):
+        return len(self._rankings)
+
+
+# Shared cache used by the matching routes
+ranking_cache = RankingCache()
@@ -0,0 +1,90 @@
+import json
+import threading
+from collections import OrderedDict
+
+
+class ScoreCache:
+    """
+    In-process LRU cache of per-candidate component scores.
+    Entries are keyed by the scoring-relevant project criteria and the candidate's
+    resume revision, so re-ranking under new weights never recomputes scores.
+    """
+
+    def __init__(self, max_entries=200000):
+        """Initialize an empty cache holding at most max_entries candidate scores."""
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def criteria_key(project_criteria):
+        """
+        Build a cache key from the project criteria that affect component scores.
+
+        Args:
+            project_criteria: Dictionary of project requirements.
+
+        Returns:
+            str: Stable key for the criteria.
+        """
+        languages = project_criteria.get("languages", [])
+        if isinstance(languages, str):
+            languages = languages.split(",")
+
+        return json.dumps({
+            "languages": sorted(skill.strip().lower() for skill in languages or [] if skill and skill.strip()),
+            "field": str(project_criteria.get("field", "") or "").strip().lower(),
+            "project_type": str(project_criteria.get("project_type", "") or "").strip().lower()
+        }, sort_keys=True)
+
+    @staticmethod
+    def candidate_key(candidate):
+        """
+        Build a cache key identifying a candidate's resume revision.
+
+        Args:
+            candidate: Candidate document.
+
+        Returns:
+            tuple: (candidate id, revision), or None if the candidate can't be cached.
+        """
+        revision = (candidate.get("_derived") or {}).get("revision")
+        if "_id" not in candidate or not revision:
+            return None
+
+        return str(candidate["_id"]), revision
+
+    def get(self, criteria_key, candidate_key):
+        """Get cached scores, or None if missing."""
+        if candidate_key is None:
+            return None
+
+        with self._lock:
+            scores = self._entries.get((criteria_key, candidate_key))
+            if scores is not None:
+                self._entries.move_to_end((criteria_key, candidate_key))
+            return scores
+
+    def set(self, criteria_key, candidate_key, scores):
+        """Cache scores, evicting the least recently used entries when full."""
+        if candidate_key is None:
+            return
+
+        with self._lock:
+            self._entries[(criteria_key, candidate_key)] = scores
+            self._entries.move_to_end((criteria_key, candidate_key))
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached scores."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Shared cache used by CandidateRanker
+score_cache = ScoreCache()
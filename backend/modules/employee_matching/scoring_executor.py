@@ -0,0 +1,197 @@
+import heapq
+import multiprocessing
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from config import active_config
+from modules.employee_matching.candidate_ranker import CandidateRanker
+from modules.employee_matching.score_cache import ScoreCache, score_cache
+from modules.employee_matching.weight_profiles import WeightProfiles
+
+
+def _rank_shard(shm_name, offset, size, project_criteria, weights, include_all_matches, top_k):
+    """
+    Score and rank one shard of candidates in a worker process.
+
+    Args:
+        shm_name: Name of the shared memory block holding the pickled shards.
+        offset: Byte offset of this shard in the block.
+        size: Byte size of this shard.
+        project_criteria: Dictionary of project requirements.
+        weights: Resolved weights.
+        include_all_matches: Include candidates without any matching skill.
+        top_k: Number of best candidates to return, or None for all.
+
+    Returns:
+        list: (position in the shard, scores, total score) tuples, best first.
+    """
+    # Workers share the parent's resource tracker, so attaching doesn't take ownership of the block
+    block = shared_memory.SharedMemory(name=shm_name)
+    try:
+        candidates = pickle.loads(block.buf[offset:offset + size])
+    finally:
+        block.close()
+
+    ranked = []
+    for position, candidate in enumerate(candidates):
+        scores = CandidateRanker.calculate_candidate_scores(candidate, project_criteria)
+        if include_all_matches or scores["skill_compatibility"].get("has_match", False):
+            ranked.append({"index": position, "scores": scores, "total_score": 0.0})
+
+    ranked = CandidateRanker.rerank(ranked, weights)
+    if top_k is not None:
+        ranked = ranked[:top_k]
+
+    return [(entry["index"], entry["scores"], entry["total_score"]) for entry in ranked]
+
+
+class ScoringExecutor:
+    """
+    Scores large candidate pools across a persistent pool of worker processes.
+    Candidates whose scores aren't cached are split into shards, pickled once into a
+    shared memory block that workers read from, and ranked per shard; the sorted shard
+    rankings are then merged. Pools smaller than the threshold are scored in-process.
+    """
+
+    def __init__(self, workers=None, threshold=20000, shards_per_worker=2):
+        """
+        Initialize the executor; worker processes are only started on first use.
+
+        Args:
+            workers: Number of worker processes. 0 or 1 scores everything in-process.
+            threshold: Minimum number of uncached candidates scored in parallel.
+            shards_per_worker: Shards per worker, so uneven shards still balance.
+        """
+        self.workers = workers if workers is not None else (multiprocessing.cpu_count() or 1)
+        self.threshold = threshold
+        self.shards_per_worker = shards_per_worker
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        """Get the worker pool, starting it if needed."""
+        with self._lock:
+            if self._pool is None:
+                # Workers fork from a clean server process, not from the web server with its open connections
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context(method))
+            return self._pool
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def rank_candidates(self, candidates, project_criteria, weights=None, include_all_matches=True, top_k=None):
+        """
+        Rank candidates like CandidateRanker.rank_candidates, in parallel for large pools.
+
+        Args:
+            candidates: List of candidate data.
+            project_criteria: Dictionary of project requirements.
+            weights: Dictionary of weights for different criteria.
+            include_all_matches: Include candidates with at least one matching skill.
+            top_k: Number of best candidates to return, or None for all.
+
+        Returns:
+            list: Sorted list of candidates with scores, in the same order as in-process ranking.
+        """
+        if not candidates or not project_criteria:
+            return []
+
+        weights = WeightProfiles.resolve_weights(weights)
+        criteria_key = ScoreCache.criteria_key(project_criteria)
+
+        cached = [score_cache.get(criteria_key, ScoreCache.candidate_key(candidate)) for candidate in candidates]
+        uncached = [index for index, scores in enumerate(cached) if scores is None]
+
+        if self.workers <= 1 or not uncached or len(uncached) < self.threshold:
+            ranked_candidates = CandidateRanker.rank_candidates(candidates, project_criteria, weights=weights,
+                                                                include_all_matches=include_all_matches)
+            return ranked_candidates[:top_k] if top_k is not None else ranked_candidates
+
+        try:
+            shard_rankings = self._rank_uncached(candidates, uncached, project_criteria, weights,
+                                                 include_all_matches, top_k)
+        except (OSError, RuntimeError) as e:
+            # e.g. no shared memory or a worker died; restart the pool on the next call
+            print(f"Parallel scoring failed, scoring in-process: {e}")
+            self.shutdown()
+            ranked_candidates = CandidateRanker.rank_candidates(candidates, project_criteria, weights=weights,
+                                                                include_all_matches=include_all_matches)
+            return ranked_candidates[:top_k] if top_k is not None else ranked_candidates
+
+        # Candidates with cached scores form one more sorted shard
+        cached_ranked = CandidateRanker.rerank([
+            {"index": index, "scores": scores, "total_score": 0.0}
+            for index, scores in enumerate(cached)
+            if scores is not None and (include_all_matches or scores["skill_compatibility"].get("has_match", False))
+        ], weights)
+        shard_rankings.append([(entry["index"], entry["scores"], entry["total_score"]) for entry in cached_ranked])
+
+        # Merge the sorted shards; ties keep the input order, as a stable sort would
+        merged = heapq.merge(*shard_rankings, key=lambda entry: (-entry[2], entry[0]))
+
+        ranked_candidates = []
+        for index, scores, total_score in merged:
+            if top_k is not None and len(ranked_candidates) >= top_k:
+                break
+
+            candidate = candidates[index]
+            if cached[index] is None:
+                score_cache.set(criteria_key, ScoreCache.candidate_key(candidate), scores)
+
+            ranked_candidates.append({
+                "candidate": candidate,
+                "scores": scores,
+                "total_score": total_score,
+                "compatibility_percentage": scores["skill_compatibility"].get("compatibility_percentage", 0)
+            })
+
+        return ranked_candidates
+
+    def _rank_uncached(self, candidates, uncached, project_criteria, weights, include_all_matches, top_k):
+        """
+        Rank the uncached candidates in the worker processes.
+
+        Returns:
+            list: One ranking of (candidate index, scores, total score) tuples per shard.
+        """
+        shard_count = self.workers * self.shards_per_worker
+        shard_size = -(-len(uncached) // shard_count)
+
+        # Workers only need the scoring fields; pickle every shard once into shared memory
+        shards = []
+        payloads = []
+        for start in range(0, len(uncached), shard_size):
+            indexes = uncached[start:start + shard_size]
+            payloads.append(pickle.dumps([candidates[index] for index in indexes], protocol=pickle.HIGHEST_PROTOCOL))
+            shards.append(indexes)
+
+        block = shared_memory.SharedMemory(create=True, size=max(sum(len(payload) for payload in payloads), 1))
+        try:
+            offset = 0
+            futures = []
+            for payload in payloads:
+                block.buf[offset:offset + len(payload)] = payload
+                futures.append(self._get_pool().submit(
+                    _rank_shard, block.name, offset, len(payload), project_criteria, weights,
+                    include_all_matches, top_k
+                ))
+                offset += len(payload)
+
+            # Map shard positions back to indexes in the full candidate list
+            return [[(indexes[position], scores, total_score) for position, scores, total_score in future.result()]
+                    for indexes, future in zip(shards, futures)]
+        finally:
+            block.close()
+            block.unlink()
+
+
+scoring_executor = ScoringExecutor(workers=getattr(active_config, 'SCORING_WORKERS', None),
+                                   threshold=getattr(active_config, 'PARALLEL_SCORING_THRESHOLD', 20000))
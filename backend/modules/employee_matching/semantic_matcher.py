@@ -0,0 +1,246 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from config import active_config
+from modules.employee_matching.skill_matcher import SkillMatcher
+from modules.skill_recommendation.role_hierarchy import RoleHierarchy
+
+try:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.decomposition import TruncatedSVD
+except ImportError:  # scikit-learn is optional; semantic matching is disabled without it
+    TfidfVectorizer = None
+    TruncatedSVD = None
+
+
+class SemanticIndex:
+    """
+    Local embedding model and brute-force vector index for skills, roles and responsibilities.
+    Texts are embedded with character n-gram TF-IDF reduced by LSA, so spelling variants and
+    terms that co-occur in the seed corpus (e.g., "Kubernetes" and "K8s") land close together.
+    """
+
+    def __init__(self, corpus, n_components=64, max_cached_candidates=100000):
+        """
+        Fit the embedding model on a corpus and index its terms.
+
+        Args:
+            corpus: List of documents. Each document is a list of related terms.
+            n_components: Embedding dimensions.
+            max_cached_candidates: Number of candidate vector sets kept in memory.
+        """
+        documents = [" ".join(terms) for terms in corpus]
+
+        self.vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 4), sublinear_tf=True)
+        tfidf = self.vectorizer.fit_transform(documents)
+
+        n_components = max(1, min(n_components, tfidf.shape[1] - 1, len(documents) - 1))
+        self.svd = TruncatedSVD(n_components=n_components, random_state=0)
+        self.svd.fit(tfidf)
+
+        # Vocabulary index for nearest-neighbour queries
+        self.terms = sorted({term.lower() for terms in corpus for term in terms})
+        self.term_vectors = self.embed(self.terms)
+
+        self.max_cached_candidates = max_cached_candidates
+        self._candidate_vectors = OrderedDict()
+        self._lock = threading.Lock()
+
+    def embed(self, texts):
+        """
+        Embed texts as unit vectors.
+
+        Args:
+            texts: List of strings.
+
+        Returns:
+            numpy.ndarray: Matrix of shape (len(texts), n_components).
+        """
+        if not texts:
+            return np.zeros((0, self.svd.n_components))
+
+        vectors = self.svd.transform(self.vectorizer.transform([str(text).lower() for text in texts]))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+
+        return vectors / norms
+
+    def nearest(self, texts, k=5, min_similarity=0.0):
+        """
+        Find the vocabulary terms closest to each of several texts.
+
+        Args:
+            texts: List of query texts.
+            k: Number of neighbours per text.
+            min_similarity: Lowest cosine similarity a neighbour may have.
+
+        Returns:
+            list: For each text, tuples (term, similarity) sorted by similarity.
+        """
+        if not texts or not self.terms:
+            return [[] for _ in texts or []]
+
+        similarities = self.embed(texts) @ self.term_vectors.T
+        k = min(k, len(self.terms))
+        top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+
+        neighbours = []
+        for row, columns in zip(similarities, top):
+            columns = columns[np.argsort(-row[columns])]
+            neighbours.append([(self.terms[i], float(row[i])) for i in columns if row[i] >= min_similarity])
+
+        return neighbours
+
+    def get_candidate_vectors(self, candidate_key, texts):
+        """
+        Get the embedded texts of a candidate, embedding them only once per revision.
+
+        Args:
+            candidate_key: Cache key identifying the candidate revision, or None to skip caching.
+            texts: Candidate skills, roles and responsibilities.
+
+        Returns:
+            numpy.ndarray: Matrix of unit vectors, one row per text.
+        """
+        if candidate_key is None:
+            return self.embed(texts)
+
+        with self._lock:
+            vectors = self._candidate_vectors.get(candidate_key)
+            if vectors is not None:
+                self._candidate_vectors.move_to_end(candidate_key)
+                return vectors
+
+        vectors = self.embed(texts)
+
+        with self._lock:
+            self._candidate_vectors[candidate_key] = vectors
+            while len(self._candidate_vectors) > self.max_cached_candidates:
+                self._candidate_vectors.popitem(last=False)
+
+        return vectors
+
+
+class SemanticMatcher:
+    """
+    Class for semantic skill and role matching.
+    Produces the optional "semantic_match" component used by CandidateRanker.
+    """
+
+    _index = None
+    _index_lock = threading.Lock()
+
+    # Cosine similarity a vocabulary term needs to widen the candidate prefilter
+    EXPANSION_SIMILARITY = 0.9
+
+    @staticmethod
+    def is_enabled():
+        """
+        Check whether semantic matching is enabled and scikit-learn is installed.
+
+        Returns:
+            bool: True if semantic scores should be computed.
+        """
+        return bool(getattr(active_config, 'SEMANTIC_MATCHING', False)) and TfidfVectorizer is not None
+
+    @staticmethod
+    def build_seed_corpus():
+        """
+        Build the corpus the embedding model is fitted on.
+
+        Returns:
+            list: Documents, each a list of related terms.
+        """
+        corpus = [[skill_1, skill_2] for skill_1, skill_2 in SkillMatcher.get_related_skills()]
+        corpus.extend([[alias, canonical] for alias, canonical in SkillMatcher.SKILL_ALIASES.items()])
+
+        for role_name, role in RoleHierarchy.DEFAULT_HIERARCHY.items():
+            skills = role["required_skills"]["technical"] + role["required_skills"]["soft"]
+            corpus.append([role_name] + [skill["name"] for skill in skills])
+
+        return corpus
+
+    @staticmethod
+    def get_index():
+        """
+        Get the shared semantic index, building it on first use.
+
+        Returns:
+            SemanticIndex: The index, or None if scikit-learn is unavailable.
+        """
+        if TfidfVectorizer is None:
+            return None
+
+        with SemanticMatcher._index_lock:
+            if SemanticMatcher._index is None:
+                SemanticMatcher._index = SemanticIndex(SemanticMatcher.build_seed_corpus())
+
+        return SemanticMatcher._index
+
+    @staticmethod
+    def expand_skills(required_skills, k=5):
+        """
+        Find the skills semantically closest to the required skills in the index vocabulary.
+
+        Args:
+            required_skills: List of required skills.
+            k: Number of neighbours per required skill.
+
+        Returns:
+            list: Canonical skills close to any required skill, empty when semantic matching is disabled.
+        """
+        if not SemanticMatcher.is_enabled():
+            return []
+
+        required_skills = [skill.strip() for skill in required_skills if skill and skill.strip()]
+        index = SemanticMatcher.get_index()
+        if index is None or not required_skills:
+            return []
+
+        neighbours = index.nearest(required_skills, k, SemanticMatcher.EXPANSION_SIMILARITY)
+        return SkillMatcher.canonicalize_skills([term for terms in neighbours for term, _ in terms])
+
+    @staticmethod
+    def calculate_semantic_match(features, required_skills, field=None, candidate_key=None):
+        """
+        Calculate how well a candidate semantically covers the required skills and field.
+
+        Args:
+            features: Derived candidate features (canonical_skills, roles, responsibilities).
+            required_skills: List of required skills.
+            field: Target field or role (optional).
+            candidate_key: Cache key for the candidate's embedded texts (optional).
+
+        Returns:
+            float: Score between 0 and 1.
+        """
+        index = SemanticMatcher.get_index()
+        if index is None:
+            return 0.0
+
+        texts = (features.get("canonical_skills", []) + features.get("roles", []) +
+                 features.get("responsibilities", []))
+        texts = [text for text in texts if text]
+
+        # Blank tokens (e.g., from "Python,") embed as zero vectors and would drag the average down
+        required_skills = [skill.strip() for skill in required_skills or [] if skill and skill.strip()]
+
+        if not texts or (not required_skills and not field):
+            return 0.0
+
+        candidate_vectors = index.get_candidate_vectors(candidate_key, texts)
+        components = []
+
+        # Average, over required skills, of the closest candidate skill, role or responsibility
+        if required_skills:
+            similarities = index.embed(required_skills) @ candidate_vectors.T
+            components.append(float(np.clip(similarities.max(axis=1), 0, 1).mean()))
+
+        # Closest role or responsibility to the target field
+        if field:
+            similarities = candidate_vectors @ index.embed([field])[0]
+            components.append(float(np.clip(similarities.max(), 0, 1)))
+
+        return sum(components) / len(components)
@@ -1,6 +1,94 @@
+from functools import lru_cache
+
+from modules.employee_matching.fuzzy_matching import FuzzyMatcher
+
+
 class SkillMatcher:
     """Class for matching employee skills to project requirements."""
 
+    # Spelling variants that name the same skill, mapped to one canonical name
+    SKILL_ALIASES = {
+        "js": "javascript",
+        "react.js": "react",
+        "reactjs": "react",
+        "angularjs": "angular",
+        "vue.js": "vue",
+        "vuejs": "vue",
+        "node.js": "node",
+        "nodejs": "node",
+        "python 3": "python",
+        "python3": "python",
+        "c sharp": "c#",
+        "cpp": "c++",
+        "postgres": "postgresql",
+        "amazon web services": "aws",
+        "microsoft azure": "azure",
+        "google cloud": "gcp",
+        "html5": "html",
+        "css3": "css",
+        "springboot": "spring boot",
+        "k8s": "kubernetes",
+        "golang": "go",
+        "ml": "machine learning",
+        "ai": "artificial intelligence"
+    }
+
+    @staticmethod
+    def canonicalize_skill(skill):
+        """
+        Normalize a skill name to its canonical form.
+
+        Args:
+            skill: Skill name as written in a CV or project.
+
+        Returns:
+            str: Lowercased, whitespace-normalized skill name with aliases resolved.
+        """
+        skill_lower = " ".join(str(skill).lower().split())
+        return SkillMatcher.SKILL_ALIASES.get(skill_lower, skill_lower)
+
+    @staticmethod
+    def canonicalize_skills(skills):
+        """
+        Normalize a list of skills, dropping empty entries and duplicates.
+
+        Args:
+            skills: List of skill names.
+
+        Returns:
+            list: Canonical skill names in their original order.
+        """
+        canonical_skills = []
+        for skill in skills or []:
+            canonical = SkillMatcher.canonicalize_skill(skill)
+            if canonical and canonical not in canonical_skills:
+                canonical_skills.append(canonical)
+
+        return canonical_skills
+
+    @staticmethod
+    def is_partial_match(skill_1, skill_2):
+        """
+        Check whether one canonical skill contains the other as whole words, e.g. "spring"
+        and "spring boot", but not "go" and "mongodb".
+
+        Args:
+            skill_1: Canonical skill name.
+            skill_2: Canonical skill name.
+
+        Returns:
+            bool: True if the skills are equal or one is a word sequence within the other.
+        """
+        tokens_1, tokens_2 = skill_1.split(), skill_2.split()
+        if len(tokens_1) > len(tokens_2):
+            tokens_1, tokens_2 = tokens_2, tokens_1
+
+        if not tokens_1:
+            return False
+
+        length = len(tokens_1)
+        return any(tokens_2[start:start + length] == tokens_1 for start in range(len(tokens_2) - length + 1))
+
     @staticmethod
     def calculate_skill_match(employee_skills, required_skills):
         """
@@ -75,35 +163,148 @@ class SkillMatcher:
         if isinstance(required_skills, str):
             required_skills = [s.strip() for s in required_skills.split(',') if s.strip()]
 
-        # Convert all to lowercase
-        employee_skills_lower = [s.lower() for s in employee_skills]
-        required_skills_lower = [s.lower() for s in required_skills]
+        # Compare canonical names, so spelling variants count as the same skill
+        employee_skills_canonical = SkillMatcher.canonicalize_skills(employee_skills)
+        required_skills_canonical = SkillMatcher.canonicalize_skills(required_skills)
+        related_skills = SkillMatcher.get_related_canonical_skills()
 
-        # Count matches (including partial matches)
+        # Count required skills with a match (including partial and related matches)
         matches = 0
-        for req_skill in required_skills_lower:
+        for req_skill in required_skills_canonical:
             # Check for exact or partial match
-            for emp_skill in employee_skills_lower:
-                if req_skill in emp_skill or emp_skill in req_skill:
-                    matches += 1
-                    break
+            if any(SkillMatcher.is_partial_match(req_skill, emp_skill) for emp_skill in employee_skills_canonical):
+                matches += 1
+            # Check if employee has a related skill that matches the requirement
+            elif related_skills.get(req_skill, set()).intersection(employee_skills_canonical):
+                matches += 1
 
-            # Check related skills
-            for rel_pair in SkillMatcher.get_related_skills():
-                rel_skill_1_lower = rel_pair[0].lower()
-                rel_skill_2_lower = rel_pair[1].lower()
-
-                # Check if employee has a related skill that matches the requirement
-                if ((rel_skill_1_lower == req_skill and
-                     rel_skill_2_lower in employee_skills_lower) or
-                        (rel_skill_2_lower == req_skill and
-                         rel_skill_1_lower in employee_skills_lower)):
-                    matches += 1
-                    break
+        if not matches or not required_skills_canonical:
+            return 0.0
 
         # Return proportion of skills matched (not requiring all skills)
         # Using min 0.1 ensures employees with at least one match get shown
-        return max(0.1, matches / len(required_skills)) if matches > 0 else 0.0
+        return min(1.0, max(0.1, matches / len(required_skills_canonical)))
+
+    @staticmethod
+    def calculate_skill_compatibility(employee_skills, required_skills):
+        """
+        Calculate detailed compatibility between employee skills and required skills.
+        The result explains, per required skill, whether and how it matched, so callers
+        can report skill gaps without matching again.
+
+        Args:
+            employee_skills: List of employee skills.
+            required_skills: List of required skills (or comma-separated string).
+
+        Returns:
+            dict: Matched, partially matched and missing skills, an overall percentage and
+                  an explanation entry (skill, match_type, matched_skill, similarity) per
+                  required skill, where match_type is exact, synonym, partial or missing.
+        """
+        if isinstance(required_skills, str):
+            required_skills = [s.strip() for s in required_skills.split(',') if s.strip()]
+
+        required_skills = [s.strip() for s in required_skills or [] if s and s.strip()]
+
+        if not employee_skills or not required_skills:
+            return {
+                "matched_skills": [],
+                "partial_matches": {},
+                "missing_skills": required_skills,
+                "compatibility_percentage": 0,
+                "has_match": False,
+                "explanation": [SkillMatcher._explain(skill, "missing") for skill in required_skills]
+            }
+
+        employee_skills_by_canonical = {}
+        for skill in employee_skills:
+            employee_skills_by_canonical.setdefault(SkillMatcher.canonicalize_skill(skill), skill)
+        related_skills = SkillMatcher.get_related_canonical_skills()
+
+        matched_skills = []
+        partial_matches = {}
+        missing_skills = []
+        explanation = []
+
+        for req_skill in required_skills:
+            req_skill_canonical = SkillMatcher.canonicalize_skill(req_skill)
+
+            # Exact match, including spelling variants of the same skill
+            if req_skill_canonical in employee_skills_by_canonical:
+                matched_skills.append(req_skill)
+                explanation.append(SkillMatcher._explain(req_skill, "exact",
+                                                         employee_skills_by_canonical[req_skill_canonical], 1.0))
+                continue
+
+            # Synonym or related skill
+            synonym = next((employee_skills_by_canonical[related]
+                            for related in sorted(related_skills.get(req_skill_canonical, ()))
+                            if related in employee_skills_by_canonical),
+                           None)
+            if synonym:
+                matched_skills.append(req_skill)
+                explanation.append(SkillMatcher._explain(req_skill, "synonym", synonym, 1.0))
+                continue
+
+            # Partial match (e.g., "Spring" and "Spring Boot")
+            partial = next((emp_skill for canonical, emp_skill in employee_skills_by_canonical.items()
+                            if SkillMatcher.is_partial_match(req_skill_canonical, canonical)),
+                           None)
+            if partial:
+                similarity = FuzzyMatcher.get_similarity(req_skill, partial, method='ratio') / 100.0
+                partial_matches[req_skill] = {
+                    "matched_skill": partial,
+                    "similarity": similarity
+                }
+                explanation.append(SkillMatcher._explain(req_skill, "partial", partial, similarity))
+                continue
+
+            missing_skills.append(req_skill)
+            explanation.append(SkillMatcher._explain(req_skill, "missing"))
+
+        # Partial matches count in proportion to their similarity
+        matched_weight = len(matched_skills) + sum(match["similarity"] for match in partial_matches.values())
+        compatibility_percentage = round(matched_weight / len(required_skills) * 100)
+
+        return {
+            "matched_skills": matched_skills,
+            "partial_matches": partial_matches,
+            "missing_skills": missing_skills,
+            "compatibility_percentage": compatibility_percentage,
+            "has_match": bool(matched_skills or partial_matches),
+            "explanation": explanation
+        }
+
+    @staticmethod
+    def _explain(skill, match_type, matched_skill=None, similarity=0.0):
+        """Build the explanation entry for one required skill."""
+        return {
+            "skill": skill,
+            "match_type": match_type,
+            "matched_skill": matched_skill,
+            "similarity": round(similarity, 4)
+        }
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_related_canonical_skills():
+        """
+        Get the related skills of each skill, in canonical form.
+        Pairs that are spelling variants of the same skill are left out, since they
+        already match exactly once canonicalized.
+
+        Returns:
+            dict: Set of related canonical skills by canonical skill.
+        """
+        related_skills = {}
+        for rel_1, rel_2 in SkillMatcher.get_related_skills():
+            canonical_1 = SkillMatcher.canonicalize_skill(rel_1)
+            canonical_2 = SkillMatcher.canonicalize_skill(rel_2)
+            if canonical_1 != canonical_2:
+                related_skills.setdefault(canonical_1, set()).add(canonical_2)
+                related_skills.setdefault(canonical_2, set()).add(canonical_1)
+
+        return related_skills
 
     @staticmethod
     def get_related_skills():
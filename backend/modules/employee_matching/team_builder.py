@@ -0,0 +1,195 @@
+import heapq
+
+import numpy as np
+
+from modules.employee_matching.fuzzy_matching import FuzzyMatcher
+from modules.employee_matching.feature_materializer import FeatureMaterializer
+
+
+class TeamBuilder:
+    """
+    Class for assembling a team that covers the project's skills and roles together.
+    Maximizes a coverage objective with lazy greedy selection instead of taking the
+    individually best candidates, which can all share the same skills.
+    """
+
+    # Minimum role similarity (0-1) for a candidate to fill a role
+    ROLE_THRESHOLD = 0.7
+
+    @staticmethod
+    def get_skill_coverage(ranked_candidates, required_skills):
+        """
+        Build the candidate-by-skill coverage matrix from the scores computed during ranking.
+
+        Args:
+            ranked_candidates: List of ranked candidates with scores.
+            required_skills: List of required skills.
+
+        Returns:
+            numpy.ndarray: Matrix of shape (len(ranked_candidates), len(required_skills)) in 0-1.
+        """
+        coverage = np.zeros((len(ranked_candidates), len(required_skills)))
+        skill_index = {skill.lower(): j for j, skill in enumerate(required_skills)}
+
+        for i, candidate_data in enumerate(ranked_candidates):
+            compatibility = candidate_data["scores"].get("skill_compatibility", {})
+
+            # Exact and related matches cover a skill fully, partial matches by their similarity
+            for skill in compatibility.get("matched_skills", []):
+                if skill.lower() in skill_index:
+                    coverage[i, skill_index[skill.lower()]] = 1.0
+
+            for skill, match in compatibility.get("partial_matches", {}).items():
+                if skill.lower() in skill_index:
+                    coverage[i, skill_index[skill.lower()]] = match.get("similarity", 0.0)
+
+        return coverage
+
+    @staticmethod
+    def get_role_fit(ranked_candidates, roles):
+        """
+        Build the candidate-by-role fit matrix from the candidates' past roles.
+
+        Args:
+            ranked_candidates: List of ranked candidates.
+            roles: List of role names to staff.
+
+        Returns:
+            numpy.ndarray: Matrix of shape (len(ranked_candidates), len(roles)) in 0-1.
+        """
+        fit = np.zeros((len(ranked_candidates), len(roles)))
+        if not roles or not ranked_candidates:
+            return fit
+
+        candidate_roles = [FeatureMaterializer.get_features(candidate_data["candidate"])["roles"]
+                           for candidate_data in ranked_candidates]
+
+        # Score each distinct past role against the requested roles once
+        vocabulary = sorted({role for past_roles in candidate_roles for role in past_roles if role})
+        if not vocabulary:
+            return fit
+
+        similarities = FuzzyMatcher.cdist(roles, vocabulary, method='token_set_ratio') / 100.0
+        vocabulary_index = {role: j for j, role in enumerate(vocabulary)}
+
+        for i, past_roles in enumerate(candidate_roles):
+            columns = [vocabulary_index[role] for role in past_roles if role in vocabulary_index]
+            if columns:
+                fit[i] = similarities[:, columns].max(axis=1)
+
+        # Weak fits don't qualify a candidate for a role
+        fit[fit < TeamBuilder.ROLE_THRESHOLD] = 0.0
+
+        return fit
+
+    @staticmethod
+    def build_team(ranked_candidates, required_skills, team_size, roles=None, existing_members=None,
+                   one_per_role=True, quality_weight=0.5):
+        """
+        Select a team maximizing combined coverage of required skills and roles.
+
+        The objective is the sum over skills and roles of the best coverage any member
+        provides, plus quality_weight times each member's total score. It is monotone
+        submodular, so marginal gains only shrink as the team grows and lazy greedy
+        selection only re-evaluates candidates whose stale gain could still win.
+
+        Args:
+            ranked_candidates: List of ranked candidates with scores.
+            required_skills: List of required skills.
+            team_size: Number of people on the team, including existing members.
+            roles: List of role names to staff (optional).
+            existing_members: Ranked entries of people already on the project (optional).
+                              They are kept on the team and fill their roles first; an
+                              'assigned_role' key pins the role they fill.
+            one_per_role: Whether each role is filled by at most one person.
+            quality_weight: Weight of individual total scores relative to coverage.
+
+        Returns:
+            dict: Selected members with assigned roles and gains, skill coverage and objective.
+        """
+        roles = roles or []
+        existing_members = existing_members or []
+
+        existing_ids = {str(member["candidate"]["_id"]) for member in existing_members}
+        pool = existing_members + [candidate_data for candidate_data in ranked_candidates
+                                   if str(candidate_data["candidate"]["_id"]) not in existing_ids]
+
+        skill_coverage = TeamBuilder.get_skill_coverage(pool, required_skills)
+        role_fit = TeamBuilder.get_role_fit(pool, roles)
+        quality = quality_weight * np.array([candidate_data["total_score"] for candidate_data in pool])
+
+        covered_skills = np.zeros(len(required_skills))
+        covered_roles = np.zeros(len(roles))
+        filled_roles = np.zeros(len(roles), dtype=bool)
+
+        def marginal_gain(i):
+            """Gain of adding candidate i to the team, and the role the candidate would fill."""
+            gain = np.maximum(skill_coverage[i] - covered_skills, 0).sum() + quality[i]
+            assigned_role = None
+
+            if roles:
+                role_gains = np.maximum(role_fit[i] - covered_roles, 0)
+                if one_per_role:
+                    # Candidates only count towards one open role
+                    role_gains[filled_roles] = 0.0
+                    best_role = int(np.argmax(role_gains))
+                    if role_gains[best_role] > 0:
+                        gain += role_gains[best_role]
+                        assigned_role = best_role
+                else:
+                    gain += role_gains.sum()
+                    if role_fit[i].any():
+                        assigned_role = int(np.argmax(role_fit[i]))
+
+            return float(gain), assigned_role
+
+        def add_member(i, gain, assigned_role):
+            """Add candidate i to the team and update what it covers."""
+            covered_skills[:] = np.maximum(covered_skills, skill_coverage[i])
+            if assigned_role is not None:
+                filled_roles[assigned_role] = True
+            if roles and not one_per_role:
+                covered_roles[:] = np.maximum(covered_roles, role_fit[i])
+            elif assigned_role is not None:
+                covered_roles[assigned_role] = max(covered_roles[assigned_role], role_fit[i, assigned_role])
+
+            members.append(dict(pool[i], assigned_role=roles[assigned_role] if assigned_role is not None else None,
+                                marginal_gain=round(gain, 4), existing_member=i < len(existing_members)))
+
+        members = []
+
+        # Existing members stay on the team, in the role they were assigned if it is being staffed
+        for i, member in enumerate(existing_members):
+            gain, assigned_role = marginal_gain(i)
+            if member.get("assigned_role") in roles:
+                assigned_role = roles.index(member["assigned_role"])
+            add_member(i, gain, assigned_role)
+
+        # Upper bounds on every candidate's gain, all valid before the first selection
+        initial_gains = skill_coverage.sum(axis=1) + quality
+        if roles:
+            initial_gains += role_fit.max(axis=1) if one_per_role else role_fit.sum(axis=1)
+        heap = [(-initial_gains[i], i) for i in range(len(existing_members), len(pool))]
+        heapq.heapify(heap)
+
+        while heap and len(members) < team_size:
+            _, i = heapq.heappop(heap)
+            gain, assigned_role = marginal_gain(i)
+
+            # The refreshed gain still beats every other (stale) bound, so it is the best choice
+            if not heap or gain >= -heap[0][0]:
+                add_member(i, gain, assigned_role)
+            else:
+                heapq.heappush(heap, (-gain, i))
+
+        skill_coverage_summary = {skill: round(float(value), 4)
+                                  for skill, value in zip(required_skills, covered_skills)}
+
+        return {
+            "members": members,
+            "skill_coverage": skill_coverage_summary,
+            "uncovered_skills": [skill for skill, value in skill_coverage_summary.items() if value == 0],
+            "unfilled_roles": [role for role, filled in zip(roles, filled_roles) if not filled],
+            "objective": round(float(covered_skills.sum() + covered_roles.sum() +
+                                     sum(quality_weight * member["total_score"] for member in members)), 4)
+        }
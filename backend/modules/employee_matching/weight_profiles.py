@@ -0,0 +1,188 @@
+import json
+
+from modules.employee_matching.semantic_matcher import SemanticMatcher
+
+
+class WeightProfiles:
+    """
+    Class for managing scoring-weight profiles used when ranking candidates.
+    Profiles are either built in or stored per project type in the WeightProfiles collection.
+    """
+
+    # Score components combined into a candidate's total score
+    # "semantic_match" is only computed when semantic matching is enabled
+    COMPONENTS = ["skill_match", "experience_relevance", "years_experience", "project_type_match",
+                  "semantic_match"]
+
+    DEFAULT_PROFILE = "balanced"
+
+    BUILTIN_PROFILES = {
+        "balanced": {
+            "skill_match": 0.4,
+            "experience_relevance": 0.3,
+            "years_experience": 0.2,
+            "project_type_match": 0.1,
+            "semantic_match": 0.0
+        },
+        "skills_first": {
+            "skill_match": 0.6,
+            "experience_relevance": 0.2,
+            "years_experience": 0.1,
+            "project_type_match": 0.1,
+            "semantic_match": 0.0
+        },
+        "experience_first": {
+            "skill_match": 0.25,
+            "experience_relevance": 0.35,
+            "years_experience": 0.3,
+            "project_type_match": 0.1,
+            "semantic_match": 0.0
+        },
+        "domain_first": {
+            "skill_match": 0.3,
+            "experience_relevance": 0.2,
+            "years_experience": 0.1,
+            "project_type_match": 0.4,
+            "semantic_match": 0.0
+        },
+        "semantic": {
+            "skill_match": 0.25,
+            "experience_relevance": 0.15,
+            "years_experience": 0.15,
+            "project_type_match": 0.1,
+            "semantic_match": 0.35
+        }
+    }
+
+    @staticmethod
+    def get_active_components():
+        """
+        Get the score components that are computed in this deployment.
+
+        Returns:
+            list: Score components, without "semantic_match" when semantic matching is disabled.
+        """
+        if SemanticMatcher.is_enabled():
+            return list(WeightProfiles.COMPONENTS)
+
+        return [component for component in WeightProfiles.COMPONENTS if component != "semantic_match"]
+
+    @staticmethod
+    def normalize_weights(weights, components=None):
+        """
+        Normalize weights over the score components so they sum to 1.
+
+        Args:
+            weights: Dictionary of component weights. Unknown keys are ignored.
+            components: Components to spread the weight over (optional). Other components
+                        get a weight of 0. Defaults to every component.
+
+        Returns:
+            dict: Normalized weights for every component.
+
+        Raises:
+            ValueError: If a weight is negative or not a number, or all weights are zero.
+        """
+        normalized = {}
+        for component in WeightProfiles.COMPONENTS:
+            try:
+                value = float(weights.get(component, 0) or 0)
+            except (TypeError, ValueError):
+                raise ValueError(f"Weight for {component} must be a number")
+
+            if value < 0:
+                raise ValueError(f"Weight for {component} must not be negative")
+            normalized[component] = value if components is None or component in components else 0.0
+
+        total = sum(normalized.values())
+        if total <= 0:
+            if components is not None and any(weights.get(component) for component in WeightProfiles.COMPONENTS):
+                raise ValueError(f"At least one of {', '.join(components)} must have a weight greater than zero")
+            raise ValueError("At least one weight must be greater than zero")
+
+        return {component: round(value / total, 6) for component, value in normalized.items()}
+
+    @staticmethod
+    def build_profile_query(profile_name=None, project_type=None):
+        """
+        Build the query for the stored profile that applies to a match request.
+
+        Args:
+            profile_name: Explicitly requested profile name (optional).
+            project_type: Project type whose stored profile applies by default (optional).
+
+        Returns:
+            dict: MongoDB query for WeightProfiles, or None if there is nothing to look up.
+        """
+        if profile_name:
+            return {"name": profile_name}
+
+        if project_type:
+            return {"project_type": project_type}
+
+        return None
+
+    @staticmethod
+    def resolve_weights(weights=None, profile_name=None, stored_profile=None):
+        """
+        Resolve the weights to rank with.
+
+        Precedence: explicit weights, then the stored profile, then the built-in
+        profile with the requested name, then the default profile. The weight of
+        components that are not computed (semantic_match when semantic matching is
+        disabled) is spread over the others, so it does not dilute every total score.
+
+        Args:
+            weights: Explicit weights from the request (optional).
+            profile_name: Requested profile name (optional).
+            stored_profile: Stored WeightProfiles document that applies (optional).
+
+        Returns:
+            dict: Normalized weights.
+
+        Raises:
+            ValueError: If the weights are invalid, or only weight components that are not computed.
+        """
+        if not weights:
+            if stored_profile and stored_profile.get("weights"):
+                weights = stored_profile["weights"]
+            else:
+                weights = WeightProfiles.BUILTIN_PROFILES.get(
+                    profile_name or WeightProfiles.DEFAULT_PROFILE,
+                    WeightProfiles.BUILTIN_PROFILES[WeightProfiles.DEFAULT_PROFILE]
+                )
+
+        return WeightProfiles.normalize_weights(weights, WeightProfiles.get_active_components())
+
+    @staticmethod
+    def resolve_request_weights(request_data, project_type=None, stored_profiles=None):
+        """
+        Resolve the weights for a match request: explicit weights, a named profile,
+        or the stored profile of the project type.
+
+        Args:
+            request_data: Request body with the optional 'weights' and 'weight_profile'.
+            project_type: Type of the project being matched (optional).
+            stored_profiles: Stored profiles already looked up, by query (optional).
+                             Lookups are added to it, so several projects share them.
+
+        Returns:
+            dict: Normalized weights.
+
+        Raises:
+            ValueError: If the weights are invalid.
+        """
+        from services.mongodb_service import mongodb_service
+
+        weight_profile = request_data.get('weight_profile')
+        profile_query = WeightProfiles.build_profile_query(weight_profile, project_type)
+
+        stored_profile = None
+        if profile_query and not request_data.get('weights'):
+            stored_profiles = {} if stored_profiles is None else stored_profiles
+            profile_key = json.dumps(profile_query, sort_keys=True, default=str)
+            if profile_key not in stored_profiles:
+                stored_profiles[profile_key] = mongodb_service.find_one('WeightProfiles', profile_query)
+            stored_profile = stored_profiles[profile_key]
+
+        return WeightProfiles.resolve_weights(request_data.get('weights'), weight_profile, stored_profile)
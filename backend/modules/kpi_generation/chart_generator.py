@@ -2,11 +2,13 @@ import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
 import os
-import random
 import numpy as np
 from datetime import datetime, timedelta
 from services.chart_service import chart_service
+from modules.kpi_generation.kpi_model import KPI
 from modules.kpi_generation.project_analyzer import ProjectAnalyzer
+from modules.kpi_generation.project_scheduler import ScheduledTask
+from utils.seeding import get_rng
 
 
 class ChartGenerator:
@@ -30,10 +32,8 @@ class ChartGenerator:
         fig, ax = plt.subplots(figsize=(14, 10))
 
         # Extract tasks and sort by start day
-        tasks = [(task["Task"],
-                  int(task["Start"].split(" ")[1]),
-                  int(task["End"].split(" ")[1]))
-                 for task in gantt_data]
+        tasks = [(task.name, task.start_day, task.end_day)
+                 for task in map(ScheduledTask.from_dict, gantt_data)]
 
         # Sort tasks by start date and then by task name
         tasks.sort(key=lambda x: (x[1], x[0]))
@@ -140,6 +140,9 @@ class ChartGenerator:
         Returns:
             str: Path to the generated chart.
         """
+        # Seed the simulated progress from the project and chart parameters
+        rng = get_rng(project_id, 'burndown', timeline, sprints)
+
         # Calculate key parameters
         sprint_days = timeline // sprints
         x = [i * sprint_days for i in range(sprints + 1)]
@@ -160,11 +163,11 @@ class ChartGenerator:
                                                                                                              sprints // 2) * sprint_days * 1.3,
             # Fast start, slow finish
             "consistent_delay": lambda i, sprint_days: i * sprint_days * 0.85,  # Consistently behind
-            "intermittent": lambda i, sprint_days: i * sprint_days + random.randint(-10, 5)  # Variable progress
+            "intermittent": lambda i, sprint_days: i * sprint_days + rng.randint(-10, 5)  # Variable progress
         }
 
         # Select a random pattern
-        selected_pattern = random.choice(list(patterns.keys()))
+        selected_pattern = rng.choice(list(patterns.keys()))
         pattern_func = patterns[selected_pattern]
 
         # Generate actual burndown based on selected pattern
@@ -241,6 +244,9 @@ class ChartGenerator:
         Returns:
             str: Path to the generated chart.
         """
+        # Seed the simulated velocities from the project and chart parameters
+        rng = get_rng(project_id, 'velocity', sprints, team_size)
+
         # Calculate expected velocity based on team size and typical per-developer velocity
         expected_velocity = team_size * 10
 
@@ -250,15 +256,15 @@ class ChartGenerator:
         # Generate velocity patterns
         velocity_patterns = {
             "improving": [expected_velocity * (0.7 + 0.1 * i) for i in range(sprints)],  # Team improves over time
-            "consistent": [expected_velocity + random.randint(-5, 5) for _ in range(sprints)],
+            "consistent": [expected_velocity + rng.randint(-5, 5) for _ in range(sprints)],
             # Consistent with minor variations
-            "variable": [expected_velocity * random.uniform(0.7, 1.3) for _ in range(sprints)],  # More variable
+            "variable": [expected_velocity * rng.uniform(0.7, 1.3) for _ in range(sprints)],  # More variable
             "declining": [expected_velocity * (1.1 - 0.05 * i) for i in range(sprints)]
             # Declining (e.g., increasing complexity)
         }
 
         # Choose a pattern
-        selected_pattern = random.choice(list(velocity_patterns.keys()))
+        selected_pattern = rng.choice(list(velocity_patterns.keys()))
         velocities = velocity_patterns[selected_pattern]
 
         # Round velocities to integers
@@ -336,40 +342,17 @@ class ChartGenerator:
         Returns:
             str: Path to the generated chart.
         """
-        # Calculate average scores for each KPI category
-        categories = list(kpis.keys())
+        # Calculate average scores for each KPI category, scoring each KPI by its status
+        kpi_list = KPI.parse_all(kpis)
+        categories = [category for category, category_kpis in kpis.items()
+                      if isinstance(category_kpis, dict) and not category.startswith('_')]
         scores = []
 
         for category in categories:
-            category_kpis = kpis[category]
-            category_score = 0
-            kpi_count = 0
-
-            # Track individual KPI scores for detailed display
-            kpi_scores = {}
-
-            for kpi_name, kpi_data in category_kpis.items():
-                status = kpi_data.get('status', '')
-
-                # Convert status to score
-                if status == 'On Track':
-                    kpi_score = 1.0
-                elif status == 'At Risk':
-                    kpi_score = 0.6
-                elif status == 'Below Target':
-                    kpi_score = 0.3
-                else:
-                    kpi_score = 0.5  # Default for unknown status
-
-                # Store individual KPI score
-                kpi_scores[kpi_name] = kpi_score
-
-                # Add to category total
-                category_score += kpi_score
-                kpi_count += 1
+            kpi_scores = [kpi.status_score for kpi in kpi_list if kpi.category == category]
 
             # Calculate average score for the category
-            avg_score = category_score / kpi_count if kpi_count > 0 else 0
+            avg_score = sum(kpi_scores) / len(kpi_scores) if kpi_scores else 0
             scores.append(avg_score)
 
         # Number of variables/categories
@@ -1,10 +1,24 @@
-import copy
-import datetime
 import json
+from datetime import datetime
+
+from modules.kpi_generation.kpi_engine import KPIEngine
 from modules.kpi_generation.kpi_generator import KPIGenerator
+from modules.kpi_generation.kpi_model import KPI
 from modules.kpi_generation.project_analyzer import ProjectAnalyzer
 from services.openai_service import openai_service
 
+# KPIs whose targets depend on each project parameter, as (category, name) pairs.
+# The project type informs every AI-generated target, so all KPIs depend on it.
+PARAMETER_DEPENDENCIES = {
+    'project_type': None,
+    'project_team_size': (("productivity", "velocity"), ("productivity", "sprint_burndown_rate"),
+                          ("productivity", "cycle_time"), ("collaboration", "code_review_turnaround_time")),
+    'project_timeline': (("productivity", "velocity"), ("productivity", "sprint_burndown_rate"),
+                         ("productivity", "cycle_time"), ("code_quality", "test_coverage")),
+    'project_languages': (("code_quality", "defect_density"), ("code_quality", "average_cyclomatic_complexity"),
+                          ("code_quality", "test_coverage")),
+    'project_sprints': (("productivity", "story_completion_ratio"),)
+}
 
 class KPIAdjuster:
     """
@@ -94,288 +108,50 @@ class KPIAdjuster:
         Returns:
             dict: Adjusted KPIs.
         """
-        # Create a deep copy of original KPIs to modify
-        adjusted_kpis = copy.deepcopy(original_kpis)
-
-        # Extract progress metrics
-        actual_velocity = project_progress.get('actual_velocity')
-        actual_cycle_time = project_progress.get('actual_cycle_time')
-        defect_rate = project_progress.get('defect_rate')
-        test_coverage = project_progress.get('test_coverage')
-
-        # Extract team metrics if available
-        team_velocity_trend = None
-        team_quality_trend = None
-        team_collaboration_trend = None
-
-        if team_performance:
-            team_velocity_trend = team_performance.get('velocity_trend')
-            team_quality_trend = team_performance.get('quality_trend')
-            team_collaboration_trend = team_performance.get('collaboration_trend')
-
-        # Adjustment weights (how much to blend original target with actual performance)
-        # Higher weight = more adjustment toward actual performance
-        early_project_weight = 0.3  # Early in project, slight adjustments
-        mid_project_weight = 0.5  # Mid-project, moderate adjustments
-        late_project_weight = 0.7  # Late in project, heavier adjustments
-
-        # Determine project phase
-        project_completion = project_progress.get('completion_percentage', 50)
-
-        if project_completion < 30:
-            adjustment_weight = early_project_weight
-        elif project_completion < 70:
-            adjustment_weight = mid_project_weight
-        else:
-            adjustment_weight = late_project_weight
-
-        # Apply trend factors if available
-        trend_factor = 1.0
-        if team_performance:
-            # Positive trend = higher targets, negative trend = lower targets
-            trend_mapping = {
-                "improving": 1.1,  # 10% higher targets
-                "stable": 1.0,  # No change
-                "declining": 0.9  # 10% lower targets
-            }
-
-            velocity_factor = trend_mapping.get(team_velocity_trend, 1.0)
-            quality_factor = trend_mapping.get(team_quality_trend, 1.0)
-            collaboration_factor = trend_mapping.get(team_collaboration_trend, 1.0)
-
-        # Adjust Productivity KPIs
-        if 'productivity' in adjusted_kpis:
-            productivity = adjusted_kpis['productivity']
-
-            # Adjust velocity
-            if actual_velocity and 'velocity' in productivity:
-                original_target = productivity['velocity']['target']
-                original_value = productivity['velocity']['value']
-
-                # Extract the numeric value from the target and value strings
-                try:
-                    target_value = float(original_target.split()[0])
-                    current_value = float(original_value.split()[0])
-
-                    # Calculate new target based on actual performance
-                    if team_velocity_trend:
-                        velocity_adjustment = velocity_factor
-                    else:
-                        velocity_adjustment = 1.0
+        return KPIEngine.adjust_many([original_kpis], [project_progress], [team_performance])[0]
 
-                    new_target = (target_value * (1 - adjustment_weight) +
-                                  current_value * adjustment_weight) * velocity_adjustment
-
-                    # Format the new target string
-                    units = original_target.split(" ", 1)[1] if " " in original_target else ""
-                    new_target_str = f"{new_target:.1f} {units}"
-
-                    # Update the KPI
-                    productivity['velocity']['target'] = new_target_str
+    @staticmethod
+    def adjust_kpis_for_projects(kpi_sets, progress_list, team_performance_list=None):
+        """
+        Rule-based adjustment of the KPIs of many projects at once, e.g. for a nightly recalibration.
 
-                    # Update status
-                    if current_value >= new_target * 0.9:
-                        productivity['velocity']['status'] = "On Track"
-                    elif current_value >= new_target * 0.7:
-                        productivity['velocity']['status'] = "At Risk"
-                    else:
-                        productivity['velocity']['status'] = "Below Target"
-                except (ValueError, IndexError):
-                    # If parsing fails, leave original target
-                    pass
-
-            # Adjust cycle time
-            if actual_cycle_time and 'cycle_time' in productivity:
-                try:
-                    original_target = productivity['cycle_time']['target']
-                    original_value = productivity['cycle_time']['value']
-
-                    # Extract numeric values
-                    target_value = float(original_target.split()[0])
-                    current_value = float(original_value.split()[0])
-
-                    # For cycle time, lower is better, so adjust target differently
-                    new_target = (target_value * (1 - adjustment_weight) +
-                                  current_value * adjustment_weight)
-
-                    # Format the new target string
-                    units = original_target.split(" ", 1)[1] if " " in original_target else ""
-                    new_target_str = f"{new_target:.1f} {units}"
-
-                    # Update the KPI
-                    productivity['cycle_time']['target'] = new_target_str
-
-                    # Update status - for cycle time, lower is better
-                    if current_value <= new_target * 1.1:
-                        productivity['cycle_time']['status'] = "On Track"
-                    elif current_value <= new_target * 1.3:
-                        productivity['cycle_time']['status'] = "At Risk"
-                    else:
-                        productivity['cycle_time']['status'] = "Below Target"
-                except (ValueError, IndexError):
-                    # If parsing fails, leave original target
-                    pass
-
-        # Adjust Code Quality KPIs
-        if 'code_quality' in adjusted_kpis and team_quality_trend:
-            code_quality = adjusted_kpis['code_quality']
-
-            # Apply quality trend factor to all code quality KPIs
-            quality_adjustment = quality_factor
-
-            # Adjust defect density
-            if defect_rate and 'defect_density' in code_quality:
-                try:
-                    original_target = code_quality['defect_density']['target']
-                    original_value = code_quality['defect_density']['value']
-
-                    # Extract numeric values
-                    target_value = float(original_target.split()[0])
-                    current_value = float(original_value.split()[0])
-
-                    # For defect density, lower is better
-                    new_target = (target_value * (1 - adjustment_weight) +
-                                  current_value * adjustment_weight) * quality_adjustment
-
-                    # Format the new target string
-                    units = original_target.split(" ", 1)[1] if " " in original_target else ""
-                    new_target_str = f"{new_target:.1f} {units}"
-
-                    # Update the KPI
-                    code_quality['defect_density']['target'] = new_target_str
-
-                    # Update status - for defect density, lower is better
-                    if current_value <= new_target * 1.1:
-                        code_quality['defect_density']['status'] = "On Track"
-                    elif current_value <= new_target * 1.3:
-                        code_quality['defect_density']['status'] = "At Risk"
-                    else:
-                        code_quality['defect_density']['status'] = "Below Target"
-                except (ValueError, IndexError):
-                    # If parsing fails, leave original target
-                    pass
-
-            # Adjust test coverage
-            if test_coverage and 'test_coverage' in code_quality:
-                try:
-                    original_target = code_quality['test_coverage']['target']
-                    original_value = code_quality['test_coverage']['value']
-
-                    # Extract numeric values
-                    target_value = float(original_target.split('%')[0])
-                    current_value = float(original_value.split('%')[0])
-
-                    # For test coverage, higher is better
-                    new_target = (target_value * (1 - adjustment_weight) +
-                                  current_value * adjustment_weight) * quality_adjustment
-                    new_target = min(new_target, 100)  # Cap at 100%
-
-                    # Format the new target string
-                    new_target_str = f"{new_target:.1f}%"
-
-                    # Update the KPI
-                    code_quality['test_coverage']['target'] = new_target_str
-
-                    # Update status
-                    if current_value >= new_target * 0.9:
-                        code_quality['test_coverage']['status'] = "On Track"
-                    elif current_value >= new_target * 0.8:
-                        code_quality['test_coverage']['status'] = "At Risk"
-                    else:
-                        code_quality['test_coverage']['status'] = "Below Target"
-                except (ValueError, IndexError):
-                    # If parsing fails, leave original target
-                    pass
-
-        # Adjust Collaboration KPIs
-        if 'collaboration' in adjusted_kpis and team_collaboration_trend:
-            collaboration = adjusted_kpis['collaboration']
-
-            # Apply collaboration trend factor
-            collaboration_adjustment = collaboration_factor
-
-            # Adjust all collaboration KPIs by the same trend factor
-            for kpi_name, kpi_data in collaboration.items():
-                try:
-                    original_target = kpi_data['target']
-                    original_value = kpi_data['value']
-
-                    # Different KPIs have different units and better/worse directions
-                    if kpi_name == 'code_review_turnaround_time':
-                        # Extract numeric values - lower is better
-                        target_value = float(original_target.split()[0])
-                        current_value = float(original_value.split()[0])
-
-                        # For turnaround time, lower is better
-                        new_target = (target_value * (1 - adjustment_weight) +
-                                      current_value * adjustment_weight) / collaboration_adjustment
-
-                        # Format the new target string
-                        units = original_target.split(" ", 1)[1] if " " in original_target else ""
-                        new_target_str = f"{new_target:.1f} {units}"
-
-                        # Update the KPI
-                        collaboration[kpi_name]['target'] = new_target_str
-
-                        # Update status - for time, lower is better
-                        if current_value <= new_target * 1.1:
-                            collaboration[kpi_name]['status'] = "On Track"
-                        elif current_value <= new_target * 1.3:
-                            collaboration[kpi_name]['status'] = "At Risk"
-                        else:
-                            collaboration[kpi_name]['status'] = "Below Target"
-                    else:
-                        # For percentage KPIs like merge conflict resolution, higher is better
-                        # Extract numeric values
-                        target_value = float(original_target.split('%')[0])
-                        current_value = float(original_value.split('%')[0])
-
-                        # Calculate new target
-                        new_target = (target_value * (1 - adjustment_weight) +
-                                      current_value * adjustment_weight) * collaboration_adjustment
-                        new_target = min(new_target, 100)  # Cap at 100%
+        Args:
+            kpi_sets: List of original KPI dictionaries, one per project.
+            progress_list: List of project progress metrics, one per project.
+            team_performance_list: List of team performance data (or None), one per project (optional).
 
-                        # Format the new target string
-                        new_target_str = f"{new_target:.1f}%"
+        Returns:
+            list: Adjusted KPI dictionaries, one per project. KPIs of projects without
+                  progress metrics are returned unchanged.
+        """
+        adjustable = [index for index, (kpis, progress) in enumerate(zip(kpi_sets, progress_list))
+                      if kpis and progress]
+        team_performance_list = team_performance_list or [None] * len(kpi_sets)
 
-                        # Update the KPI
-                        collaboration[kpi_name]['target'] = new_target_str
+        adjusted = KPIEngine.adjust_many([kpi_sets[index] for index in adjustable],
+                                         [progress_list[index] for index in adjustable],
+                                         [team_performance_list[index] for index in adjustable])
 
-                        # Update status
-                        if current_value >= new_target * 0.9:
-                            collaboration[kpi_name]['status'] = "On Track"
-                        elif current_value >= new_target * 0.8:
-                            collaboration[kpi_name]['status'] = "At Risk"
-                        else:
-                            collaboration[kpi_name]['status'] = "Below Target"
-                except (ValueError, IndexError):
-                    # If parsing fails, leave original target
-                    pass
+        results = list(kpi_sets)
+        for index, kpis in zip(adjustable, adjusted):
+            results[index] = kpis
 
-        return adjusted_kpis
+        return results
 
     @staticmethod
-    def adjust_kpis_for_project_changes(original_kpis, original_project, updated_project):
+    def _project_change_impact(original_project, updated_project):
         """
-        Adjust KPIs based on changes to project parameters, with intelligent
-        preservation of progress on unchanged KPIs.
-
-        Args:
-            original_kpis: Original KPI dictionary.
-            original_project: Dictionary with original project details.
-            updated_project: Dictionary with updated project details.
+        Find the significant changes between project details and the KPIs they affect.
 
         Returns:
-            dict: Adjusted KPIs.
+            tuple: (significant changes by parameter, set of dependent (category, name) KPI
+                    keys or None if every KPI depends on them, target factors by KPI key)
         """
-        if not original_kpis or not original_project or not updated_project:
-            return original_kpis
-
-        # Identify significant changes in key project parameters
         significant_changes = {}
+        dependent = set()
         change_impact = {}
 
-        for key in ['project_type', 'project_team_size', 'project_timeline', 'project_languages', 'project_sprints']:
+        for key, dependencies in PARAMETER_DEPENDENCIES.items():
             if key in original_project and key in updated_project:
                 original_value = original_project[key]
                 updated_value = updated_project[key]
@@ -386,15 +162,22 @@ class KPIAdjuster:
                         'new': updated_value
                     }
 
+                    if dependencies is None or dependent is None:
+                        dependent = None
+                    else:
+                        dependent.update(dependencies)
+
                     # Calculate impact of each change
+                    impact = {}
                     if key == 'project_team_size':
                         # Team size changes have direct impact on velocity expectations
                         old_size = int(original_value) if original_value else 1
                         new_size = int(updated_value) if updated_value else 1
                         size_ratio = new_size / old_size if old_size > 0 else 1
 
-                        change_impact['velocity'] = size_ratio
-                        change_impact['code_review_time'] = 1.0 + (size_ratio - 1.0) * 0.5  # Less than linear scaling
+                        impact[("productivity", "velocity")] = size_ratio
+                        impact[("collaboration", "code_review_turnaround_time")] = (
+                                1.0 + (size_ratio - 1.0) * 0.5)  # Less than linear scaling
 
                     elif key == 'project_timeline':
                         # Timeline changes affect cycle times
@@ -402,31 +185,69 @@ class KPIAdjuster:
                         new_time = int(updated_value) if updated_value else 30
                         time_ratio = new_time / old_time if old_time > 0 else 1
 
-                        change_impact['cycle_time'] = 1.0 / time_ratio  # Inverse relationship
-                        change_impact['test_coverage'] = 1.0 + (
-                                    time_ratio - 1.0) * 0.2  # More time = higher coverage expectations
+                        impact[("productivity", "cycle_time")] = 1.0 / time_ratio  # Inverse relationship
+                        impact[("code_quality", "test_coverage")] = (
+                                1.0 + (time_ratio - 1.0) * 0.2)  # More time = higher coverage expectations
 
                     elif key == 'project_sprints':
                         # Sprint count changes affect planning granularity
-                        change_impact['story_completion'] = 1.05  # Slight upward adjustment
+                        impact[("productivity", "story_completion_ratio")] = 1.05  # Slight upward adjustment
 
                     elif key == 'project_languages':
                         # Language changes can affect quality metrics
-                        change_impact['test_coverage'] = 0.95  # Slightly lower expectations initially
-                        change_impact['defect_density'] = 1.1  # Higher tolerance temporarily
+                        impact[("code_quality", "test_coverage")] = 0.95  # Slightly lower expectations initially
+                        impact[("code_quality", "defect_density")] = 1.1  # Higher tolerance temporarily
+
+                    for kpi_key, factor in impact.items():
+                        change_impact[kpi_key] = change_impact.get(kpi_key, 1.0) * factor
+
+        return significant_changes, dependent, change_impact
+
+    @staticmethod
+    def diff_kpis_for_project_changes(original_kpis, original_project, updated_project):
+        """
+        Recompute only the KPIs that depend on the changed project parameters, with
+        intelligent preservation of progress.
+
+        Args:
+            original_kpis: Original KPI dictionary.
+            original_project: Dictionary with original project details.
+            updated_project: Dictionary with updated project details.
+
+        Returns:
+            dict: Changed KPIs as {(category, name): KPI dictionary}; empty if nothing changed.
+        """
+        if not original_kpis or not original_project or not updated_project:
+            return {}
+
+        significant_changes, dependent, change_impact = KPIAdjuster._project_change_impact(original_project,
+                                                                                           updated_project)
 
-        # If there are no significant changes, return original KPIs
+        # If there are no significant changes, nothing needs recomputing
         if not significant_changes:
-            return original_kpis
+            return {}
+
+        # Only the dependent KPIs are sent for adjustment
+        if dependent is None:
+            dependent_kpis = original_kpis
+        else:
+            dependent_kpis = {}
+            for category, name in dependent:
+                kpi = original_kpis.get(category, {}).get(name)
+                if isinstance(kpi, dict):
+                    dependent_kpis.setdefault(category, {})[name] = kpi
+
+        if not dependent_kpis:
+            return {}
 
         # Try to use OpenAI for more intelligent KPI adjustment
         try:
             # Create a prompt for OpenAI to intelligently adjust KPIs
             kpi_prompt = f"""
-            Based on the following project changes and the original KPIs, adjust the KPI targets intelligently.
+            Based on the following project changes and the affected KPIs, adjust the KPI targets intelligently.
 
-            Original KPIs:
-            {json.dumps(original_kpis, indent=2)}
+            Affected KPIs:
+            {json.dumps(dependent_kpis, indent=2)}
 
             Project Changes:
             {json.dumps(significant_changes, indent=2)}
@@ -437,8 +258,8 @@ class KPIAdjuster:
             - Decreased timeline would increase time pressure and might affect quality metrics
             - Technology changes might temporarily reduce productivity but improve quality long-term
 
-            Return only a valid JSON object matching the structure of the original KPIs, but with updated target values.
-            Preserve the current value fields exactly as they are in the original KPIs.
+            Return only a valid JSON object matching the structure of the affected KPIs, but with updated target values.
+            Preserve the current value fields exactly as they are in the affected KPIs.
             """
 
             # Get adjusted KPI suggestions from OpenAI
@@ -448,117 +269,100 @@ class KPIAdjuster:
                 # Parse the JSON response
                 adjusted_kpis = json.loads(kpi_response)
 
-                # Validate the structure matches the original KPIs
+                # Validate the structure matches the affected KPIs
                 if (isinstance(adjusted_kpis, dict) and
-                        all(category in original_kpis for category in adjusted_kpis.keys())):
-
-                    # Preserve current values from original KPIs
-                    for category in original_kpis:
-                        if category in adjusted_kpis:
-                            for kpi_name in original_kpis[category]:
-                                if kpi_name in adjusted_kpis[category] and 'value' in original_kpis[category][kpi_name]:
-                                    adjusted_kpis[category][kpi_name]['value'] = original_kpis[category][kpi_name][
-                                        'value']
-
-                    return adjusted_kpis
-            except (json.JSONDecodeError, TypeError):
+                        all(category in dependent_kpis for category in adjusted_kpis.keys())):
+
+                    changes = {}
+                    for category, category_kpis in dependent_kpis.items():
+                        for kpi_name, original in category_kpis.items():
+                            adjusted = (adjusted_kpis.get(category) or {}).get(kpi_name)
+                            if not isinstance(adjusted, dict) or not isinstance(original, dict):
+                                continue
+
+                            # Preserve current values from original KPIs
+                            if 'value' in original:
+                                adjusted['value'] = original['value']
+                            if adjusted != original:
+                                changes[(category, kpi_name)] = adjusted
+
+                    return changes
+            except (json.JSONDecodeError, TypeError, AttributeError):
                 # Fallback to rule-based adjustment if JSON parsing fails
                 print("Failed to parse AI-generated KPI adjustments for project changes, using fallback method")
         except Exception as e:
             print(f"Error generating AI-based KPI adjustments for project changes: {e}")
 
-        # Significant changes found, regenerate KPIs but preserve current values
-        new_kpis = KPIGenerator.generate_kpis(updated_project)
-
-        # Create adjusted KPIs by merging new targets with original current values and statuses
-        adjusted_kpis = copy.deepcopy(new_kpis)
-
-        # Apply impact factors from changes to new KPI targets
-        for category in adjusted_kpis:
-            for kpi_name, kpi_data in adjusted_kpis[category].items():
-                # Find relevant impact factor if any
-                impact_key = kpi_name.lower().replace('_', '')
-                for key, factor in change_impact.items():
-                    if key in impact_key:
-                        try:
-                            # Extract target value and adjust it
-                            if '%' in kpi_data['target']:
-                                # Percentage value
-                                target_value = float(kpi_data['target'].split('%')[0])
-                                adjusted_value = target_value * factor
-                                # Cap at 100%
-                                adjusted_value = min(adjusted_value, 100)
-                                kpi_data['target'] = f"{adjusted_value:.1f}%"
-                            elif ' ' in kpi_data['target']:
-                                # Value with units
-                                parts = kpi_data['target'].split(' ', 1)
-                                target_value = float(parts[0])
-                                units = parts[1]
-                                adjusted_value = target_value * factor
-                                kpi_data['target'] = f"{adjusted_value:.1f} {units}"
-                            else:
-                                # Simple numeric value
-                                target_value = float(kpi_data['target'])
-                                adjusted_value = target_value * factor
-                                kpi_data['target'] = f"{adjusted_value:.1f}"
-                        except (ValueError, IndexError):
-                            pass
-
-        # Preserve progress on KPIs
-        for category in original_kpis:
-            if category in adjusted_kpis:
-                for kpi_name in original_kpis[category]:
-                    if kpi_name in adjusted_kpis[category]:
-                        # Preserve the current value if it exists
-                        if 'value' in original_kpis[category][kpi_name]:
-                            adjusted_kpis[category][kpi_name]['value'] = original_kpis[category][kpi_name]['value']
-
-                            # Recalculate status based on new target and preserved value
-                            try:
-                                current_value_str = adjusted_kpis[category][kpi_name]['value']
-                                target_value_str = adjusted_kpis[category][kpi_name]['target']
-
-                                # Determine if higher or lower is better for this KPI
-                                if kpi_name in ['cycle_time', 'lead_time', 'defect_density', 'code_churn',
-                                                'rework_ratio', 'code_review_turnaround_time']:
-                                    # For these KPIs, lower is better
-                                    current_value = float(current_value_str.split()[
-                                                              0] if ' ' in current_value_str else current_value_str.rstrip(
-                                        '%'))
-                                    target_value = float(target_value_str.split()[
-                                                             0] if ' ' in target_value_str else target_value_str.rstrip(
-                                        '%'))
-
-                                    if current_value <= target_value * 1.1:
-                                        adjusted_kpis[category][kpi_name]['status'] = "On Track"
-                                    elif current_value <= target_value * 1.3:
-                                        adjusted_kpis[category][kpi_name]['status'] = "At Risk"
-                                    else:
-                                        adjusted_kpis[category][kpi_name]['status'] = "Below Target"
-                                else:
-                                    # For other KPIs, higher is better
-                                    current_value = float(current_value_str.split()[
-                                                              0] if ' ' in current_value_str else current_value_str.rstrip(
-                                        '%'))
-                                    target_value = float(target_value_str.split()[
-                                                             0] if ' ' in target_value_str else target_value_str.rstrip(
-                                        '%'))
-
-                                    if current_value >= target_value * 0.9:
-                                        adjusted_kpis[category][kpi_name]['status'] = "On Track"
-                                    elif current_value >= target_value * 0.7:
-                                        adjusted_kpis[category][kpi_name]['status'] = "At Risk"
-                                    else:
-                                        adjusted_kpis[category][kpi_name]['status'] = "Below Target"
-                            except (ValueError, IndexError):
-                                # If parsing fails, leave original status
-                                if 'status' in original_kpis[category][kpi_name]:
-                                    adjusted_kpis[category][kpi_name]['status'] = original_kpis[category][kpi_name][
-                                        'status']
-
-                        # If no value exists but there's a status, preserve it
-                        elif 'status' in original_kpis[category][kpi_name]:
-                            adjusted_kpis[category][kpi_name]['status'] = original_kpis[category][kpi_name]['status']
+        # Significant changes found, recompute the dependent KPIs but preserve current values
+        new_kpis = KPIGenerator.generate_rule_based_kpis(updated_project)
+
+        changes = {}
+        for category, category_kpis in dependent_kpis.items():
+            if not isinstance(category_kpis, dict) or category.startswith('_'):
+                continue
+
+            for kpi_name, original_data in category_kpis.items():
+                new_data = (new_kpis.get(category) or {}).get(kpi_name)
+                if not isinstance(new_data, dict) or not isinstance(original_data, dict):
+                    continue
+
+                # Targets are adjusted numerically
+                kpi = KPI.from_dict(category, kpi_name, new_data)
+                original = KPI.from_dict(category, kpi_name, original_data)
+
+                # Scale the original target by the impact of the changes where it is known; the
+                # regenerated target already reflects the new parameters, so it is used otherwise
+                factor = change_impact.get((category, kpi_name))
+                if factor is not None and original.target is not None:
+                    kpi.target = original.target * factor
+                    if kpi.unit == '%':
+                        kpi.target = min(kpi.target, 100)  # Cap at 100%
+
+                # Preserve progress on KPIs
+                if original.has_value:
+                    # Preserve the current value and recalculate status based on new target
+                    kpi.take_value(original)
+                    if kpi.value is not None and kpi.target is not None:
+                        kpi.status = kpi.evaluate_status()
+                    elif original.status is not None:
+                        # If parsing fails, leave original status
+                        kpi.status = original.status
+
+                # If no value exists but there's a status, preserve it
+                elif original.status is not None:
+                    kpi.status = original.status
+
+                adjusted = kpi.to_dict()
+                if adjusted != original_data:
+                    changes[(category, kpi_name)] = adjusted
+
+        return changes
+
+    @staticmethod
+    def adjust_kpis_for_project_changes(original_kpis, original_project, updated_project):
+        """
+        Adjust KPIs based on changes to project parameters, with intelligent
+        preservation of progress on unchanged KPIs.
+
+        Args:
+            original_kpis: Original KPI dictionary.
+            original_project: Dictionary with original project details.
+            updated_project: Dictionary with updated project details.
+
+        Returns:
+            dict: Adjusted KPIs.
+        """
+        changes = KPIAdjuster.diff_kpis_for_project_changes(original_kpis, original_project, updated_project)
+
+        if not changes:
+            return original_kpis
+
+        # Copy only the categories that changed
+        adjusted_kpis = dict(original_kpis)
+        for (category, kpi_name), kpi in changes.items():
+            if adjusted_kpis.get(category) is original_kpis.get(category):
+                adjusted_kpis[category] = dict(original_kpis.get(category) or {})
+            adjusted_kpis[category][kpi_name] = kpi
 
         return adjusted_kpis
 
@@ -632,7 +436,7 @@ class KPIAdjuster:
             print(f"Error generating AI-based KPI recalibration: {e}")
 
         # Fallback to rule-based recalibration
-        recalibrated_kpis = copy.deepcopy(original_kpis)
+        kpi_list = KPI.parse_all(original_kpis)
 
         # Determine recalibration factor based on project stage
         if completion_percentage < 33:
@@ -645,97 +449,49 @@ class KPIAdjuster:
             # Late stage - light recalibration
             recalibration_factor = 0.9
 
-        # Apply recalibration to each KPI category
-        for category in recalibrated_kpis:
-            for kpi_name, kpi_data in recalibrated_kpis[category].items():
-                if 'value' in kpi_data and 'target' in kpi_data:
-                    try:
-                        # Determine if this is a percentage, time, or other value
-                        is_percentage = '%' in kpi_data['target']
-                        has_units = ' ' in kpi_data['target'] and not is_percentage
-
-                        # Extract current and target values
-                        if is_percentage:
-                            current_value = float(kpi_data['value'].rstrip('%'))
-                            target_value = float(kpi_data['target'].rstrip('%'))
-                            units = '%'
-                        elif has_units:
-                            current_value = float(kpi_data['value'].split(' ')[0])
-                            target_value = float(kpi_data['target'].split(' ')[0])
-                            units = ' ' + kpi_data['target'].split(' ', 1)[1]
-                        else:
-                            current_value = float(kpi_data['value'])
-                            target_value = float(kpi_data['target'])
-                            units = ''
-
-                        # Determine if higher or lower is better
-                        if kpi_name in ['cycle_time', 'lead_time', 'defect_density', 'code_churn', 'rework_ratio',
-                                        'code_review_turnaround_time']:
-                            # For these KPIs, lower is better
-                            is_higher_better = False
-                        else:
-                            # For most KPIs, higher is better
-                            is_higher_better = True
-
-                        # Calculate recalibrated target
-                        if is_higher_better:
-                            # Calculate performance ratio
-                            ratio = current_value / target_value if target_value > 0 else 1
-
-                            if ratio > 1.2:
-                                # We're exceeding target by 20%+, raise the bar
-                                new_target = target_value * (1 + (ratio - 1) * recalibration_factor)
-                                if is_percentage:
-                                    new_target = min(new_target, 100)  # Cap at 100%
-                            elif ratio < 0.8:
-                                # We're more than 20% below target, adjust downward
-                                new_target = target_value * (1 - (1 - ratio) * recalibration_factor)
-                            else:
-                                # We're close to target, maintain it
-                                new_target = target_value
-                        else:
-                            # For lower-is-better metrics, invert the logic
-                            ratio = target_value / current_value if current_value > 0 else 1
-
-                            if ratio > 1.2:
-                                # We're performing better than target by 20%+, make target more ambitious
-                                new_target = target_value * (1 - (ratio - 1) * recalibration_factor)
-                            elif ratio < 0.8:
-                                # We're performing worse than target by 20%+, adjust target to be more achievable
-                                new_target = target_value * (1 + (1 - ratio) * recalibration_factor)
-                            else:
-                                # We're close to target, maintain it
-                                new_target = target_value
-
-                        # Format new target with appropriate units
-                        if is_percentage:
-                            new_target_str = f"{new_target:.1f}%"
-                        elif has_units:
-                            new_target_str = f"{new_target:.1f}{units}"
-                        else:
-                            new_target_str = f"{new_target:.1f}"
-
-                        # Update target
-                        kpi_data['target'] = new_target_str
-
-                        # Update status based on new target
-                        if is_higher_better:
-                            if current_value >= new_target * 0.9:
-                                kpi_data['status'] = "On Track"
-                            elif current_value >= new_target * 0.7:
-                                kpi_data['status'] = "At Risk"
-                            else:
-                                kpi_data['status'] = "Below Target"
-                        else:
-                            if current_value <= new_target * 1.1:
-                                kpi_data['status'] = "On Track"
-                            elif current_value <= new_target * 1.3:
-                                kpi_data['status'] = "At Risk"
-                            else:
-                                kpi_data['status'] = "Below Target"
-                    except (ValueError, IndexError):
-                        # If parsing fails, leave target as is
-                        pass
+        # Apply recalibration to each KPI with a numeric value and target
+        for kpi in kpi_list:
+            if kpi.value is None or kpi.target is None:
+                continue
+
+            current_value = kpi.value
+            target_value = kpi.target
+
+            # Calculate recalibrated target
+            if kpi.higher_is_better:
+                # Calculate performance ratio
+                ratio = current_value / target_value if target_value > 0 else 1
+
+                if ratio > 1.2:
+                    # We're exceeding target by 20%+, raise the bar
+                    new_target = target_value * (1 + (ratio - 1) * recalibration_factor)
+                    if kpi.unit == '%':
+                        new_target = min(new_target, 100)  # Cap at 100%
+                elif ratio < 0.8:
+                    # We're more than 20% below target, adjust downward
+                    new_target = target_value * (1 - (1 - ratio) * recalibration_factor)
+                else:
+                    # We're close to target, maintain it
+                    new_target = target_value
+            else:
+                # For lower-is-better metrics, invert the logic
+                ratio = target_value / current_value if current_value > 0 else 1
+
+                if ratio > 1.2:
+                    # We're performing better than target by 20%+, make target more ambitious
+                    new_target = target_value * (1 - (ratio - 1) * recalibration_factor)
+                elif ratio < 0.8:
+                    # We're performing worse than target by 20%+, adjust target to be more achievable
+                    new_target = target_value * (1 + (1 - ratio) * recalibration_factor)
+                else:
+                    # We're close to target, maintain it
+                    new_target = target_value
+
+            # Update target and status based on new target
+            kpi.target = new_target
+            kpi.status = kpi.evaluate_status()
+
+        recalibrated_kpis = KPI.format_all(kpi_list, original_kpis)
 
         # Add metadata about recalibration
         recalibrated_kpis["_meta"] = {
@@ -0,0 +1,177 @@
+import numpy as np
+
+from modules.kpi_generation.kpi_model import KPI
+
+# Statuses by status code, as produced by KPIEngine.evaluate_statuses
+STATUSES = ("On Track", "At Risk", "Below Target")
+
+# Positive trend = higher targets, negative trend = lower targets
+TREND_FACTORS = {
+    "improving": 1.1,  # 10% higher targets
+    "stable": 1.0,  # No change
+    "declining": 0.9  # 10% lower targets
+}
+
+# How much to blend the original target with actual performance, by project completion:
+# early in the project slight adjustments, mid-project moderate, late heavier
+PHASE_WEIGHTS = ((30, 0.3), (70, 0.5), (None, 0.7))
+
+# Rule-based adjustment rules, first match wins:
+# (category, KPI name or None for every KPI of the category, metrics that must be set,
+#  trend scaling the blended target, whether the trend scales it inversely, status thresholds)
+ADJUSTMENT_RULES = (
+    ("productivity", "velocity", ("actual_velocity",), "velocity_trend", False, (0.9, 0.7)),
+    # For cycle time, lower is better and no trend applies
+    ("productivity", "cycle_time", ("actual_cycle_time",), None, False, (1.1, 1.3)),
+    ("code_quality", "defect_density", ("quality_trend", "defect_rate"), "quality_trend", False, (1.1, 1.3)),
+    ("code_quality", "test_coverage", ("quality_trend", "test_coverage"), "quality_trend", False, (0.9, 0.8)),
+    # For turnaround time, lower is better, so an improving trend lowers the target
+    ("collaboration", "code_review_turnaround_time", ("collaboration_trend",), "collaboration_trend", True,
+     (1.1, 1.3)),
+    ("collaboration", None, ("collaboration_trend",), "collaboration_trend", False, (0.9, 0.8)),
+)
+
+
+class KPIEngine:
+    """
+    Table-driven, vectorised KPI adjustment.
+    The KPIs of any number of projects are laid out as columns (project, value, target,
+    direction, blend weight, matching rule) and every adjustment rule is applied to all
+    rows at once, so recalibrating every project is a single batched computation.
+    """
+
+    @staticmethod
+    def evaluate_statuses(values, targets, higher_is_better, on_track=None, at_risk=None):
+        """
+        Get the status codes implied by values and targets.
+
+        Args:
+            values: Array of current values.
+            targets: Array of targets.
+            higher_is_better: Boolean array, True where a higher value is better.
+            on_track: Array of "on track" ratios of the target (optional). Defaults to 0.9
+                      when higher is better and 1.1 when lower is better.
+            at_risk: Array of "at risk" ratios of the target (optional). Defaults to 0.7
+                     when higher is better and 1.3 when lower is better.
+
+        Returns:
+            numpy.ndarray: Index into STATUSES for each KPI.
+        """
+        if on_track is None:
+            on_track = np.where(higher_is_better, 0.9, 1.1)
+        if at_risk is None:
+            at_risk = np.where(higher_is_better, 0.7, 1.3)
+
+        # Compare so that "better or equal" is always >=
+        sign = np.where(higher_is_better, 1.0, -1.0)
+        is_on_track = sign * values >= sign * targets * on_track
+        is_at_risk = sign * values >= sign * targets * at_risk
+
+        return np.select([is_on_track, is_at_risk], [0, 1], 2)
+
+    @staticmethod
+    def build_table(kpi_lists):
+        """
+        Lay out the KPIs of several projects as columns.
+
+        Args:
+            kpi_lists: List of parsed KPI lists, one per project.
+
+        Returns:
+            dict: 'kpis' (flat list of KPIs) and NumPy columns 'project', 'value', 'target'
+                  (NaN where unknown), 'higher_is_better', 'percent' and 'rule' (index into
+                  ADJUSTMENT_RULES, -1 if none applies).
+        """
+        rule_by_name = {}
+        rule_by_category = {}
+        for index, (category, name, *_) in enumerate(ADJUSTMENT_RULES):
+            if name is None:
+                rule_by_category.setdefault(category, index)
+            else:
+                rule_by_name.setdefault((category, name), index)
+
+        kpis = [kpi for kpi_list in kpi_lists for kpi in kpi_list]
+
+        return {
+            "kpis": kpis,
+            "project": np.repeat(np.arange(len(kpi_lists)), [len(kpi_list) for kpi_list in kpi_lists]),
+            "value": np.array([np.nan if kpi.value is None else kpi.value for kpi in kpis], dtype=float),
+            "target": np.array([np.nan if kpi.target is None else kpi.target for kpi in kpis], dtype=float),
+            "higher_is_better": np.array([kpi.higher_is_better for kpi in kpis], dtype=bool),
+            "percent": np.array([kpi.unit == "%" for kpi in kpis], dtype=bool),
+            "rule": np.array([rule_by_name.get((kpi.category, kpi.name), rule_by_category.get(kpi.category, -1))
+                              for kpi in kpis], dtype=int),
+        }
+
+    @staticmethod
+    def _project_columns(progress_list, team_performance_list):
+        """
+        Get the per-project inputs of the rules.
+
+        Returns:
+            tuple: (blend weight per project, (project, rule) matrix of whether the rule's
+                    metrics are set, (project, rule) matrix of trend factors)
+        """
+        completion = np.array([progress.get('completion_percentage', 50) for progress in progress_list], dtype=float)
+        phases = [(limit, weight) for limit, weight in PHASE_WEIGHTS if limit is not None]
+        weights = np.select([completion < limit for limit, _ in phases], [weight for _, weight in phases],
+                            PHASE_WEIGHTS[-1][1])
+
+        enabled = np.zeros((len(progress_list), len(ADJUSTMENT_RULES)), dtype=bool)
+        trend_factors = np.ones((len(progress_list), len(ADJUSTMENT_RULES)))
+        for project, (progress, team_performance) in enumerate(zip(progress_list, team_performance_list)):
+            metrics = dict(progress)
+            metrics.update(team_performance or {})
+
+            for rule, (_, _, required, trend, _, _) in enumerate(ADJUSTMENT_RULES):
+                enabled[project, rule] = all(metrics.get(metric) for metric in required)
+                if trend:
+                    trend_factors[project, rule] = TREND_FACTORS.get(metrics.get(trend), 1.0)
+
+        return weights, enabled, trend_factors
+
+    @staticmethod
+    def adjust_many(kpi_sets, progress_list, team_performance_list=None):
+        """
+        Adjust the KPIs of several projects based on their progress, in one batch.
+
+        Args:
+            kpi_sets: List of KPI dictionaries, one per project.
+            progress_list: List of project progress metrics, one per project.
+            team_performance_list: List of team performance data (or None), one per project (optional).
+
+        Returns:
+            list: Adjusted KPI dictionaries, one per project.
+        """
+        team_performance_list = team_performance_list or [None] * len(kpi_sets)
+
+        kpi_lists = [KPI.parse_all(kpis) for kpis in kpi_sets]
+        table = KPIEngine.build_table(kpi_lists)
+
+        if table["kpis"]:
+            weights, enabled, trend_factors = KPIEngine._project_columns(progress_list, team_performance_list)
+
+            project = table["project"]
+            rule = np.maximum(table["rule"], 0)
+            value = table["value"]
+            target = table["target"]
+
+            inverse = np.array([rule_spec[4] for rule_spec in ADJUSTMENT_RULES])[rule]
+            on_track, at_risk = np.array([rule_spec[5] for rule_spec in ADJUSTMENT_RULES]).T[:, rule]
+
+            # Leave KPIs without a rule or without numeric value and target as they are
+            applies = (table["rule"] >= 0) & enabled[project, rule] & ~np.isnan(value) & ~np.isnan(target)
+
+            factor = trend_factors[project, rule]
+            weight = weights[project]
+            new_target = (target * (1 - weight) + value * weight) * np.where(inverse, 1 / factor, factor)
+            new_target = np.where(table["percent"], np.minimum(new_target, 100), new_target)  # Cap at 100%
+
+            statuses = KPIEngine.evaluate_statuses(value, new_target, table["higher_is_better"], on_track, at_risk)
+
+            for row in np.flatnonzero(applies):
+                kpi = table["kpis"][row]
+                kpi.target = float(new_target[row])
+                kpi.status = STATUSES[statuses[row]]
+
+        return [KPI.format_all(kpi_list, kpis) for kpi_list, kpis in zip(kpi_lists, kpi_sets)]
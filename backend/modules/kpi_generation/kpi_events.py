@@ -0,0 +1,173 @@
+from modules.kpi_generation.kpi_engine import KPIEngine
+from modules.kpi_generation.kpi_model import KPI
+
+# Default sprint length in days, for burndown rates
+DEFAULT_SPRINT_DAYS = 14
+
+
+class KPIEventProcessor:
+    """
+    Event-driven, incremental KPI recalculation.
+    Progress events (a sprint closing, a defect count, a coverage report, ...) update running
+    aggregates kept with the project's KPIs, and only the KPIs derived from those aggregates
+    are recomputed. Targets are adjusted by the rule-based engine at sprint boundaries;
+    AI-based recalibration stays an explicit, periodic request.
+    """
+
+    # Attempts at writing applied events before giving up on concurrent updates of the same project
+    MAX_WRITE_ATTEMPTS = 5
+
+    # Event type: (handler, whether the event adjusts targets)
+    EVENT_TYPES = {
+        "sprint_closed": ("_sprint_closed", True),
+        "defects_reported": ("_defects_reported", False),
+        "quality_measured": ("_quality_measured", False),
+        "review_completed": ("_review_completed", False),
+        "progress_updated": ("_progress_updated", False)
+    }
+
+    @staticmethod
+    def _running_mean(aggregates, name, value):
+        """Add a value to a running mean aggregate and get the new mean."""
+        total = aggregates.get(f"{name}_sum", 0) + value
+        count = aggregates.get(f"{name}_count", 0) + 1
+        aggregates[f"{name}_sum"] = total
+        aggregates[f"{name}_count"] = count
+        return total / count
+
+    @staticmethod
+    def _sprint_closed(aggregates, data):
+        """
+        A sprint closed with completed_points, and optionally planned_stories and
+        completed_stories, days, cycle_time (hours per story point) and lead_time (days).
+        """
+        values = {}
+        points = float(data["completed_points"])
+        days = float(data.get("days", DEFAULT_SPRINT_DAYS))
+        if days <= 0:
+            raise ValueError("days must be greater than zero")
+
+        aggregates["sprints_closed"] = aggregates.get("sprints_closed", 0) + 1
+        values[("productivity", "velocity")] = KPIEventProcessor._running_mean(aggregates, "velocity", points)
+        values[("productivity", "sprint_burndown_rate")] = KPIEventProcessor._running_mean(
+            aggregates, "burndown_rate", points / days
+        )
+
+        if data.get("planned_stories"):
+            aggregates["stories_planned"] = aggregates.get("stories_planned", 0) + int(data["planned_stories"])
+            aggregates["stories_completed"] = (aggregates.get("stories_completed", 0) +
+                                               int(data.get("completed_stories", 0)))
+            values[("productivity", "story_completion_ratio")] = (
+                    aggregates["stories_completed"] / aggregates["stories_planned"] * 100
+            )
+
+        for name in ("cycle_time", "lead_time"):
+            if data.get(name) is not None:
+                values[("productivity", name)] = KPIEventProcessor._running_mean(aggregates, name,
+                                                                                 float(data[name]))
+
+        return values
+
+    @staticmethod
+    def _defects_reported(aggregates, data):
+        """New defects were reported: count, and optionally kloc of code they were found in."""
+        aggregates["defects"] = aggregates.get("defects", 0) + int(data["count"])
+        if data.get("kloc"):
+            aggregates["kloc"] = aggregates.get("kloc", 0) + float(data["kloc"])
+
+        if not aggregates.get("kloc"):
+            return {}
+
+        return {("code_quality", "defect_density"): aggregates["defects"] / aggregates["kloc"]}
+
+    @staticmethod
+    def _quality_measured(aggregates, data):
+        """
+        A code quality report with any of test_coverage, average_cyclomatic_complexity,
+        code_churn and rework_ratio; the latest measurement is the current value.
+        """
+        values = {}
+        for name in ("test_coverage", "average_cyclomatic_complexity", "code_churn", "rework_ratio"):
+            if data.get(name) is not None:
+                aggregates[name] = float(data[name])
+                values[("code_quality", name)] = aggregates[name]
+
+        return values
+
+    @staticmethod
+    def _review_completed(aggregates, data):
+        """Code reviews completed with turnaround_hours (one value or a list)."""
+        hours = data["turnaround_hours"]
+        mean = None
+        for value in hours if isinstance(hours, list) else [hours]:
+            mean = KPIEventProcessor._running_mean(aggregates, "review_turnaround", float(value))
+
+        return {} if mean is None else {("collaboration", "code_review_turnaround_time"): mean}
+
+    @staticmethod
+    def _progress_updated(aggregates, data):
+        """The project's completion_percentage changed; this only affects later target adjustments."""
+        aggregates["completion_percentage"] = float(data["completion_percentage"])
+        return {}
+
+    @staticmethod
+    def _project_progress(aggregates):
+        """Get the project progress metrics the rule-based adjuster uses from the aggregates."""
+        progress = {"completion_percentage": aggregates.get("completion_percentage", 50)}
+        if aggregates.get("velocity_count"):
+            progress["actual_velocity"] = aggregates["velocity_sum"] / aggregates["velocity_count"]
+        if aggregates.get("cycle_time_count"):
+            progress["actual_cycle_time"] = aggregates["cycle_time_sum"] / aggregates["cycle_time_count"]
+        return progress
+
+    @staticmethod
+    def apply_events(kpis, aggregates, events):
+        """
+        Apply progress events to a project's KPIs.
+
+        Args:
+            kpis: The project's KPI dictionary.
+            aggregates: The project's running aggregates (not modified).
+            events: List of events, each a dictionary with 'type' and 'data'.
+
+        Returns:
+            tuple: (updated KPIs as {(category, name): KPI dictionary}, new aggregates)
+
+        Raises:
+            ValueError: If an event has an unknown type or is missing data.
+        """
+        aggregates = dict(aggregates or {})
+        values = {}
+        adjust_targets = False
+
+        for event in events:
+            event_type = event.get("type")
+            if event_type not in KPIEventProcessor.EVENT_TYPES:
+                raise ValueError(f"Unknown event type '{event_type}'. "
+                                 f"Available: {', '.join(KPIEventProcessor.EVENT_TYPES)}")
+
+            handler_name, adjusts = KPIEventProcessor.EVENT_TYPES[event_type]
+            try:
+                values.update(getattr(KPIEventProcessor, handler_name)(aggregates, event.get("data") or {}))
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Invalid data for event '{event_type}': {e}")
+            adjust_targets = adjust_targets or adjusts
+
+        # Parse and update only the affected KPIs the project has
+        affected = {}
+        for (category, name), value in values.items():
+            data = (kpis or {}).get(category, {}).get(name)
+            if isinstance(data, dict):
+                kpi = KPI.from_dict(category, name, data)
+                kpi.value = value
+                kpi.status = kpi.evaluate_status()
+                affected[(category, name)] = kpi.to_dict()
+
+        if affected and adjust_targets:
+            # Move targets toward actual performance with the rule-based engine
+            adjusted = KPIEngine.adjust_many([KPI.format_all(
+                KPI.from_dict(category, name, data) for (category, name), data in affected.items()
+            )], [KPIEventProcessor._project_progress(aggregates)])[0]
+            affected = {(category, name): adjusted[category][name] for category, name in affected}
+
+        return affected, aggregates
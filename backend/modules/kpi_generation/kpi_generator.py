@@ -2,7 +2,9 @@ import random
 import json
 from datetime import datetime, timedelta
 from modules.kpi_generation.project_analyzer import ProjectAnalyzer
+from modules.kpi_generation.project_scheduler import ProjectScheduler, ScheduledTask
 from services.openai_service import openai_service
+from utils.seeding import get_rng
 
 
 class KPIGenerator:
@@ -12,12 +14,14 @@ class KPIGenerator:
     """
 
     @staticmethod
-    def generate_kpis(project_details):
+    def generate_kpis(project_details, project_id=None):
         """
         Generate comprehensive KPIs based on project details.
 
         Args:
             project_details: Dictionary containing project information.
+            project_id: ID of the project (optional). Defaults to the project's '_id'; rule-based
+                        KPIs are reproducible for the same project and details.
 
         Returns:
             dict: Generated KPIs and metrics.
@@ -34,6 +38,10 @@ class KPIGenerator:
         timeline_analysis = ProjectAnalyzer.analyze_timeline(timeline, team_size)
         tech_analysis = ProjectAnalyzer.analyze_technologies(technologies)
 
+        # Seed fallback values from the project and its parameters
+        rng = get_rng(project_id or project_details.get('_id'), 'kpis', project_type, team_size, timeline,
+                      technologies, sprints)
+
         # Try to use OpenAI for more intelligent KPI generation
         try:
             # Create a prompt for OpenAI to generate realistic KPI values
@@ -87,16 +95,41 @@ class KPIGenerator:
             except (json.JSONDecodeError, TypeError):
                 # Fallback to traditional generation if JSON parsing fails
                 print("Failed to parse AI-generated KPIs, using fallback method")
-                kpis = KPIGenerator._generate_fallback_kpis(team_size, sprints, timeline_analysis, tech_analysis)
+                kpis = KPIGenerator._generate_fallback_kpis(team_size, sprints, timeline_analysis, tech_analysis, rng)
         except Exception as e:
             print(f"Error generating AI-based KPIs: {e}")
             # Fallback to traditional generation
-            kpis = KPIGenerator._generate_fallback_kpis(team_size, sprints, timeline_analysis, tech_analysis)
+            kpis = KPIGenerator._generate_fallback_kpis(team_size, sprints, timeline_analysis, tech_analysis, rng)
 
         return kpis
 
     @staticmethod
-    def _generate_fallback_kpis(team_size, sprints, timeline_analysis, tech_analysis):
+    def generate_rule_based_kpis(project_details, project_id=None):
+        """
+        Generate KPIs with the rule-based approach only, without AI.
+
+        Args:
+            project_details: Dictionary containing project information.
+            project_id: ID of the project (optional). Defaults to the project's '_id'.
+
+        Returns:
+            dict: Generated KPIs, the same as generate_kpis produces when AI is unavailable.
+        """
+        project_type = project_details.get('project_type', 'Software Development')
+        team_size = int(project_details.get('project_team_size', 5))
+        timeline = int(project_details.get('project_timeline', 90))
+        technologies = project_details.get('project_languages', [])
+        sprints = int(project_details.get('project_sprints', 5))
+
+        rng = get_rng(project_id or project_details.get('_id'), 'kpis', project_type, team_size, timeline,
+                      technologies, sprints)
+
+        return KPIGenerator._generate_fallback_kpis(team_size, sprints,
+                                                    ProjectAnalyzer.analyze_timeline(timeline, team_size),
+                                                    ProjectAnalyzer.analyze_technologies(technologies), rng)
+
+    @staticmethod
+    def _generate_fallback_kpis(team_size, sprints, timeline_analysis, tech_analysis, rng=None):
         """
         Generate KPIs using a rule-based approach as fallback when AI fails.
 
@@ -105,10 +138,13 @@ class KPIGenerator:
             sprints: Number of sprints.
             timeline_analysis: Results of timeline analysis.
             tech_analysis: Results of technology analysis.
+            rng: Random number generator for current values (optional). Defaults to the global random module.
 
         Returns:
             dict: Generated KPIs.
         """
+        rng = rng or random
+
         # Calculate realistic KPI values based on project parameters
 
         # Use timeline analysis to set realistic targets
@@ -116,11 +152,11 @@ class KPIGenerator:
         expected_cycle_time = timeline_analysis.get('expected_cycle_time', 6)
 
         # Calculate current values with slight variations from targets
-        current_velocity = max(1, int(expected_velocity * (0.8 + 0.4 * random.random())))
-        current_burndown = expected_velocity / 10 * (0.7 + 0.6 * random.random())
-        current_lead_time = random.randint(1, 3)
-        current_cycle_time = expected_cycle_time * (0.8 + 0.4 * random.random())
-        current_story_completion = random.randint(80, 98)
+        current_velocity = max(1, int(expected_velocity * (0.8 + 0.4 * rng.random())))
+        current_burndown = expected_velocity / 10 * (0.7 + 0.6 * rng.random())
+        current_lead_time = rng.randint(1, 3)
+        current_cycle_time = expected_cycle_time * (0.8 + 0.4 * rng.random())
+        current_story_completion = rng.randint(80, 98)
 
         # Productivity KPIs
         productivity_kpis = {
@@ -160,11 +196,11 @@ class KPIGenerator:
         complexity_target = 10 if tech_categories.get('frontend', False) else 15
 
         # Current values with variations
-        current_defect_density = random.uniform(0.5, 2.0)
-        current_complexity = random.randint(8, 20)
-        current_test_coverage = random.randint(70, 95)
-        current_code_churn = random.randint(10, 30)
-        current_rework_ratio = random.randint(5, 15)
+        current_defect_density = rng.uniform(0.5, 2.0)
+        current_complexity = rng.randint(8, 20)
+        current_test_coverage = rng.randint(70, 95)
+        current_code_churn = rng.randint(10, 30)
+        current_rework_ratio = rng.randint(5, 15)
 
         # Code Quality KPIs
         code_quality_kpis = {
@@ -199,9 +235,9 @@ class KPIGenerator:
         review_time_target = 8 if team_size <= 3 else 24  # Hours
 
         # Current values with variations
-        current_review_time = random.randint(4, 36)
-        current_merge_rate = random.randint(90, 100)
-        current_peer_review = random.randint(70, 95)
+        current_review_time = rng.randint(4, 36)
+        current_merge_rate = rng.randint(90, 100)
+        current_peer_review = rng.randint(70, 95)
 
         # Collaboration KPIs
         collaboration_kpis = {
@@ -223,9 +259,9 @@ class KPIGenerator:
         }
 
         # Current values with variations
-        current_feedback_rate = random.randint(70, 95)
-        current_training_rate = random.randint(60, 100)
-        current_kpi_responsiveness = random.randint(1, 5)
+        current_feedback_rate = rng.randint(70, 95)
+        current_training_rate = rng.randint(60, 100)
+        current_kpi_responsiveness = rng.randint(1, 5)
 
         # Adaptability KPIs
         adaptability_kpis = {
@@ -306,128 +342,23 @@ class KPIGenerator:
             try:
                 # Parse the JSON response
                 gantt_data = json.loads(gantt_response)
-                # Validate the structure
+                # Validate the structure and parse the days once into typed tasks
                 if isinstance(gantt_data, list) and all(
                         isinstance(task, dict) and 'Task' in task and 'Start' in task and 'End' in task for task in
                         gantt_data):
-                    return gantt_data
-            except (json.JSONDecodeError, TypeError):
+                    return [ScheduledTask.from_dict(task).to_dict() for task in gantt_data]
+            except (json.JSONDecodeError, TypeError, ValueError):
                 # Fallback to traditional generation if JSON parsing fails
                 print("Failed to parse AI-generated Gantt data, using fallback method")
         except Exception as e:
             print(f"Error generating AI-based Gantt chart: {e}")
 
-        # Fallback to rule-based Gantt chart generation
-        return KPIGenerator._generate_fallback_gantt_data(project_type, timeline, sprints)
-
-    @staticmethod
-    def _generate_fallback_gantt_data(project_type, timeline, sprints):
-        """
-        Generate Gantt chart data using a rule-based approach as fallback.
-
-        Args:
-            project_type: Type of project.
-            timeline: Project timeline in days.
-            sprints: Number of sprints.
-
-        Returns:
-            list: Gantt chart data.
-        """
-        # Calculate sprint duration
-        sprint_duration = timeline // sprints
+        # Fallback to scheduling the project locally
+        plan = ProjectScheduler.plan_project(project_type, timeline, sprints, team_size)
+        if not plan['fits_timeline']:
+            print(f"Scheduled project overruns its {timeline}-day timeline by {plan['overrun_days']} days")
 
-        # Generate tasks for each sprint
-        gantt_data = []
-
-        # Project kickoff - always at the beginning
-        gantt_data.append({
-            "Task": "Project Kickoff",
-            "Start": "Day 1",
-            "End": "Day 3"
-        })
-
-        # Requirements & Planning - adjust duration based on project type
-        req_end_day = sprint_duration // 2
-        if project_type in ["Enterprise", "Data Science"]:
-            req_end_day = max(req_end_day, 14)  # More planning for complex projects
-
-        gantt_data.append({
-            "Task": "Requirements Gathering",
-            "Start": "Day 3",
-            "End": f"Day {req_end_day}"
-        })
-
-        # Design phase - adjust overlap with requirements based on project type
-        design_start_day = max(5, req_end_day // 2)  # Start design when requirements are partly done
-        design_end_day = sprint_duration
-
-        # Adjust for different project types
-        if project_type in ["Web Development", "Mobile Development"]:
-            # Design phase is shorter for web/mobile projects
-            design_end_day = min(design_end_day, 21)
-        elif project_type in ["Enterprise"]:
-            # Design phase is longer for enterprise projects
-            design_end_day = max(design_end_day, 28)
-
-        gantt_data.append({
-            "Task": "Design & Architecture",
-            "Start": f"Day {design_start_day}",
-            "End": f"Day {design_end_day}"
-        })
-
-        # Development sprints
-        for i in range(1, sprints + 1):
-            start_day = (i - 1) * sprint_duration + 1
-            end_day = i * sprint_duration
-
-            # Adjust first sprint to start after design for most project types
-            if i == 1 and project_type not in ["Data Science"]:
-                start_day = max(start_day, design_end_day - 3)  # Slight overlap with end of design
-
-            gantt_data.append({
-                "Task": f"Sprint {i} Development",
-                "Start": f"Day {start_day}",
-                "End": f"Day {end_day}"
-            })
-
-            # Add testing overlapping with development
-            test_start = start_day + (sprint_duration // 3)  # Testing starts earlier
-            test_end = min(end_day + (sprint_duration // 5), timeline)  # Testing can extend slightly past sprint
-
-            gantt_data.append({
-                "Task": f"Sprint {i} Testing",
-                "Start": f"Day {test_start}",
-                "End": f"Day {test_end}"
-            })
-
-        # Deployment and handover phases
-        # Adjust deployment timing based on project type
-        if project_type in ["Web Development", "Mobile Development"]:
-            # Web/mobile often has continuous deployment
-            deploy_start = max(timeline - 14, sprints * sprint_duration - 7)
-        else:
-            # Enterprise/data projects have more formal deployment
-            deploy_start = max(timeline - 21, sprints * sprint_duration - 10)
-
-        gantt_data.append({
-            "Task": "Deployment Preparation",
-            "Start": f"Day {deploy_start}",
-            "End": f"Day {timeline - 3}"
-        })
-
-        gantt_data.append({
-            "Task": "Final Deployment",
-            "Start": f"Day {timeline - 5}",
-            "End": f"Day {timeline - 1}"
-        })
-
-        gantt_data.append({
-            "Task": "Project Handover",
-            "Start": f"Day {timeline - 3}",
-            "End": f"Day {timeline}"
-        })
-
-        return gantt_data
+        return [task.to_dict() for task in plan['tasks']]
 
     @staticmethod
     def generate_employee_criteria(project_details):
@@ -692,134 +623,5 @@ class KPIGenerator:
         except Exception as e:
             print(f"Error generating AI-based sprint breakdown: {e}")
 
-        # Fallback to rule-based sprint breakdown
-        return KPIGenerator._generate_fallback_sprint_breakdown(project_type, sprints, technologies)
-
-    @staticmethod
-    def _generate_fallback_sprint_breakdown(project_type, sprints, technologies):
-        """
-        Generate sprint breakdown using a rule-based approach as fallback.
-
-        Args:
-            project_type: Type of project.
-            sprints: Number of sprints.
-            technologies: List of technologies.
-
-        Returns:
-            dict: Sprint breakdown data.
-        """
-        # Get technology list in proper format
-        if isinstance(technologies, str):
-            tech_list = [tech.strip() for tech in technologies.split(',')]
-        else:
-            tech_list = technologies
-
-        # Define task templates based on project type
-        task_templates = {
-            "Web Development": [
-                "Design UI mockups", "Implement responsive layout", "Create API endpoints",
-                "Add authentication", "Integrate with backend", "Implement unit tests",
-                "Set up CI/CD pipeline", "Performance optimization", "Browser compatibility testing",
-                "Implement user dashboard", "Add search functionality", "Create admin interface",
-                "Implement form validation", "Add data visualization", "Create user onboarding flow"
-            ],
-            "Mobile Development": [
-                "Design app screens", "Implement UI components", "Create API clients",
-                "Add local storage", "Implement authentication", "Add push notifications",
-                "Performance testing", "Device compatibility testing", "App store preparation",
-                "Implement offline mode", "Add user profile features", "Integrate analytics",
-                "Create tutorial screens", "Implement in-app purchases", "Optimize for battery usage"
-            ],
-            "Data Science": [
-                "Data collection", "Data cleaning", "Exploratory analysis",
-                "Feature engineering", "Model development", "Model validation",
-                "Dashboard creation", "Documentation", "Production deployment",
-                "Data pipeline automation", "A/B test design", "Statistical analysis",
-                "Model optimization", "Insights reporting", "Real-time prediction implementation"
-            ],
-            "Enterprise": [
-                "Requirements analysis", "System architecture", "Data modeling",
-                "Core functionality development", "Business logic implementation", "Integration testing",
-                "User acceptance testing", "Documentation", "Training materials",
-                "Legacy system integration", "Security compliance", "Role-based access control",
-                "Audit logging", "Reporting module", "API gateway implementation"
-            ]
-        }
-
-        # Get task template based on project type
-        tasks = task_templates.get(project_type, task_templates["Web Development"])
-
-        # Generate additional project-specific tasks based on technologies
-        project_tasks = [
-            "Setup development environment",
-            "Create project documentation",
-            "Define coding standards",
-            "Set up version control"
-        ]
-
-        # Add technology-specific tasks
-        for tech in tech_list:
-            tech_lower = tech.lower()
-            if "react" in tech_lower:
-                project_tasks.extend(
-                    ["Set up React component structure", "Configure state management", "Implement React routing"])
-            elif "angular" in tech_lower:
-                project_tasks.extend(
-                    ["Set up Angular modules", "Create services and dependency injection", "Implement Angular routing"])
-            elif "node" in tech_lower or "express" in tech_lower:
-                project_tasks.extend(["Set up Node.js server", "Create API routes", "Implement middleware"])
-            elif "mongodb" in tech_lower:
-                project_tasks.extend(["Create MongoDB schema", "Implement database queries", "Set up indexing"])
-            elif "python" in tech_lower:
-                project_tasks.extend(
-                    ["Set up Python virtual environment", "Configure package dependencies", "Create utility modules"])
-            elif "docker" in tech_lower:
-                project_tasks.extend(
-                    ["Create Dockerfiles", "Set up container orchestration", "Configure CI/CD for containers"])
-            elif "aws" in tech_lower or "azure" in tech_lower or "cloud" in tech_lower:
-                project_tasks.extend(
-                    ["Configure cloud resources", "Set up cloud security", "Implement cloud deployment"])
-
-        # Add general tasks that apply to most projects
-        common_tasks = [
-            "Create database schema",
-            "Set up logging and monitoring",
-            "Implement error handling",
-            "Perform security review",
-            "Conduct performance testing",
-            "Create user documentation"
-        ]
-
-        # Combine task lists
-        all_tasks = tasks + project_tasks + common_tasks
-
-        # Generate sprint breakdown
-        sprint_breakdown = {}
-        tasks_per_sprint = len(all_tasks) // sprints
-
-        # Ensure we have enough tasks
-        while len(all_tasks) < tasks_per_sprint * sprints:
-            all_tasks.append(f"Additional optimization and refinement {len(all_tasks)}")
-
-        for i in range(1, sprints + 1):
-            start_idx = (i - 1) * tasks_per_sprint
-            end_idx = start_idx + tasks_per_sprint
-
-            if i == sprints:  # Last sprint gets any remaining tasks
-                sprint_tasks = all_tasks[start_idx:]
-            else:
-                sprint_tasks = all_tasks[start_idx:end_idx]
-
-            # Add sprint-specific tasks
-            if i == 1:
-                sprint_tasks.extend(["Initial setup", "Project planning", "Environment configuration"])
-            elif i == 2:
-                sprint_tasks.extend(["Architecture refinement", "Core component development"])
-            elif i == sprints - 1:
-                sprint_tasks.extend(["Integration testing", "Performance optimization"])
-            elif i == sprints:
-                sprint_tasks.extend(["Final testing", "Deployment preparation", "Documentation finalization"])
-
-            sprint_breakdown[f"Sprint {i}"] = sprint_tasks
-
-        return sprint_breakdown
\ No newline at end of file
+        # Fallback to planning the sprints locally
+        return ProjectScheduler.plan_sprints(ProjectScheduler.build_sprint_tasks(project_type, technologies), sprints)
@@ -0,0 +1,225 @@
+from datetime import datetime, timedelta
+
+from modules.kpi_generation.kpi_model import KPI
+from services.mongodb_service import mongodb_service
+
+# Downsampling intervals by name, in days
+INTERVALS = {"day": 1, "week": 7, "sprint": 14, "month": 30}
+
+
+class KPIHistory:
+    """
+    Append-only time series of project KPIs in the KPIHistory collection.
+    Every KPI change is recorded as a numeric snapshot. Snapshots are bucketed per project
+    into documents of at most BUCKET_SIZE samples with their first and last timestamps, so
+    months of history are read with a single range query over a few documents.
+    """
+
+    COLLECTION = 'KPIHistory'
+    BUCKET_SIZE = 200
+
+    @staticmethod
+    def make_sample(kpis, source, timestamp=None):
+        """
+        Build a snapshot of KPIs.
+
+        Args:
+            kpis: KPI dictionary.
+            source: What changed the KPIs, e.g. "progress" or "project_change".
+            timestamp: Time of the snapshot (optional). Defaults to now.
+
+        Returns:
+            dict: Sample with 't', 'source' and numeric 'kpis' by category and name.
+        """
+        sample_kpis = {}
+        for kpi in KPI.parse_all(kpis):
+            sample_kpis.setdefault(kpi.category, {})[kpi.name] = {
+                'value': kpi.value,
+                'target': kpi.target,
+                'unit': kpi.unit,
+                'status': kpi.status
+            }
+
+        return {'t': timestamp or datetime.now(), 'source': source, 'kpis': sample_kpis}
+
+    @staticmethod
+    def build_append(project_id, sample):
+        """
+        Build the upsert appending a sample to the project's open bucket, opening a new one when full.
+
+        Args:
+            project_id: ObjectId of the project.
+            sample: Sample from make_sample.
+
+        Returns:
+            tuple: (query, update) for an upsert.
+        """
+        query = {'project_id': project_id, 'count': {'$lt': KPIHistory.BUCKET_SIZE}}
+        update = {
+            '$push': {'samples': sample},
+            '$inc': {'count': 1},
+            '$min': {'first': sample['t']},
+            '$max': {'last': sample['t']}
+        }
+
+        return query, update
+
+    @staticmethod
+    def record(project_id, kpis, source, timestamp=None):
+        """
+        Append a snapshot of a project's KPIs to its history.
+
+        Args:
+            project_id: ObjectId of the project.
+            kpis: KPI dictionary.
+            source: What changed the KPIs.
+            timestamp: Time of the snapshot (optional). Defaults to now.
+        """
+        query, update = KPIHistory.build_append(project_id, KPIHistory.make_sample(kpis, source, timestamp))
+        mongodb_service.update_one(KPIHistory.COLLECTION, query, update, upsert=True)
+
+    @staticmethod
+    def record_many(entries, source, timestamp=None):
+        """
+        Append snapshots of several projects' KPIs in one round trip.
+
+        Args:
+            entries: List of (project ObjectId, KPI dictionary) pairs, at most one per project.
+            source: What changed the KPIs.
+            timestamp: Time of the snapshots (optional). Defaults to now.
+        """
+        timestamp = timestamp or datetime.now()
+        mongodb_service.bulk_update(KPIHistory.COLLECTION, [
+            KPIHistory.build_append(project_id, KPIHistory.make_sample(kpis, source, timestamp))
+            for project_id, kpis in entries
+        ], upsert=True)
+
+    @staticmethod
+    def get_range(project_id, start=None, end=None, kpi_keys=None):
+        """
+        Get a project's KPI snapshots in a time range.
+
+        Args:
+            project_id: ObjectId of the project.
+            start: Earliest time (optional).
+            end: Latest time (optional).
+            kpi_keys: "category.name" keys of the KPIs to return (optional). Defaults to all.
+
+        Returns:
+            list: Samples in time order.
+        """
+        query = {'project_id': project_id}
+        if start:
+            query['last'] = {'$gte': start}
+        if end:
+            query['first'] = {'$lte': end}
+
+        # Only read the requested KPIs out of each sample
+        projection = {'samples.t': 1, 'samples.source': 1}
+        if kpi_keys:
+            projection.update({f'samples.kpis.{key}': 1 for key in kpi_keys})
+        else:
+            projection['samples.kpis'] = 1
+
+        buckets = mongodb_service.find_many(KPIHistory.COLLECTION, query, projection, sort=[('first', 1)])
+
+        samples = [sample for bucket in buckets for sample in bucket.get('samples', [])
+                   if (not start or sample['t'] >= start) and (not end or sample['t'] <= end)]
+        samples.sort(key=lambda sample: sample['t'])
+
+        return samples
+
+    @staticmethod
+    def get_range_many(project_ids, start=None, end=None):
+        """
+        Get the KPI snapshots of several projects in a time range with one query.
+
+        Args:
+            project_ids: ObjectIds of the projects.
+            start: Earliest time (optional).
+            end: Latest time (optional).
+
+        Returns:
+            dict: Samples in time order by project ObjectId.
+        """
+        query = {'project_id': {'$in': list(project_ids)}}
+        if start:
+            query['last'] = {'$gte': start}
+        if end:
+            query['first'] = {'$lte': end}
+
+        samples_by_project = {}
+        for bucket in mongodb_service.find_many(KPIHistory.COLLECTION, query, {'project_id': 1, 'samples': 1}):
+            samples_by_project.setdefault(bucket['project_id'], []).extend(
+                sample for sample in bucket.get('samples', [])
+                if (not start or sample['t'] >= start) and (not end or sample['t'] <= end)
+            )
+
+        for samples in samples_by_project.values():
+            samples.sort(key=lambda sample: sample['t'])
+
+        return samples_by_project
+
+    @staticmethod
+    def downsample(samples, interval, origin=None):
+        """
+        Aggregate samples into fixed time intervals, e.g. for dashboards spanning months.
+
+        Args:
+            samples: Samples in time order, as returned by get_range.
+            interval: Interval length as a name in INTERVALS or a number of days.
+            origin: Start of the first interval (optional). Defaults to midnight before the first sample.
+
+        Returns:
+            list: One point per non-empty interval with 't' (interval start), 'samples' (count)
+                  and 'kpis' by category and name, holding the mean, min and max of value and
+                  target and the last status in the interval.
+        """
+        if not samples:
+            return []
+
+        if isinstance(interval, str):
+            if interval not in INTERVALS:
+                raise ValueError(f"Unknown interval '{interval}'. Available: {', '.join(INTERVALS)}")
+            interval = INTERVALS[interval]
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        width = timedelta(days=interval)
+
+        origin = origin or samples[0]['t'].replace(hour=0, minute=0, second=0, microsecond=0)
+
+        # Group samples by interval, keeping the values of each KPI
+        intervals = {}
+        for sample in samples:
+            index = (sample['t'] - origin) // width
+            point = intervals.setdefault(index, {'samples': 0, 'kpis': {}})
+            point['samples'] += 1
+
+            for category, category_kpis in sample.get('kpis', {}).items():
+                for name, entry in category_kpis.items():
+                    values = point['kpis'].setdefault(category, {}).setdefault(
+                        name, {'value': [], 'target': [], 'status': None, 'unit': ''}
+                    )
+                    for field in ('value', 'target'):
+                        if entry.get(field) is not None:
+                            values[field].append(entry[field])
+                    values['status'] = entry.get('status', values['status'])
+                    values['unit'] = entry.get('unit', values['unit'])
+
+        points = []
+        for index in sorted(intervals):
+            point = intervals[index]
+            kpis = {}
+            for category, category_kpis in point['kpis'].items():
+                for name, values in category_kpis.items():
+                    aggregate = {'unit': values['unit'], 'status': values['status']}
+                    for field in ('value', 'target'):
+                        numbers = values[field]
+                        aggregate[field] = sum(numbers) / len(numbers) if numbers else None
+                        aggregate[f'{field}_min'] = min(numbers) if numbers else None
+                        aggregate[f'{field}_max'] = max(numbers) if numbers else None
+                    kpis.setdefault(category, {})[name] = aggregate
+
+            points.append({'t': origin + index * width, 'samples': point['samples'], 'kpis': kpis})
+
+        return points
@@ -0,0 +1,235 @@
+import re
+
+
+class KPI:
+    """
+    Typed representation of one KPI.
+    KPIs are stored and returned as text such as "12 story points per sprint" or "85%";
+    they are parsed once into numeric value and target fields with a shared unit and
+    direction, computed on numerically, and formatted back to text at the API edge.
+    """
+
+    __slots__ = ("category", "name", "value", "target", "unit", "direction", "status", "extra", "_source")
+
+    # KPIs where a lower value is better; every other KPI is higher-is-better
+    LOWER_IS_BETTER = {
+        "cycle_time", "lead_time", "defect_density", "code_churn", "rework_ratio",
+        "code_review_turnaround_time", "average_cyclomatic_complexity", "kpi_adjustment_responsiveness"
+    }
+
+    # Score of each status, e.g. for charts
+    STATUS_SCORES = {"On Track": 1.0, "At Risk": 0.6, "Below Target": 0.3}
+    UNKNOWN_STATUS_SCORE = 0.5
+
+    # Leading number (optionally with thousands separators) followed by the unit
+    MEASURE_PATTERN = re.compile(r"^\s*([-+]?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?)(?![\d,])\s*(.*?)\s*$")
+
+    def __init__(self, category, name, value=None, target=None, unit="", direction=None, status=None, extra=None):
+        """
+        Initialize a KPI.
+
+        Args:
+            category: KPI category, e.g. "productivity".
+            name: KPI name, e.g. "velocity".
+            value: Current numeric value, or None if unknown.
+            target: Numeric target, or None if unknown.
+            unit: Unit shared by value and target, e.g. "%" or "story points per sprint".
+            direction: "higher" or "lower" is better. Defaults by KPI name.
+            status: Status text, e.g. "On Track".
+            extra: Other fields of the KPI, passed through unchanged.
+        """
+        self.category = category
+        self.name = name
+        self.value = value
+        self.target = target
+        self.unit = unit
+        self.direction = direction or ("lower" if name in KPI.LOWER_IS_BETTER else "higher")
+        self.status = status
+        self.extra = extra or {}
+        self._source = {}
+
+    @staticmethod
+    def parse_measure(measure):
+        """
+        Parse a KPI value or target.
+
+        Args:
+            measure: Text such as "12 story points per sprint", "85%" or "15", or a number.
+
+        Returns:
+            tuple: (number or None if not numeric, unit)
+        """
+        if measure is None or isinstance(measure, bool):
+            return None, ""
+        if isinstance(measure, (int, float)):
+            return float(measure), ""
+
+        match = KPI.MEASURE_PATTERN.match(str(measure))
+        if not match:
+            return None, str(measure).strip()
+
+        return float(match.group(1).replace(",", "")), match.group(2)
+
+    @staticmethod
+    def format_measure(number, unit):
+        """
+        Format a number and unit as KPI text.
+
+        Args:
+            number: Numeric value.
+            unit: Unit, e.g. "%" or "hours".
+
+        Returns:
+            str: Text such as "12.0 story points per sprint" or "85.0%".
+        """
+        if unit == "%":
+            return f"{number:.1f}%"
+
+        return f"{number:.1f} {unit}" if unit else f"{number:.1f}"
+
+    @classmethod
+    def from_dict(cls, category, name, data):
+        """
+        Parse a stored KPI.
+
+        Args:
+            category: KPI category.
+            name: KPI name.
+            data: Dictionary with 'value', 'target' and 'status' (and optionally other fields).
+
+        Returns:
+            KPI: Parsed KPI.
+        """
+        value, value_unit = KPI.parse_measure(data.get("value"))
+        target, target_unit = KPI.parse_measure(data.get("target"))
+
+        kpi = cls(category, name, value=value, target=target, unit=target_unit or value_unit,
+                  status=data.get("status"),
+                  extra={key: item for key, item in data.items() if key not in ("value", "target", "status")})
+
+        # Unchanged fields are returned exactly as they were given
+        kpi._source = {field: (number, data[field]) for field, number in (("value", value), ("target", target))
+                       if field in data}
+
+        return kpi
+
+    def _format_field(self, field):
+        """Format the value or target, keeping the original text if the number didn't change."""
+        number = getattr(self, field)
+        parsed, original = self._source.get(field, (None, None))
+
+        if field in self._source and parsed == number:
+            return original
+        if number is None:
+            return None
+
+        return KPI.format_measure(number, self.unit)
+
+    def to_dict(self):
+        """
+        Format the KPI as stored and returned by the API.
+
+        Returns:
+            dict: Dictionary with 'value', 'target', 'status' and any other fields.
+        """
+        data = {field: self._format_field(field) for field in ("value", "target")
+                if field in self._source or getattr(self, field) is not None}
+        if self.status is not None:
+            data["status"] = self.status
+        data.update(self.extra)
+
+        return data
+
+    def evaluate_status(self, thresholds=None):
+        """
+        Get the status implied by the value and target.
+
+        Args:
+            thresholds: (on track, at risk) ratios of the target (optional). Defaults to
+                        (0.9, 0.7) when higher is better and (1.1, 1.3) when lower is better.
+
+        Returns:
+            str: "On Track", "At Risk" or "Below Target", or the current status if
+                 value or target is unknown.
+        """
+        if self.value is None or self.target is None:
+            return self.status
+
+        if self.higher_is_better:
+            on_track, at_risk = thresholds or (0.9, 0.7)
+            if self.value >= self.target * on_track:
+                return "On Track"
+            return "At Risk" if self.value >= self.target * at_risk else "Below Target"
+
+        on_track, at_risk = thresholds or (1.1, 1.3)
+        if self.value <= self.target * on_track:
+            return "On Track"
+        return "At Risk" if self.value <= self.target * at_risk else "Below Target"
+
+    def take_value(self, other):
+        """
+        Take over the current value of another parse of this KPI, e.g. when targets are regenerated.
+
+        Args:
+            other: KPI whose value to keep.
+        """
+        self.value = other.value
+        if "value" in other._source:
+            self._source["value"] = other._source["value"]
+        else:
+            self._source.pop("value", None)
+
+    @property
+    def has_value(self):
+        """Whether the KPI had a value field when parsed, or has a numeric value."""
+        return "value" in self._source or self.value is not None
+
+    @property
+    def higher_is_better(self):
+        """Whether a higher value is better for this KPI."""
+        return self.direction != "lower"
+
+    @property
+    def status_score(self):
+        """Score of the KPI's status between 0 and 1."""
+        return KPI.STATUS_SCORES.get(self.status, KPI.UNKNOWN_STATUS_SCORE)
+
+    @staticmethod
+    def parse_all(kpis):
+        """
+        Parse a KPI structure of categories of KPIs.
+
+        Args:
+            kpis: Dictionary mapping categories to dictionaries of KPIs. Entries that aren't
+                  KPI categories (e.g. "_meta") are skipped.
+
+        Returns:
+            list: Parsed KPIs, in order.
+        """
+        return [KPI.from_dict(category, name, data)
+                for category, category_kpis in (kpis or {}).items()
+                if isinstance(category_kpis, dict) and not category.startswith("_")
+                for name, data in category_kpis.items()
+                if isinstance(data, dict)]
+
+    @staticmethod
+    def format_all(kpi_list, template=None):
+        """
+        Format parsed KPIs back into a KPI structure.
+
+        Args:
+            kpi_list: Parsed KPIs.
+            template: The structure they were parsed from (optional); its other entries
+                      (e.g. "_meta" or non-KPI fields) are carried over in place.
+
+        Returns:
+            dict: Dictionary mapping categories to dictionaries of KPIs.
+        """
+        formatted = {}
+        for category, category_kpis in (template or {}).items():
+            formatted[category] = dict(category_kpis) if isinstance(category_kpis, dict) else category_kpis
+
+        for kpi in kpi_list:
+            formatted.setdefault(kpi.category, {})[kpi.name] = kpi.to_dict()
+
+        return formatted
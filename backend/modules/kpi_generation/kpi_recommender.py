@@ -0,0 +1,384 @@
+import operator
+
+from modules.kpi_generation.kpi_model import KPI
+
+# Recommendation priorities, most urgent first
+PRIORITIES = ("high", "medium", "low")
+
+# Relative change of a KPI's value over its history below which it is stable
+TREND_TOLERANCE = 0.05
+
+# Comparison operators usable in rule conditions
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "in": lambda value, options: value in options
+}
+
+BAD_STATUSES = ("At Risk", "Below Target")
+
+# Recommendation rules, most specific first; for each KPI the first matching rule wins.
+# "kpi" is (category, name), (category, None) for every KPI of a category, or None for every KPI.
+# Conditions are (field, operator, operand) on the KPI's fields: status, value, target,
+# attainment (value as a share of target, inverted when lower is better; below 1 is short
+# of target), trend ("improving", "stable" or "declining") or project.<attribute>.
+# Texts are formatted with label, category, status, value and target.
+RECOMMENDATION_RULES = (
+    {
+        "id": "velocity_declining",
+        "kpi": ("productivity", "velocity"),
+        "when": (("status", "in", BAD_STATUSES), ("trend", "==", "declining")),
+        "priority": "high",
+        "title": "Reverse the decline in velocity",
+        "description": "Velocity is {status} and has been declining. Current value: {value}, Target: {target}.",
+        "action_items": [
+            "Review blockers and unplanned work raised in the last sprints",
+            "Limit work in progress and protect sprint scope"
+        ]
+    },
+    {
+        "id": "velocity_large_team",
+        "kpi": ("productivity", "velocity"),
+        "when": (("attainment", "<", 0.7), ("project.project_team_size", ">=", 8)),
+        "priority": "high",
+        "title": "Reduce coordination overhead",
+        "description": "Velocity is well short of target for a large team. Current value: {value}, Target: {target}.",
+        "action_items": [
+            "Split the team into smaller, independently deliverable streams",
+            "Make ownership of shared components explicit"
+        ]
+    },
+    {
+        "id": "cycle_time_high",
+        "kpi": ("productivity", "cycle_time"),
+        "when": (("attainment", "<", 0.8),),
+        "priority": "medium",
+        "title": "Shorten cycle time",
+        "description": "Tasks take longer than planned. Current value: {value}, Target: {target}.",
+        "action_items": [
+            "Break stories down into smaller tasks",
+            "Find where tasks wait longest, e.g. review or testing"
+        ]
+    },
+    {
+        "id": "defect_density_high",
+        "kpi": ("code_quality", "defect_density"),
+        "when": (("attainment", "<", 0.7),),
+        "priority": "high",
+        "title": "Bring defect density down",
+        "description": "Defects are well above the acceptable rate. Current value: {value}, Target: {target}.",
+        "action_items": [
+            "Add regression tests for the modules with the most defects",
+            "Hold a root cause review of recent defects"
+        ]
+    },
+    {
+        "id": "test_coverage_late",
+        "kpi": ("code_quality", "test_coverage"),
+        "when": (("attainment", "<", 0.9), ("project.completion_percentage", ">=", 70)),
+        "priority": "high",
+        "title": "Close the test coverage gap before release",
+        "description": "Test coverage is short of target late in the project. Current value: {value}, Target: {target}.",
+        "action_items": [
+            "Prioritise tests for critical paths before the remaining features",
+            "Block merges that lower coverage"
+        ]
+    },
+    {
+        "id": "test_coverage_low",
+        "kpi": ("code_quality", "test_coverage"),
+        "when": (("attainment", "<", 0.9),),
+        "priority": "medium",
+        "title": "Improve test coverage",
+        "description": "Test coverage is short of target. Current value: {value}, Target: {target}.",
+        "action_items": [
+            "Write tests alongside new features as part of the definition of done",
+            "Track coverage in continuous integration"
+        ]
+    },
+    {
+        "id": "review_turnaround_slow",
+        "kpi": ("collaboration", "code_review_turnaround_time"),
+        "when": (("attainment", "<", 0.8),),
+        "priority": "medium",
+        "title": "Speed up code reviews",
+        "description": "Code reviews take longer than planned. Current value: {value}, Target: {target}.",
+        "action_items": [
+            "Set up a review rotation",
+            "Keep pull requests small"
+        ]
+    },
+    {
+        "id": "story_completion_low",
+        "kpi": ("productivity", "story_completion_ratio"),
+        "when": (("status", "in", BAD_STATUSES),),
+        "priority": "medium",
+        "title": "Plan sprints more accurately",
+        "description": "Fewer stories are completed than planned. Current value: {value}, Target: {target}.",
+        "action_items": [
+            "Plan sprints from the team's recent velocity",
+            "Refine stories before sprint planning"
+        ]
+    },
+    {
+        "id": "below_target",
+        "kpi": None,
+        "when": (("status", "==", "Below Target"),),
+        "priority": "high",
+        "title": "Improve {label}",
+        "description": "This {category} metric is currently {status}. Current value: {value}, Target: {target}.",
+        "action_items": [
+            "Review {category} practices related to {label_lower}",
+            "Consider adjusting the target if it's unrealistic for this project"
+        ]
+    },
+    {
+        "id": "at_risk",
+        "kpi": None,
+        "when": (("status", "==", "At Risk"),),
+        "priority": "medium",
+        "title": "Improve {label}",
+        "description": "This {category} metric is currently {status}. Current value: {value}, Target: {target}.",
+        "action_items": [
+            "Review {category} practices related to {label_lower}",
+            "Consider adjusting the target if it's unrealistic for this project"
+        ]
+    },
+    {
+        "id": "declining",
+        "kpi": None,
+        "when": (("trend", "==", "declining"),),
+        "priority": "low",
+        "title": "Watch {label}",
+        "description": "This {category} metric has been declining. Current value: {value}, Target: {target}.",
+        "action_items": [
+            "Check what changed since {label_lower} started declining"
+        ]
+    },
+)
+
+
+def _compile_condition(field, op, operand):
+    """Compile a rule condition into a predicate over a KPI context."""
+    compare = OPERATORS[op]
+
+    if field.startswith("project."):
+        attribute = field[len("project."):]
+
+        def get(context):
+            return context["project"].get(attribute)
+    else:
+        def get(context):
+            return context[field]
+
+    def predicate(context):
+        value = get(context)
+        if value is None:
+            return False
+        try:
+            return compare(value, operand)
+        except TypeError:
+            return False
+
+    return predicate
+
+
+def compile_rules(rules):
+    """
+    Compile declarative rules into predicates indexed by the KPIs they apply to.
+
+    Args:
+        rules: Recommendation rules, as in RECOMMENDATION_RULES.
+
+    Returns:
+        dict: Compiled (rule, predicates) lists by (category, name), (category, None) and None.
+
+    Raises:
+        ValueError: If a rule has an unknown operator or priority.
+    """
+    index = {}
+    for rule in rules:
+        for field, op, _ in rule["when"]:
+            if op not in OPERATORS:
+                raise ValueError(f"Unknown operator '{op}' in rule '{rule['id']}'")
+        if rule["priority"] not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{rule['priority']}' in rule '{rule['id']}'")
+
+        predicates = tuple(_compile_condition(*condition) for condition in rule["when"])
+        index.setdefault(rule["kpi"], []).append((rule, predicates))
+
+    return index
+
+
+class KPIRecommender:
+    """
+    Rule-based KPI recommendations.
+    The declarative rules are compiled once into predicates indexed by KPI, so each KPI is
+    checked only against the rules that apply to it, in a single pass over a project's KPIs.
+    """
+
+    _compiled = compile_rules(RECOMMENDATION_RULES)
+
+    @staticmethod
+    def attainment(kpi):
+        """
+        Get a KPI's value as a share of its target, inverted when lower is better.
+
+        Returns:
+            float: Attainment (1 is on target, below 1 short of it), or None if unknown.
+        """
+        if kpi.value is None or kpi.target is None:
+            return None
+        if kpi.higher_is_better:
+            return kpi.value / kpi.target if kpi.target else None
+        return kpi.target / kpi.value if kpi.value else None
+
+    @staticmethod
+    def trends_from_samples(samples, tolerance=TREND_TOLERANCE):
+        """
+        Get the trend of each KPI over its history.
+
+        Args:
+            samples: KPI history samples in time order, as returned by KPIHistory.get_range.
+            tolerance: Relative change below which a KPI is stable (optional).
+
+        Returns:
+            dict: "improving", "stable" or "declining" by (category, name).
+        """
+        first = {}
+        last = {}
+        for sample in samples:
+            for category, category_kpis in sample.get("kpis", {}).items():
+                for name, entry in category_kpis.items():
+                    if entry.get("value") is not None:
+                        first.setdefault((category, name), entry["value"])
+                        last[(category, name)] = entry["value"]
+
+        trends = {}
+        for key, start in first.items():
+            change = (last[key] - start) / abs(start) if start else 0.0
+            if key[1] in KPI.LOWER_IS_BETTER:
+                change = -change
+
+            if change > tolerance:
+                trends[key] = "improving"
+            elif change < -tolerance:
+                trends[key] = "declining"
+            else:
+                trends[key] = "stable"
+
+        return trends
+
+    @staticmethod
+    def project_attributes(project_details, aggregates=None):
+        """
+        Get the project attributes rule conditions can use.
+
+        Args:
+            project_details: The project details the KPIs were generated from.
+            aggregates: The project's running KPI aggregates (optional), for completion_percentage.
+
+        Returns:
+            dict: Project attributes with numeric parameters as numbers.
+        """
+        project = dict(project_details or {})
+        for key in ('project_team_size', 'project_timeline', 'project_sprints'):
+            try:
+                project[key] = int(project[key])
+            except (KeyError, TypeError, ValueError):
+                project.pop(key, None)
+
+        if aggregates and aggregates.get('completion_percentage') is not None:
+            project['completion_percentage'] = aggregates['completion_percentage']
+
+        return project
+
+    @staticmethod
+    def _match(kpi, context):
+        """Get the first rule matching a KPI, from the most specific rules to the generic ones."""
+        compiled = KPIRecommender._compiled
+        for key in ((kpi.category, kpi.name), (kpi.category, None), None):
+            for rule, predicates in compiled.get(key, ()):
+                if all(predicate(context) for predicate in predicates):
+                    return rule
+        return None
+
+    @staticmethod
+    def recommend(kpis, trends=None, project=None):
+        """
+        Get prioritised recommendations for a project's KPIs.
+
+        Args:
+            kpis: The project's KPI dictionary.
+            trends: Trend of each KPI by (category, name) (optional), e.g. from trends_from_samples.
+            project: Project attributes for rule conditions (optional), e.g. project details
+                     and completion_percentage.
+
+        Returns:
+            list: Recommendations, most urgent first, with title, description, actionItems,
+                  priority, category, kpi and rule.
+        """
+        trends = trends or {}
+        project = project or {}
+
+        matches = []
+        for kpi in KPI.parse_all(kpis):
+            attainment = KPIRecommender.attainment(kpi)
+            context = {
+                "status": kpi.status,
+                "value": kpi.value,
+                "target": kpi.target,
+                "attainment": attainment,
+                "trend": trends.get((kpi.category, kpi.name)),
+                "project": project
+            }
+
+            rule = KPIRecommender._match(kpi, context)
+            if rule is not None:
+                matches.append((PRIORITIES.index(rule["priority"]),
+                                attainment if attainment is not None else 1.0, kpi, rule))
+
+        # Most urgent first, and within a priority the furthest from target
+        matches.sort(key=lambda match: (match[0], match[1]))
+
+        recommendations = []
+        for _, _, kpi, rule in matches:
+            kpi_data = kpi.to_dict()
+            label = kpi.name.replace('_', ' ')
+            fields = {
+                "label": label.title(),
+                "label_lower": label,
+                "category": kpi.category,
+                "status": (kpi.status or "unknown").lower(),
+                "value": kpi_data.get('value'),
+                "target": kpi_data.get('target')
+            }
+
+            recommendations.append({
+                'title': rule["title"].format(**fields),
+                'description': rule["description"].format(**fields),
+                'actionItems': [item.format(**fields) for item in rule["action_items"]],
+                'priority': rule["priority"],
+                'category': kpi.category,
+                'kpi': kpi.name,
+                'rule': rule["id"]
+            })
+
+        return recommendations
+
+    @staticmethod
+    def recommend_many(projects):
+        """
+        Get recommendations for several projects.
+
+        Args:
+            projects: List of (KPI dictionary, trends or None, project attributes or None), one per project.
+
+        Returns:
+            list: Recommendations of each project, as from recommend.
+        """
+        return [KPIRecommender.recommend(kpis, trends, project) for kpis, trends, project in projects]
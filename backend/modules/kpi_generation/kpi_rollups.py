@@ -0,0 +1,228 @@
+from datetime import datetime
+
+from modules.kpi_generation.kpi_model import KPI
+from services.mongodb_service import mongodb_service
+
+# Status key for KPIs without a status
+UNKNOWN_STATUS = "Unknown"
+
+
+class KPIRollups:
+    """
+    Portfolio-wide KPI rollups, materialised in the KPIRollups collection.
+    A single document holds per-status and per-category counts and the numeric sums of
+    every KPI across projects. Every write of project KPIs applies the difference between
+    the old and new KPIs as one $inc, so the portfolio view is a single small read.
+    """
+
+    COLLECTION = 'KPIRollups'
+    PORTFOLIO_ID = 'portfolio'
+
+    @staticmethod
+    def _increments(kpis, sign, increments=None):
+        """
+        Get the counter increments contributed by KPIs.
+
+        Args:
+            kpis: KPI dictionary (may hold only some KPIs).
+            sign: 1 to add the KPIs, -1 to remove them.
+            increments: Dictionary of increments by field path to add to (optional).
+
+        Returns:
+            dict: Increments by field path.
+        """
+        increments = {} if increments is None else increments
+
+        def add(path, amount):
+            increments[path] = increments.get(path, 0) + amount
+
+        for kpi in KPI.parse_all(kpis or {}):
+            status = kpi.status or UNKNOWN_STATUS
+            prefix = f'categories.{kpi.category}'
+            kpi_prefix = f'{prefix}.kpis.{kpi.name}'
+
+            add(f'statuses.{status}', sign)
+            add(f'{prefix}.count', sign)
+            add(f'{prefix}.statuses.{status}', sign)
+            add(f'{kpi_prefix}.count', sign)
+            add(f'{kpi_prefix}.statuses.{status}', sign)
+
+            for field in ('value', 'target'):
+                number = getattr(kpi, field)
+                if number is not None:
+                    add(f'{kpi_prefix}.{field}_sum', sign * number)
+                    add(f'{kpi_prefix}.{field}_count', sign)
+
+        return increments
+
+    @staticmethod
+    def build_update(changes):
+        """
+        Build the update applying changes of project KPIs to the rollups.
+
+        Args:
+            changes: List of (old KPIs, new KPIs) pairs, one per project. Old KPIs are None
+                     if the project's KPIs were created, new KPIs None if they were deleted;
+                     otherwise both may hold only the changed KPIs.
+
+        Returns:
+            dict: Update for the portfolio rollup document, or None if nothing changed.
+        """
+        increments = {}
+        units = {}
+        for old_kpis, new_kpis in changes:
+            KPIRollups._increments(old_kpis, -1, increments)
+            KPIRollups._increments(new_kpis, 1, increments)
+
+            if old_kpis is None:
+                increments['projects'] = increments.get('projects', 0) + 1
+            if new_kpis is None:
+                increments['projects'] = increments.get('projects', 0) - 1
+
+            for kpi in KPI.parse_all(new_kpis or {}):
+                if kpi.unit:
+                    units[f'categories.{kpi.category}.kpis.{kpi.name}.unit'] = kpi.unit
+
+        # Changes that cancel out need no write
+        increments = {path: amount for path, amount in increments.items() if amount}
+        if not increments:
+            return None
+
+        units['updated_at'] = datetime.now()
+        return {'$inc': increments, '$set': units}
+
+    @staticmethod
+    def apply_change(old_kpis, new_kpis):
+        """
+        Apply a change of a project's KPIs to the rollups.
+
+        Args:
+            old_kpis: KPIs before the change, or None if the project's KPIs were created.
+            new_kpis: KPIs after the change, or None if the project's KPIs were deleted.
+        """
+        KPIRollups.apply_changes([(old_kpis, new_kpis)])
+
+    @staticmethod
+    def apply_kpi_changes(original_kpis, changed_kpis):
+        """
+        Apply changes of some of a project's KPIs to the rollups.
+
+        Args:
+            original_kpis: The project's KPI dictionary before the change.
+            changed_kpis: Changed KPIs as {(category, name): new KPI dictionary}.
+        """
+        old_kpis = {}
+        new_kpis = {}
+        for (category, name), kpi in changed_kpis.items():
+            original = (original_kpis.get(category) or {}).get(name)
+            if isinstance(original, dict):
+                old_kpis.setdefault(category, {})[name] = original
+            new_kpis.setdefault(category, {})[name] = kpi
+
+        KPIRollups.apply_change(old_kpis, new_kpis)
+
+    @staticmethod
+    def apply_changes(changes):
+        """
+        Apply the KPI changes of several projects to the rollups in one write.
+
+        Args:
+            changes: List of (old KPIs, new KPIs) pairs, as for build_update.
+        """
+        update = KPIRollups.build_update(changes)
+        if update:
+            mongodb_service.update_one(KPIRollups.COLLECTION, {'_id': KPIRollups.PORTFOLIO_ID}, update, upsert=True)
+
+    @staticmethod
+    def build(kpi_sets):
+        """
+        Compute the rollups of a set of projects from scratch.
+
+        Args:
+            kpi_sets: KPI dictionaries, one per project.
+
+        Returns:
+            dict: Rollup document fields.
+        """
+        rollup = {'projects': 0, 'statuses': {}, 'categories': {}}
+        increments = {}
+        for kpis in kpi_sets:
+            rollup['projects'] += 1
+            KPIRollups._increments(kpis, 1, increments)
+
+        # Expand the field paths into the nested document
+        for path, amount in increments.items():
+            *parents, field = path.split('.')
+            node = rollup
+            for parent in parents:
+                node = node.setdefault(parent, {})
+            node[field] = amount
+
+        for kpis in kpi_sets:
+            for kpi in KPI.parse_all(kpis or {}):
+                if kpi.unit:
+                    rollup['categories'][kpi.category]['kpis'][kpi.name]['unit'] = kpi.unit
+
+        rollup['updated_at'] = datetime.now()
+        return rollup
+
+    @staticmethod
+    def rebuild():
+        """
+        Recompute the rollups from every project's KPIs, e.g. after KPIs were written directly.
+
+        Returns:
+            dict: The rollup document fields.
+        """
+        kpi_docs = mongodb_service.find_many('ProjectKPIs', {}, {'kpis': 1})
+        rollup = KPIRollups.build([kpi_doc.get('kpis') for kpi_doc in kpi_docs])
+
+        mongodb_service.update_one(KPIRollups.COLLECTION, {'_id': KPIRollups.PORTFOLIO_ID}, {'$set': rollup},
+                                   upsert=True)
+        return rollup
+
+    @staticmethod
+    def get_portfolio():
+        """
+        Get the portfolio rollups with mean values and targets.
+
+        Returns:
+            dict: Number of projects, status counts, and per category the KPI count, status
+                  counts and, per KPI, its count, status counts, unit and the mean value and target.
+        """
+        rollup = mongodb_service.find_one(KPIRollups.COLLECTION, {'_id': KPIRollups.PORTFOLIO_ID})
+        if rollup is None:
+            rollup = KPIRollups.rebuild()
+
+        def counts(statuses):
+            return {status: count for status, count in (statuses or {}).items() if count}
+
+        categories = {}
+        for category, entry in rollup.get('categories', {}).items():
+            if not entry.get('count'):
+                continue
+
+            kpis = {}
+            for name, kpi in entry.get('kpis', {}).items():
+                if not kpi.get('count'):
+                    continue
+                kpis[name] = {
+                    'count': kpi['count'],
+                    'statuses': counts(kpi.get('statuses')),
+                    'unit': kpi.get('unit', ''),
+                    'value_mean': (kpi['value_sum'] / kpi['value_count']) if kpi.get('value_count') else None,
+                    'target_mean': (kpi['target_sum'] / kpi['target_count']) if kpi.get('target_count') else None
+                }
+
+            categories[category] = {
+                'count': entry['count'],
+                'statuses': counts(entry.get('statuses')),
+                'kpis': kpis
+            }
+
+        return {
+            'projects': rollup.get('projects', 0),
+            'statuses': counts(rollup.get('statuses')),
+            'categories': categories,
+            'updated_at': rollup.get('updated_at')
+        }
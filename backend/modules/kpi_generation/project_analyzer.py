@@ -1,7 +1,369 @@
+from functools import lru_cache
+
+from utils.keyword_classifier import KeywordClassifier
+
+# Default KPI category weights for all project types
+DEFAULT_TYPE_WEIGHTS = {
+    "productivity": 0.25,
+    "code_quality": 0.25,
+    "collaboration": 0.25,
+    "adaptability": 0.25
+}
+
+# KPI category weights by project type, checked in order against keywords in the project type
+PROJECT_TYPE_PROFILES = (
+    # Web Development: Higher emphasis on front-end quality and user experience
+    (("web", "website"), {
+        "productivity": 0.2,
+        "code_quality": 0.3,
+        "collaboration": 0.3,
+        "adaptability": 0.2,
+        "primary_focus": "user_experience",
+        "complexity_level": "medium",
+        "deployment_frequency": "high",
+        "quality_expectations": {
+            "ui_consistency": "high",
+            "response_time": "low",
+            "browser_compatibility": "high"
+        }
+    }),
+    # Mobile Development: Higher emphasis on code quality and performance
+    (("mobile", "app"), {
+        "productivity": 0.2,
+        "code_quality": 0.4,
+        "collaboration": 0.2,
+        "adaptability": 0.2,
+        "primary_focus": "performance",
+        "complexity_level": "high",
+        "deployment_frequency": "medium",
+        "quality_expectations": {
+            "battery_efficiency": "high",
+            "offline_functionality": "medium",
+            "ui_responsiveness": "high"
+        }
+    }),
+    # Data Science: Higher emphasis on adaptability and collaboration
+    (("data", "analytics", "machine learning"), {
+        "productivity": 0.2,
+        "code_quality": 0.2,
+        "collaboration": 0.3,
+        "adaptability": 0.3,
+        "primary_focus": "accuracy",
+        "complexity_level": "very_high",
+        "deployment_frequency": "low",
+        "quality_expectations": {
+            "model_accuracy": "high",
+            "data_quality": "high",
+            "reproducibility": "high"
+        }
+    }),
+    # Enterprise Solutions: Higher emphasis on productivity and code quality
+    (("enterprise", "business"), {
+        "productivity": 0.3,
+        "code_quality": 0.3,
+        "collaboration": 0.2,
+        "adaptability": 0.2,
+        "primary_focus": "reliability",
+        "complexity_level": "high",
+        "deployment_frequency": "low",
+        "quality_expectations": {
+            "system_uptime": "very_high",
+            "data_integrity": "very_high",
+            "security": "very_high"
+        }
+    }),
+    # DevOps/CI-CD: Emphasis on automation and rapid deployment
+    (("devops", "ci", "cd"), {
+        "productivity": 0.3,
+        "code_quality": 0.2,
+        "collaboration": 0.3,
+        "adaptability": 0.2,
+        "primary_focus": "automation",
+        "complexity_level": "medium",
+        "deployment_frequency": "very_high",
+        "quality_expectations": {
+            "deployment_success_rate": "high",
+            "system_monitoring": "high",
+            "rollback_capability": "high"
+        }
+    })
+)
+
+# Sprint duration in days (industry standard is 2 weeks)
+SPRINT_DURATION = 14
+
+# Assume 6 productive hours per day per developer
+PRODUCTIVE_HOURS_PER_DAY = 6
+
+# Industry benchmark: Junior: 5-8 points, Mid: 8-13 points, Senior: 13-20 points per sprint
+POINTS_PER_DEVELOPER_BY_LEVEL = {
+    "junior": 6.5,
+    "mid": 10.5,
+    "senior": 16.5
+}
+
+# Timeline assumptions by maximum team size (None = any size):
+# small teams are more senior, deploy faster and are more predictable; larger teams have
+# more junior developers, coordination overhead and longer approval processes
+TIMELINE_TEAM_TIERS = (
+    (3, {"team_composition": {"junior": 0.1, "mid": 0.3, "senior": 0.6},
+         "complexity_factor": 1.0, "lead_time": 1, "story_completion_target": 90}),
+    (6, {"team_composition": {"junior": 0.2, "mid": 0.5, "senior": 0.3},
+         "complexity_factor": 0.9, "lead_time": 2, "story_completion_target": 85}),
+    (10, {"team_composition": {"junior": 0.3, "mid": 0.5, "senior": 0.2},
+          "complexity_factor": 0.8, "lead_time": 3, "story_completion_target": 80}),
+    (None, {"team_composition": {"junior": 0.3, "mid": 0.5, "senior": 0.2},
+            "complexity_factor": 0.7, "lead_time": 3, "story_completion_target": 80})
+)
+
+# Technology keywords by category
+TECH_KEYWORDS = {
+    "frontend": ["html", "css", "javascript", "react", "angular", "vue", "jquery", "bootstrap",
+                 "typescript", "sass", "less", "webpack", "gatsby", "nextjs", "nuxt"],
+    "backend": ["python", "java", "node", "express", "django", "spring", "php", "ruby", "rails",
+                "asp.net", "flask", "fastapi", "laravel", "golang", "rust", "c#"],
+    "database": ["sql", "mysql", "postgresql", "mongodb", "firebase", "oracle", "nosql", "redis",
+                 "sqlite", "dynamodb", "cassandra", "couchdb", "neo4j", "graphql"],
+    "mobile": ["android", "ios", "swift", "kotlin", "react native", "flutter", "xamarin",
+               "objective-c", "capacitor", "ionic", "cordova"],
+    "devops": ["docker", "kubernetes", "aws", "azure", "gcp", "jenkins", "gitlab", "github", "ci/cd",
+               "terraform", "ansible", "puppet", "chef", "prometheus", "grafana"],
+    "testing": ["selenium", "jest", "junit", "pytest", "mocha", "jasmine", "cypress", "testng",
+                "espresso", "appium", "cucumber", "specflow", "postman", "soapui"],
+    "data_science": ["tensorflow", "pytorch", "scikit-learn", "pandas", "numpy", "r", "matplotlib",
+                     "tableau", "power bi", "jupyter", "keras", "hadoop", "spark", "airflow"],
+    "cloud": ["aws", "azure", "gcp", "lambda", "s3", "ec2", "cloudfront", "route53", "cloudwatch",
+              "firebase", "heroku", "netlify", "vercel", "digitalocean"]
+}
+
+# Backend typically requires higher test coverage, data science often has lower test
+# coverage, and projects with dedicated testing tech have higher coverage
+TEST_COVERAGE_ADJUSTMENTS = {"backend": 10, "data_science": -10, "testing": 15}
+
+# Code complexity targets: frontend typically lower, data science can handle higher (last match wins)
+COMPLEXITY_TARGETS = (("frontend", 12), ("data_science", 18))
+
+# Defect density targets (defects per 1000 LOC): better testing leads to lower targets,
+# mobile often has higher defect tolerance (last match wins)
+DEFECT_DENSITY_TARGETS = (("testing", 0.8), ("mobile", 1.2))
+
+# Preferred KPIs by technology category
+PREFERRED_KPIS_BY_CATEGORY = {
+    "frontend": ["UI Test Coverage", "Accessibility Compliance", "Page Load Time"],
+    "backend": ["API Response Time", "Server Error Rate", "Endpoint Test Coverage"],
+    "database": ["Query Performance", "Database Migration Success Rate", "Data Integrity"],
+    "mobile": ["App Crash Rate", "Battery Usage", "App Launch Time"],
+    "devops": ["Deployment Frequency", "Mean Time to Recovery", "Change Failure Rate"],
+    "testing": ["Test Coverage", "Defect Density", "Test Automation Percentage"],
+    "data_science": ["Model Accuracy", "Feature Importance Analysis", "Data Quality Score"],
+    "cloud": ["Infrastructure Cost", "Service Availability", "Scaling Response Time"]
+}
+
+# Team structure by maximum team size (None = any size). Review time is in hours;
+# merge conflict rate is the share of merges with conflicts, peer review effectiveness
+# the share of issues caught in review
+TEAM_TYPE_TIERS = (
+    (3, {"team_type": "small",
+         "roles": ["Tech Lead", "Full-stack Developer", "Frontend/Backend Developer"],
+         "communication_overhead": "low", "coordination_complexity": "low", "review_process": "peer",
+         "expected_review_time": 4, "expected_merge_conflict_rate": 0.05,
+         "expected_peer_review_effectiveness": 0.85}),
+    (6, {"team_type": "medium",
+         "roles": ["Project Manager", "Tech Lead", "Frontend Developer",
+                   "Backend Developer", "QA Engineer", "DevOps Engineer"],
+         "communication_overhead": "medium", "coordination_complexity": "medium", "review_process": "structured",
+         "expected_review_time": 8, "expected_merge_conflict_rate": 0.10,
+         "expected_peer_review_effectiveness": 0.80}),
+    (None, {"team_type": "large",
+            "roles": ["Project Manager", "Tech Lead", "Frontend Developer",
+                      "Backend Developer", "QA Engineer", "DevOps Engineer",
+                      "UI/UX Designer", "Database Administrator"],
+            "communication_overhead": "high", "coordination_complexity": "high", "review_process": "formal",
+            "expected_review_time": 16, "expected_merge_conflict_rate": 0.15,
+            "expected_peer_review_effectiveness": 0.75})
+)
+
+# Developer roles added in turn to large teams until the roles match the team size
+ADDITIONAL_ROLES = ["Frontend Developer", "Backend Developer", "Full-stack Developer"]
+
+# Baseline complexity and requirements by project type, checked in order against the project type
+REQUIREMENT_PROFILES = (
+    ("web", {"base_complexity": "medium", "risk_profile": "low",
+             "security_requirements": "medium", "performance_requirements": "medium"}),
+    ("mobile", {"base_complexity": "high", "risk_profile": "medium",
+                "security_requirements": "high", "performance_requirements": "high"}),
+    ("data", {"base_complexity": "high", "risk_profile": "medium",
+              "security_requirements": "high", "performance_requirements": "medium"}),
+    ("enterprise", {"base_complexity": "very high", "risk_profile": "high",
+                    "security_requirements": "very high", "performance_requirements": "high"})
+)
+DEFAULT_REQUIREMENT_PROFILE = {"base_complexity": "medium", "risk_profile": "medium",
+                               "security_requirements": "medium", "performance_requirements": "medium"}
+
+# Time pressure for timelines shorter than a number of days (None = any length):
+# shorter timelines often mean reduced scope, longer timelines expanded scope
+TIME_PRESSURE_TIERS = (
+    (30, ("high", "reduced")),
+    (90, ("medium", "normal")),
+    (None, ("low", "expanded"))
+)
+
+# Defect rate factors (simplified formula)
+COMPLEXITY_DEFECT_FACTORS = {"low": 0.5, "medium": 1.0, "high": 1.5, "very high": 2.0}
+PRESSURE_DEFECT_FACTORS = {"low": 0.8, "medium": 1.0, "high": 1.3}
+
+tech_category_classifier = KeywordClassifier(TECH_KEYWORDS)
+
+
+def _copy_result(value):
+    """Copy a cached analysis, so callers can modify their result without affecting the cache."""
+    if isinstance(value, dict):
+        return {key: _copy_result(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_result(item) for item in value]
+    return value
+
+
+def _tier(tiers, size):
+    """Get the entry of the first tier whose maximum size is at least size."""
+    return next(entry for limit, entry in tiers if limit is None or size <= limit)
+
+
+@lru_cache(maxsize=256)
+def _project_type_analysis(project_type_lower):
+    """Analyze a lowercased project type."""
+    for keywords, profile in PROJECT_TYPE_PROFILES:
+        if any(keyword in project_type_lower for keyword in keywords):
+            return profile
+
+    return DEFAULT_TYPE_WEIGHTS
+
+
+@lru_cache(maxsize=1024)
+def _timeline_analysis(timeline_days, team_size):
+    """Analyze a project timeline for a team size."""
+    tier = _tier(TIMELINE_TEAM_TIERS, team_size)
+    sprints = max(1, int(timeline_days / SPRINT_DURATION))
+
+    # Calculate weighted average points per developer, adjusted for coordination overhead
+    points_per_developer = sum(
+        POINTS_PER_DEVELOPER_BY_LEVEL[level] * ratio
+        for level, ratio in tier["team_composition"].items()
+    )
+    adjusted_points_per_developer = points_per_developer * tier["complexity_factor"]
+
+    # Calculate expected velocity per sprint and total story points for the project
+    expected_velocity = round(team_size * adjusted_points_per_developer)
+    total_story_points = expected_velocity * sprints
+
+    # Calculate expected cycle time (hours per story point)
+    total_productive_hours = team_size * PRODUCTIVE_HOURS_PER_DAY * timeline_days
+
+    return {
+        "sprints": sprints,
+        "sprint_duration": SPRINT_DURATION,
+        "expected_velocity": expected_velocity,
+        "total_story_points": total_story_points,
+        "burn_rate": total_story_points / timeline_days,
+        "expected_cycle_time": total_productive_hours / total_story_points,
+        "expected_lead_time": tier["lead_time"],
+        "story_completion_target": tier["story_completion_target"],
+        "team_composition": tier["team_composition"],
+        "complexity_factor": tier["complexity_factor"]
+    }
+
+
+@lru_cache(maxsize=1024)
+def _technology_analysis(tech_list):
+    """Analyze a tuple of technologies."""
+    identified_techs = {category: [] for category in TECH_KEYWORDS}
+    for tech, categories in zip(tech_list, tech_category_classifier.classify_many(tech_list)):
+        for category in categories:
+            identified_techs[category].append(tech)
+
+    tech_categories = {category: bool(techs) for category, techs in identified_techs.items()}
+    present = {category for category, found in tech_categories.items() if found}
+
+    # Determine test coverage expectations, capped at reasonable limits
+    test_coverage_target = 70 + sum(adjustment for category, adjustment in TEST_COVERAGE_ADJUSTMENTS.items()
+                                    if category in present)
+    test_coverage_target = max(60, min(test_coverage_target, 95))
+
+    complexity_target = 15
+    for category, target in COMPLEXITY_TARGETS:
+        if category in present:
+            complexity_target = target
+
+    defect_density_target = 1.0
+    for category, target in DEFECT_DENSITY_TARGETS:
+        if category in present:
+            defect_density_target = target
+
+    # Determine technology complexity level
+    if len(present) <= 2:
+        stack_complexity = "Low"
+    elif len(present) <= 4:
+        stack_complexity = "Medium"
+    else:
+        stack_complexity = "High"
+
+    return {
+        "tech_categories": tech_categories,
+        "identified_technologies": identified_techs,
+        "preferred_kpis": [kpi for category, kpis in PREFERRED_KPIS_BY_CATEGORY.items()
+                           if category in present for kpi in kpis],
+        "stack_complexity": stack_complexity,
+        "test_coverage_target": test_coverage_target,
+        "complexity_target": complexity_target,
+        "defect_density_target": defect_density_target
+    }
+
+
+@lru_cache(maxsize=256)
+def _team_composition_analysis(team_size):
+    """Analyze the composition of a team size."""
+    analysis = dict(_tier(TEAM_TYPE_TIERS, team_size))
+
+    if analysis["team_type"] == "large":
+        # Add appropriate number of developers to reach team_size
+        roles = list(analysis["roles"])
+        while len(roles) < team_size:
+            roles.append(ADDITIONAL_ROLES[len(roles) % len(ADDITIONAL_ROLES)])
+        analysis["roles"] = roles
+
+    return analysis
+
+
+@lru_cache(maxsize=1024)
+def _requirements_analysis(project_type_lower, timeline_days):
+    """Analyze the requirements of a lowercased project type and timeline."""
+    profile = next((profile for keyword, profile in REQUIREMENT_PROFILES if keyword in project_type_lower),
+                   DEFAULT_REQUIREMENT_PROFILE)
+    time_pressure, complexity_adjustment = next(
+        entry for limit, entry in TIME_PRESSURE_TIERS if limit is None or timeline_days < limit
+    )
+    base_complexity = profile["base_complexity"]
+
+    # Calculate expected defect rates (defects per 1000 LOC) based on complexity and time pressure
+    if base_complexity == "low" and time_pressure == "low":
+        expected_defect_rate = 0.7
+    elif base_complexity == "very high" and time_pressure == "high":
+        expected_defect_rate = 2.0
+    else:
+        expected_defect_rate = 1.0 * COMPLEXITY_DEFECT_FACTORS.get(base_complexity, 1.0) * \
+                               PRESSURE_DEFECT_FACTORS.get(time_pressure, 1.0)
+        expected_defect_rate = round(expected_defect_rate * 10) / 10  # Round to 1 decimal place
+
+    return dict(profile, time_pressure=time_pressure, complexity_adjustment=complexity_adjustment,
+                expected_defect_rate=expected_defect_rate)
+
+
 class ProjectAnalyzer:
     """
     Enhanced class for analyzing project details to inform KPI generation.
     Provides deeper analysis of project parameters for more accurate KPI targets.
+    The analyses are pure functions of their inputs over module-level tables, so results
+    are cached by normalised input and each caller gets its own copy.
     """
 
     @staticmethod
@@ -15,106 +377,10 @@ class ProjectAnalyzer:
         Returns:
             dict: Relevant KPI categories and weights.
         """
-        # Default weights for all project types
-        default_weights = {
-            "productivity": 0.25,
-            "code_quality": 0.25,
-            "collaboration": 0.25,
-            "adaptability": 0.25
-        }
-
-        # Adjust weights based on project type
         if not project_type:
-            return default_weights
-
-        project_type_lower = project_type.lower()
-
-        # Web Development: Higher emphasis on front-end quality and user experience
-        if "web" in project_type_lower or "website" in project_type_lower:
-            return {
-                "productivity": 0.2,
-                "code_quality": 0.3,
-                "collaboration": 0.3,
-                "adaptability": 0.2,
-                "primary_focus": "user_experience",
-                "complexity_level": "medium",
-                "deployment_frequency": "high",
-                "quality_expectations": {
-                    "ui_consistency": "high",
-                    "response_time": "low",
-                    "browser_compatibility": "high"
-                }
-            }
-
-        # Mobile Development: Higher emphasis on code quality and performance
-        elif "mobile" in project_type_lower or "app" in project_type_lower:
-            return {
-                "productivity": 0.2,
-                "code_quality": 0.4,
-                "collaboration": 0.2,
-                "adaptability": 0.2,
-                "primary_focus": "performance",
-                "complexity_level": "high",
-                "deployment_frequency": "medium",
-                "quality_expectations": {
-                    "battery_efficiency": "high",
-                    "offline_functionality": "medium",
-                    "ui_responsiveness": "high"
-                }
-            }
-
-        # Data Science: Higher emphasis on adaptability and collaboration
-        elif "data" in project_type_lower or "analytics" in project_type_lower or "machine learning" in project_type_lower:
-            return {
-                "productivity": 0.2,
-                "code_quality": 0.2,
-                "collaboration": 0.3,
-                "adaptability": 0.3,
-                "primary_focus": "accuracy",
-                "complexity_level": "very_high",
-                "deployment_frequency": "low",
-                "quality_expectations": {
-                    "model_accuracy": "high",
-                    "data_quality": "high",
-                    "reproducibility": "high"
-                }
-            }
-
-        # Enterprise Solutions: Higher emphasis on productivity and code quality
-        elif "enterprise" in project_type_lower or "business" in project_type_lower:
-            return {
-                "productivity": 0.3,
-                "code_quality": 0.3,
-                "collaboration": 0.2,
-                "adaptability": 0.2,
-                "primary_focus": "reliability",
-                "complexity_level": "high",
-                "deployment_frequency": "low",
-                "quality_expectations": {
-                    "system_uptime": "very_high",
-                    "data_integrity": "very_high",
-                    "security": "very_high"
-                }
-            }
-
-        # DevOps/CI-CD: Emphasis on automation and rapid deployment
-        elif "devops" in project_type_lower or "ci" in project_type_lower or "cd" in project_type_lower:
-            return {
-                "productivity": 0.3,
-                "code_quality": 0.2,
-                "collaboration": 0.3,
-                "adaptability": 0.2,
-                "primary_focus": "automation",
-                "complexity_level": "medium",
-                "deployment_frequency": "very_high",
-                "quality_expectations": {
-                    "deployment_success_rate": "high",
-                    "system_monitoring": "high",
-                    "rollback_capability": "high"
-                }
-            }
-
-        return default_weights
+            return _copy_result(DEFAULT_TYPE_WEIGHTS)
+
+        return _copy_result(_project_type_analysis(project_type.lower()))
 
     @staticmethod
     def analyze_timeline(timeline_days, team_size):
@@ -131,94 +397,7 @@ class ProjectAnalyzer:
         if not timeline_days or not team_size:
             return {}
 
-        # Calculate sprint duration (industry standard is 2 weeks)
-        sprint_duration = 14  # days
-        sprints = max(1, int(timeline_days / sprint_duration))
-
-        # Calculate productivity metrics based on team size and experience level
-        # Industry benchmark: Junior: 5-8 points, Mid: 8-13 points, Senior: 13-20 points per sprint
-        points_per_developer_per_sprint_by_level = {
-            "junior": 6.5,
-            "mid": 10.5,
-            "senior": 16.5
-        }
-
-        # Assume a typical team composition based on team size
-        if team_size <= 3:
-            # Small teams often have more senior composition
-            team_composition = {"junior": 0.1, "mid": 0.3, "senior": 0.6}
-        elif team_size <= 6:
-            # Medium teams have balanced composition
-            team_composition = {"junior": 0.2, "mid": 0.5, "senior": 0.3}
-        else:
-            # Larger teams often have more junior developers
-            team_composition = {"junior": 0.3, "mid": 0.5, "senior": 0.2}
-
-        # Calculate weighted average points per developer
-        points_per_developer = sum(
-            points_per_developer_per_sprint_by_level[level] * ratio
-            for level, ratio in team_composition.items()
-        )
-
-        # Apply a complexity factor based on team size (larger teams have coordination overhead)
-        if team_size <= 3:
-            complexity_factor = 1.0  # No overhead
-        elif team_size <= 6:
-            complexity_factor = 0.9  # 10% overhead
-        elif team_size <= 10:
-            complexity_factor = 0.8  # 20% overhead
-        else:
-            complexity_factor = 0.7  # 30% overhead
-
-        # Calculate adjusted points per developer
-        adjusted_points_per_developer = points_per_developer * complexity_factor
-
-        # Calculate expected velocity per sprint
-        expected_velocity = round(team_size * adjusted_points_per_developer)
-
-        # Calculate total story points for the project
-        total_story_points = expected_velocity * sprints
-
-        # Calculate burn rate (story points per day)
-        burn_rate = total_story_points / timeline_days
-
-        # Calculate expected cycle time (hours per story point)
-        # Assume 6 productive hours per day per developer
-        hours_per_day = 6
-        total_productive_hours = team_size * hours_per_day * timeline_days
-        cycle_time = total_productive_hours / total_story_points
-
-        # Calculate lead time (time from code commit to production)
-        # Varies based on team size and assumed deployment processes
-        if team_size <= 3:
-            lead_time = 1  # Small teams often have faster deployment
-        elif team_size <= 6:
-            lead_time = 2  # Medium teams have moderate deployment time
-        else:
-            lead_time = 3  # Larger teams have longer approval processes
-
-        # Calculate story completion ratio target (realistic percentage based on industry averages)
-        # Usually ranges from 80% to 95% depending on team maturity
-        if team_size <= 3:
-            story_completion_target = 90  # Small teams can be more predictable
-        elif team_size <= 6:
-            story_completion_target = 85  # Medium teams have moderate predictability
-        else:
-            story_completion_target = 80  # Larger teams have more variability
-
-        # Return comprehensive analysis
-        return {
-            "sprints": sprints,
-            "sprint_duration": sprint_duration,
-            "expected_velocity": expected_velocity,
-            "total_story_points": total_story_points,
-            "burn_rate": burn_rate,
-            "expected_cycle_time": cycle_time,
-            "expected_lead_time": lead_time,
-            "story_completion_target": story_completion_target,
-            "team_composition": team_composition,
-            "complexity_factor": complexity_factor
-        }
+        return _copy_result(_timeline_analysis(timeline_days, team_size))
 
     @staticmethod
     def analyze_technologies(technologies):
@@ -236,132 +415,11 @@ class ProjectAnalyzer:
 
         # Convert to list if it's a comma-separated string
         if isinstance(technologies, str):
-            tech_list = [tech.strip() for tech in technologies.split(',')]
+            tech_list = tuple(tech.strip() for tech in technologies.split(','))
         else:
-            tech_list = technologies
-
-        # Initialize technology categories
-        tech_categories = {
-            "frontend": False,
-            "backend": False,
-            "database": False,
-            "mobile": False,
-            "devops": False,
-            "testing": False,
-            "data_science": False,
-            "cloud": False
-        }
-
-        # Technology keywords by category
-        tech_keywords = {
-            "frontend": ["html", "css", "javascript", "react", "angular", "vue", "jquery", "bootstrap",
-                         "typescript", "sass", "less", "webpack", "gatsby", "nextjs", "nuxt"],
-            "backend": ["python", "java", "node", "express", "django", "spring", "php", "ruby", "rails",
-                        "asp.net", "flask", "fastapi", "laravel", "golang", "rust", "c#"],
-            "database": ["sql", "mysql", "postgresql", "mongodb", "firebase", "oracle", "nosql", "redis",
-                         "sqlite", "dynamodb", "cassandra", "couchdb", "neo4j", "graphql"],
-            "mobile": ["android", "ios", "swift", "kotlin", "react native", "flutter", "xamarin",
-                       "objective-c", "capacitor", "ionic", "cordova"],
-            "devops": ["docker", "kubernetes", "aws", "azure", "gcp", "jenkins", "gitlab", "github", "ci/cd",
-                       "terraform", "ansible", "puppet", "chef", "prometheus", "grafana"],
-            "testing": ["selenium", "jest", "junit", "pytest", "mocha", "jasmine", "cypress", "testng",
-                        "espresso", "appium", "cucumber", "specflow", "postman", "soapui"],
-            "data_science": ["tensorflow", "pytorch", "scikit-learn", "pandas", "numpy", "r", "matplotlib",
-                             "tableau", "power bi", "jupyter", "keras", "hadoop", "spark", "airflow"],
-            "cloud": ["aws", "azure", "gcp", "lambda", "s3", "ec2", "cloudfront", "route53", "cloudwatch",
-                      "firebase", "heroku", "netlify", "vercel", "digitalocean"]
-        }
-
-        # Track specific technologies identified in each category
-        identified_techs = {category: [] for category in tech_categories.keys()}
-
-        # Check each technology against keywords
-        for tech in tech_list:
-            tech_lower = tech.lower()
-            for category, keywords in tech_keywords.items():
-                if any(keyword in tech_lower for keyword in keywords):
-                    tech_categories[category] = True
-                    identified_techs[category].append(tech)
+            tech_list = tuple(technologies)
 
-        # Determine test coverage expectations based on identified technologies
-        test_coverage_target = 70  # Default baseline
-
-        # Adjust based on present technology categories
-        if tech_categories["backend"]:
-            test_coverage_target += 10  # Backend typically requires higher test coverage
-
-        if tech_categories["data_science"]:
-            test_coverage_target -= 10  # Data science often has lower test coverage
-
-        if tech_categories["testing"]:
-            test_coverage_target += 15  # Projects with dedicated testing tech have higher coverage
-
-        # Cap at reasonable limits
-        test_coverage_target = max(60, min(test_coverage_target, 95))
-
-        # Determine code complexity targets
-        complexity_target = 15  # Default
-
-        if tech_categories["frontend"]:
-            complexity_target = 12  # Frontend typically has lower complexity target
-
-        if tech_categories["data_science"]:
-            complexity_target = 18  # Data science can handle higher complexity
-
-        # Determine defect density targets
-        defect_density_target = 1.0  # Default (defects per 1000 LOC)
-
-        if tech_categories["testing"]:
-            defect_density_target = 0.8  # Better testing leads to lower defect targets
-
-        if tech_categories["mobile"]:
-            defect_density_target = 1.2  # Mobile often has higher defect tolerance
-
-        # Determine preferred KPIs based on technology categories
-        preferred_kpis = []
-
-        if tech_categories["frontend"]:
-            preferred_kpis.extend(["UI Test Coverage", "Accessibility Compliance", "Page Load Time"])
-
-        if tech_categories["backend"]:
-            preferred_kpis.extend(["API Response Time", "Server Error Rate", "Endpoint Test Coverage"])
-
-        if tech_categories["database"]:
-            preferred_kpis.extend(["Query Performance", "Database Migration Success Rate", "Data Integrity"])
-
-        if tech_categories["mobile"]:
-            preferred_kpis.extend(["App Crash Rate", "Battery Usage", "App Launch Time"])
-
-        if tech_categories["devops"]:
-            preferred_kpis.extend(["Deployment Frequency", "Mean Time to Recovery", "Change Failure Rate"])
-
-        if tech_categories["testing"]:
-            preferred_kpis.extend(["Test Coverage", "Defect Density", "Test Automation Percentage"])
-
-        if tech_categories["data_science"]:
-            preferred_kpis.extend(["Model Accuracy", "Feature Importance Analysis", "Data Quality Score"])
-
-        if tech_categories["cloud"]:
-            preferred_kpis.extend(["Infrastructure Cost", "Service Availability", "Scaling Response Time"])
-
-        # Determine technology complexity level
-        num_categories = sum(1 for value in tech_categories.values() if value)
-        if num_categories <= 2:
-            stack_complexity = "Low"
-        elif num_categories <= 4:
-            stack_complexity = "Medium"
-        else:
-            stack_complexity = "High"
-
-        return {
-            "tech_categories": tech_categories,
-            "identified_technologies": identified_techs,
-            "preferred_kpis": preferred_kpis,
-            "stack_complexity": stack_complexity,
-            "test_coverage_target": test_coverage_target,
-            "complexity_target": complexity_target,
-            "defect_density_target": defect_density_target
-        }
+        return _copy_result(_technology_analysis(tech_list))
 
     @staticmethod
     def analyze_team_composition(team_size):
@@ -377,64 +435,7 @@ class ProjectAnalyzer:
         if not team_size:
             return {}
 
-        # Determine team structure based on size
-        if team_size <= 3:
-            team_type = "small"
-            roles = ["Tech Lead", "Full-stack Developer", "Frontend/Backend Developer"]
-            communication_overhead = "low"
-            coordination_complexity = "low"
-            review_process = "peer"
-        elif team_size <= 6:
-            team_type = "medium"
-            roles = ["Project Manager", "Tech Lead", "Frontend Developer",
-                     "Backend Developer", "QA Engineer", "DevOps Engineer"]
-            communication_overhead = "medium"
-            coordination_complexity = "medium"
-            review_process = "structured"
-        else:
-            team_type = "large"
-            base_roles = ["Project Manager", "Tech Lead", "Frontend Developer",
-                          "Backend Developer", "QA Engineer", "DevOps Engineer",
-                          "UI/UX Designer", "Database Administrator"]
-            # Add appropriate number of developers to reach team_size
-            additional_roles = ["Frontend Developer", "Backend Developer", "Full-stack Developer"]
-            roles = base_roles.copy()
-            while len(roles) < team_size:
-                roles.append(additional_roles[len(roles) % len(additional_roles)])
-
-            communication_overhead = "high"
-            coordination_complexity = "high"
-            review_process = "formal"
-
-        # Calculate expected code review turnaround time (hours)
-        if team_type == "small":
-            review_time = 4
-        elif team_type == "medium":
-            review_time = 8
-        else:
-            review_time = 16
-
-        # Calculate expected collaboration metrics
-        if team_type == "small":
-            merge_conflict_rate = 0.05  # 5% of merges have conflicts
-            peer_review_effectiveness = 0.85  # 85% of issues caught in review
-        elif team_type == "medium":
-            merge_conflict_rate = 0.10  # 10% of merges have conflicts
-            peer_review_effectiveness = 0.80  # 80% of issues caught in review
-        else:
-            merge_conflict_rate = 0.15  # 15% of merges have conflicts
-            peer_review_effectiveness = 0.75  # 75% of issues caught in review
-
-        return {
-            "team_type": team_type,
-            "roles": roles,
-            "communication_overhead": communication_overhead,
-            "coordination_complexity": coordination_complexity,
-            "review_process": review_process,
-            "expected_review_time": review_time,
-            "expected_merge_conflict_rate": merge_conflict_rate,
-            "expected_peer_review_effectiveness": peer_review_effectiveness
-        }
+        return _copy_result(_team_composition_analysis(team_size))
 
     @staticmethod
     def analyze_project_requirements(project_type, timeline_days):
@@ -451,66 +452,4 @@ class ProjectAnalyzer:
         if not project_type or not timeline_days:
             return {}
 
-        project_type_lower = project_type.lower()
-
-        # Determine baseline complexity by project type
-        if "web" in project_type_lower:
-            base_complexity = "medium"
-            risk_profile = "low"
-            security_requirements = "medium"
-            performance_requirements = "medium"
-        elif "mobile" in project_type_lower:
-            base_complexity = "high"
-            risk_profile = "medium"
-            security_requirements = "high"
-            performance_requirements = "high"
-        elif "data" in project_type_lower:
-            base_complexity = "high"
-            risk_profile = "medium"
-            security_requirements = "high"
-            performance_requirements = "medium"
-        elif "enterprise" in project_type_lower:
-            base_complexity = "very high"
-            risk_profile = "high"
-            security_requirements = "very high"
-            performance_requirements = "high"
-        else:
-            base_complexity = "medium"
-            risk_profile = "medium"
-            security_requirements = "medium"
-            performance_requirements = "medium"
-
-        # Adjust complexity based on timeline
-        if timeline_days < 30:
-            time_pressure = "high"
-            complexity_adjustment = "reduced"  # Shorter timelines often mean reduced scope
-        elif timeline_days < 90:
-            time_pressure = "medium"
-            complexity_adjustment = "normal"
-        else:
-            time_pressure = "low"
-            complexity_adjustment = "expanded"  # Longer timelines often mean expanded scope
-
-        # Calculate expected defect rates based on complexity and time pressure
-        if base_complexity == "low" and time_pressure == "low":
-            expected_defect_rate = 0.7  # defects per 1000 LOC
-        elif base_complexity == "very high" and time_pressure == "high":
-            expected_defect_rate = 2.0
-        else:
-            # Calculate based on factors (simplified formula)
-            complexity_factor = {"low": 0.5, "medium": 1.0, "high": 1.5, "very high": 2.0}
-            pressure_factor = {"low": 0.8, "medium": 1.0, "high": 1.3}
-
-            expected_defect_rate = 1.0 * complexity_factor.get(base_complexity, 1.0) * pressure_factor.get(
-                time_pressure, 1.0)
-            expected_defect_rate = round(expected_defect_rate * 10) / 10  # Round to 1 decimal place
-
-        return {
-            "base_complexity": base_complexity,
-            "risk_profile": risk_profile,
-            "security_requirements": security_requirements,
-            "performance_requirements": performance_requirements,
-            "time_pressure": time_pressure,
-            "complexity_adjustment": complexity_adjustment,
-            "expected_defect_rate": expected_defect_rate
-        }
\ No newline at end of file
+        return _copy_result(_requirements_analysis(project_type.lower(), timeline_days))
@@ -0,0 +1,499 @@
+import math
+import re
+
+# Leading "Day" of day strings such as "Day 12"
+DAY_PATTERN = re.compile(r"^\s*(?:Day\s+)?(-?\d+)\s*$", re.IGNORECASE)
+
+# Project types with longer requirements and design phases
+COMPLEX_PROJECT_TYPES = {"Enterprise", "Data Science"}
+
+# Project types with shorter design and continuous deployment
+INCREMENTAL_PROJECT_TYPES = {"Web Development", "Mobile Development"}
+
+# Sprint plan task templates by project type
+SPRINT_TASK_TEMPLATES = {
+    "Web Development": [
+        "Design UI mockups", "Implement responsive layout", "Create API endpoints",
+        "Add authentication", "Integrate with backend", "Implement unit tests",
+        "Set up CI/CD pipeline", "Performance optimization", "Browser compatibility testing",
+        "Implement user dashboard", "Add search functionality", "Create admin interface",
+        "Implement form validation", "Add data visualization", "Create user onboarding flow"
+    ],
+    "Mobile Development": [
+        "Design app screens", "Implement UI components", "Create API clients",
+        "Add local storage", "Implement authentication", "Add push notifications",
+        "Performance testing", "Device compatibility testing", "App store preparation",
+        "Implement offline mode", "Add user profile features", "Integrate analytics",
+        "Create tutorial screens", "Implement in-app purchases", "Optimize for battery usage"
+    ],
+    "Data Science": [
+        "Data collection", "Data cleaning", "Exploratory analysis",
+        "Feature engineering", "Model development", "Model validation",
+        "Dashboard creation", "Documentation", "Production deployment",
+        "Data pipeline automation", "A/B test design", "Statistical analysis",
+        "Model optimization", "Insights reporting", "Real-time prediction implementation"
+    ],
+    "Enterprise": [
+        "Requirements analysis", "System architecture", "Data modeling",
+        "Core functionality development", "Business logic implementation", "Integration testing",
+        "User acceptance testing", "Documentation", "Training materials",
+        "Legacy system integration", "Security compliance", "Role-based access control",
+        "Audit logging", "Reporting module", "API gateway implementation"
+    ]
+}
+
+# Technology-specific sprint plan tasks, by keywords of the technology
+TECH_SPRINT_TASKS = (
+    (("react",), ["Set up React component structure", "Configure state management", "Implement React routing"]),
+    (("angular",), ["Set up Angular modules", "Create services and dependency injection",
+                    "Implement Angular routing"]),
+    (("node", "express"), ["Set up Node.js server", "Create API routes", "Implement middleware"]),
+    (("mongodb",), ["Create MongoDB schema", "Implement database queries", "Set up indexing"]),
+    (("python",), ["Set up Python virtual environment", "Configure package dependencies", "Create utility modules"]),
+    (("docker",), ["Create Dockerfiles", "Set up container orchestration", "Configure CI/CD for containers"]),
+    (("aws", "azure", "cloud"), ["Configure cloud resources", "Set up cloud security", "Implement cloud deployment"])
+)
+
+# Sprint plan phases in order: (phase, tasks, effort per task in person-days); each phase
+# depends on the previous one. Project type and technology tasks are added to the "build" phase.
+SPRINT_PHASES = (
+    ("setup", ["Setup development environment", "Define coding standards", "Set up version control",
+               "Initial setup", "Project planning", "Environment configuration"], 1),
+    ("build", ["Create project documentation", "Architecture refinement", "Core component development",
+               "Create database schema", "Set up logging and monitoring", "Implement error handling"], 3),
+    ("hardening", ["Perform security review", "Conduct performance testing", "Integration testing",
+                   "Performance optimization"], 2),
+    ("release", ["Create user documentation", "Final testing", "Deployment preparation",
+                 "Documentation finalization"], 2)
+)
+
+# Effort of project type and technology tasks, in person-days
+TEMPLATE_TASK_EFFORT = 2
+
+
+class ScheduledTask:
+    """
+    A task of a project schedule.
+    Start and end are integer day offsets from the project start (end exclusive); they are
+    shown as "Day X" strings, day 1 being the first day of the project, only at the API edge.
+    """
+
+    __slots__ = ("name", "duration", "depends_on", "demand", "start", "end", "earliest_start", "latest_start")
+
+    def __init__(self, name, duration, depends_on=None, demand=1, start=None):
+        """
+        Initialize a task.
+
+        Args:
+            name: Task name, unique within the schedule.
+            duration: Duration in days.
+            depends_on: Names of the tasks that must finish first, or (name, lag) pairs where
+                        lag is the number of days between the two; negative lags overlap them.
+            demand: Number of team members the task needs (optional).
+            start: Start day offset, if already scheduled (optional).
+        """
+        self.name = name
+        self.duration = max(0, int(duration))
+        self.depends_on = [(dependency, 0) if isinstance(dependency, str) else (dependency[0], int(dependency[1]))
+                           for dependency in depends_on or []]
+        self.demand = max(0, int(demand))
+        self.start = start
+        self.end = None if start is None else start + self.duration
+        self.earliest_start = None
+        self.latest_start = None
+
+    @staticmethod
+    def parse_day(day):
+        """
+        Parse a day number, e.g. 12 or "Day 12".
+
+        Returns:
+            int: The day number.
+
+        Raises:
+            ValueError: If the day is not a day number.
+        """
+        if isinstance(day, int):
+            return day
+        match = DAY_PATTERN.match(str(day))
+        if not match:
+            raise ValueError(f"Invalid day '{day}'")
+        return int(match.group(1))
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create a scheduled task from Gantt chart data, with integer 'start' and 'end' day
+        offsets or "Day X" 'Start' and 'End' strings.
+
+        Raises:
+            ValueError: If the task has no valid start and end.
+        """
+        if isinstance(data.get("start"), int) and isinstance(data.get("end"), int):
+            start, end = data["start"], data["end"]
+        else:
+            start = cls.parse_day(data["Start"]) - 1
+            end = cls.parse_day(data["End"]) - 1
+
+        return cls(data["Task"], max(0, end - start), data.get("depends_on"), start=start)
+
+    @property
+    def start_day(self):
+        """Day number the task starts on, day 1 being the first day of the project."""
+        return self.start + 1
+
+    @property
+    def end_day(self):
+        """Day number the task ends on, as shown in Gantt charts."""
+        return self.end + 1
+
+    @property
+    def slack(self):
+        """Days the task can slip without delaying the project, or None if not analysed."""
+        if self.earliest_start is None or self.latest_start is None:
+            return None
+        return self.latest_start - self.earliest_start
+
+    @property
+    def critical(self):
+        """Whether the task is on the critical path."""
+        return self.slack == 0
+
+    def to_dict(self):
+        """
+        Format the task as Gantt chart data.
+
+        Returns:
+            dict: 'Task', 'Start' and 'End' ("Day X" strings) and the typed 'start', 'end',
+                  'duration', 'slack', 'critical' and 'depends_on' fields.
+        """
+        return {
+            "Task": self.name,
+            "Start": f"Day {self.start_day}",
+            "End": f"Day {self.end_day}",
+            "start": self.start,
+            "end": self.end,
+            "duration": self.duration,
+            "slack": self.slack,
+            "critical": self.critical,
+            "depends_on": [name for name, _ in self.depends_on]
+        }
+
+
+class ProjectScheduler:
+    """
+    Constraint-based project scheduling.
+    Tasks with durations, dependencies and team demands are analysed with the critical path
+    method and then levelled against the team's capacity, so project plans and timeline
+    what-if scenarios are computed locally.
+    """
+
+    @staticmethod
+    def _order(tasks):
+        """
+        Get tasks in dependency order, keeping the given order where dependencies allow.
+
+        Raises:
+            ValueError: If a dependency is unknown or the dependencies are cyclic.
+        """
+        by_name = {task.name: task for task in tasks}
+        if len(by_name) != len(tasks):
+            raise ValueError("Task names must be unique")
+
+        remaining = {}
+        dependents = {task.name: [] for task in tasks}
+        for task in tasks:
+            for name, _ in task.depends_on:
+                if name not in by_name:
+                    raise ValueError(f"Task '{task.name}' depends on unknown task '{name}'")
+                dependents[name].append(task.name)
+            remaining[task.name] = len(task.depends_on)
+
+        position = {task.name: index for index, task in enumerate(tasks)}
+        ready = [task.name for task in tasks if not task.depends_on]
+        ordered = []
+        while ready:
+            ready.sort(key=position.get)
+            name = ready.pop(0)
+            ordered.append(by_name[name])
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    ready.append(dependent)
+
+        if len(ordered) != len(tasks):
+            raise ValueError("Task dependencies are cyclic")
+
+        return ordered
+
+    @staticmethod
+    def analyse(tasks):
+        """
+        Compute the earliest and latest start of every task with the critical path method.
+
+        Args:
+            tasks: List of ScheduledTask.
+
+        Returns:
+            list: Tasks in dependency order.
+        """
+        ordered = ProjectScheduler._order(tasks)
+        by_name = {task.name: task for task in ordered}
+
+        # Forward pass: start as soon as all dependencies allow
+        for task in ordered:
+            task.earliest_start = max([0] + [by_name[name].earliest_start + by_name[name].duration + lag
+                                             for name, lag in task.depends_on])
+        makespan = max([task.earliest_start + task.duration for task in ordered] + [0])
+
+        # Backward pass: start as late as possible without delaying the project
+        for task in ordered:
+            task.latest_start = makespan - task.duration
+        for task in reversed(ordered):
+            for name, lag in task.depends_on:
+                dependency = by_name[name]
+                dependency.latest_start = min(dependency.latest_start,
+                                              task.latest_start - lag - dependency.duration)
+
+        return ordered
+
+    @staticmethod
+    def critical_path(tasks):
+        """
+        Get the names of the tasks on the critical path, in dependency order.
+
+        Args:
+            tasks: List of ScheduledTask.
+
+        Returns:
+            list: Names of the critical tasks.
+        """
+        return [task.name for task in ProjectScheduler.analyse(tasks) if task.critical]
+
+    @staticmethod
+    def schedule(tasks, capacity=None):
+        """
+        Schedule tasks as early as their dependencies and the team's capacity allow.
+        Tasks are placed in order of latest start, so critical tasks get capacity first.
+
+        Args:
+            tasks: List of ScheduledTask.
+            capacity: Number of team members available each day (optional). Defaults to unlimited.
+
+        Returns:
+            list: The tasks, scheduled, in order of start.
+
+        Raises:
+            ValueError: If a dependency is unknown or the dependencies are cyclic.
+        """
+        ordered = ProjectScheduler.analyse(tasks)
+        by_name = {task.name: task for task in ordered}
+        position = {task.name: index for index, task in enumerate(ordered)}
+
+        usage = []
+        scheduled = set()
+        pending = list(ordered)
+        while pending:
+            # Most urgent task whose dependencies are all scheduled
+            task = min((task for task in pending if all(name in scheduled for name, _ in task.depends_on)),
+                       key=lambda task: (task.latest_start, task.earliest_start, position[task.name]))
+            pending.remove(task)
+
+            start = max([0] + [by_name[name].end + lag for name, lag in task.depends_on])
+            demand = task.demand if capacity is None else min(task.demand, capacity)
+            if capacity is not None and demand:
+                # Move the task later until the team has room for it on every day
+                while any(usage[day] + demand > capacity
+                          for day in range(start, min(start + task.duration, len(usage)))):
+                    start += 1
+
+            task.start = start
+            task.end = start + task.duration
+            if len(usage) < task.end:
+                usage.extend([0] * (task.end - len(usage)))
+            for day in range(task.start, task.end):
+                usage[day] += demand
+            scheduled.add(task.name)
+
+        return sorted(ordered, key=lambda task: (task.start, position[task.name]))
+
+    @staticmethod
+    def build_project_tasks(project_type, sprints, team_size, sprint_duration):
+        """
+        Build the task network of a project: kickoff, requirements, design, development
+        sprints with overlapping testing, deployment and handover.
+
+        Args:
+            project_type: Type of project.
+            sprints: Number of sprints.
+            team_size: Size of the project team.
+            sprint_duration: Development days per sprint.
+
+        Returns:
+            list: Unscheduled tasks.
+        """
+        sprints = max(1, sprints)
+        team_size = max(1, team_size)
+        testers = max(1, team_size // 4)
+        analysts = max(1, team_size // 3)
+
+        requirements_duration = max(sprint_duration // 2 - 3, 3)
+        design_duration = max(sprint_duration // 2, 5)
+        if project_type in COMPLEX_PROJECT_TYPES:
+            requirements_duration = max(requirements_duration, 11)  # More planning for complex projects
+        if project_type in INCREMENTAL_PROJECT_TYPES:
+            design_duration = min(design_duration, 14)
+        elif project_type == "Enterprise":
+            design_duration = max(design_duration, 21)
+
+        tasks = [
+            ScheduledTask("Project Kickoff", 2, demand=team_size),
+            ScheduledTask("Requirements Gathering", requirements_duration, ["Project Kickoff"], analysts),
+            # Design starts when requirements are partly done
+            ScheduledTask("Design & Architecture", design_duration,
+                          [("Requirements Gathering", -(requirements_duration // 2))], analysts)
+        ]
+
+        # Development sprints with testing starting a third into each sprint
+        test_overlap = sprint_duration - sprint_duration // 3
+        for i in range(1, sprints + 1):
+            if i > 1:
+                dependencies = [f"Sprint {i - 1} Development"]
+            elif project_type == "Data Science":
+                dependencies = ["Requirements Gathering"]
+            else:
+                dependencies = [("Design & Architecture", -min(3, design_duration))]  # Slight overlap with design
+
+            tasks.append(ScheduledTask(f"Sprint {i} Development", sprint_duration, dependencies,
+                                       max(1, team_size - testers)))
+            tasks.append(ScheduledTask(f"Sprint {i} Testing", test_overlap + sprint_duration // 5,
+                                       [(f"Sprint {i} Development", -test_overlap)], testers))
+
+        # Web/mobile often has continuous deployment; other projects deploy more formally
+        deploy_overlap = min(sprint_duration // 2, 7 if project_type in INCREMENTAL_PROJECT_TYPES else 10)
+        deploy_duration = 3 if project_type in INCREMENTAL_PROJECT_TYPES else 5
+        tasks += [
+            ScheduledTask("Deployment Preparation", deploy_overlap + 2,
+                          [(f"Sprint {sprints} Development", -deploy_overlap)], analysts),
+            ScheduledTask("Final Deployment", deploy_duration,
+                          ["Deployment Preparation", f"Sprint {sprints} Testing"], analysts),
+            ScheduledTask("Project Handover", 3, [("Final Deployment", -1)], analysts)
+        ]
+
+        return tasks
+
+    @staticmethod
+    def plan_project(project_type, timeline, sprints, team_size):
+        """
+        Schedule a project within its timeline: sprints are as long as the timeline allows
+        once the other phases and the team's capacity are accounted for. When even one-day
+        sprints don't fit, the shortest plan is returned with the days it overruns.
+
+        Args:
+            project_type: Type of project.
+            timeline: Project timeline in days.
+            sprints: Number of sprints.
+            team_size: Size of the project team.
+
+        Returns:
+            dict: Plan with 'tasks' (scheduled tasks in order of start), 'duration' (makespan in days),
+                  'overrun_days' (days beyond the timeline, 0 if it fits) and 'fits_timeline'.
+        """
+        sprints = max(1, sprints)
+
+        def plan(sprint_duration):
+            return ProjectScheduler.schedule(
+                ProjectScheduler.build_project_tasks(project_type, sprints, team_size, sprint_duration),
+                capacity=max(1, team_size)
+            )
+
+        def makespan(tasks):
+            return max(task.end for task in tasks)
+
+        # Longest sprints that fit the timeline; the makespan grows with sprint length
+        low, high = 1, max(1, timeline // sprints)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if makespan(plan(middle)) <= timeline:
+                low = middle
+            else:
+                high = middle - 1
+
+        tasks = plan(low)
+        duration = makespan(tasks)
+
+        return {
+            "tasks": tasks,
+            "duration": duration,
+            "overrun_days": max(0, duration - timeline),
+            "fits_timeline": duration <= timeline
+        }
+
+    @staticmethod
+    def build_sprint_tasks(project_type, technologies):
+        """
+        Build the tasks of a sprint plan, with each phase depending on the previous one.
+
+        Args:
+            project_type: Type of project.
+            technologies: List (or comma-separated string) of technologies.
+
+        Returns:
+            list: Unscheduled tasks, durations being efforts in person-days.
+        """
+        if isinstance(technologies, str):
+            technologies = [tech.strip() for tech in technologies.split(',')]
+
+        build_tasks = list(SPRINT_TASK_TEMPLATES.get(project_type, SPRINT_TASK_TEMPLATES["Web Development"]))
+        for tech in technologies or []:
+            tech_lower = tech.lower()
+            for keywords, tech_tasks in TECH_SPRINT_TASKS:
+                if any(keyword in tech_lower for keyword in keywords):
+                    build_tasks.extend(tech_tasks)
+                    break
+
+        tasks = []
+        previous = []
+        for phase, phase_tasks, effort in SPRINT_PHASES:
+            names = []
+            for name in phase_tasks + (build_tasks if phase == "build" else []):
+                if name in names or any(task.name == name for task in tasks):
+                    continue
+                task_effort = TEMPLATE_TASK_EFFORT if phase == "build" and name not in phase_tasks else effort
+                tasks.append(ScheduledTask(name, task_effort, previous))
+                names.append(name)
+            previous = names
+
+        return tasks
+
+    @staticmethod
+    def plan_sprints(tasks, sprints):
+        """
+        Assign tasks to sprints in dependency order, balancing the effort of every sprint.
+        A task is never planned in an earlier sprint than a task it depends on.
+
+        Args:
+            tasks: List of ScheduledTask, durations being efforts.
+            sprints: Number of sprints.
+
+        Returns:
+            dict: Task names by "Sprint N", for every sprint.
+        """
+        sprints = max(1, sprints)
+        ordered = ProjectScheduler.analyse(tasks)
+        capacity = math.ceil(sum(task.duration for task in ordered) / sprints)
+
+        load = [0] * sprints
+        sprint_of = {}
+        for task in ordered:
+            sprint = max([0] + [sprint_of[name] for name, _ in task.depends_on])
+            while sprint < sprints - 1 and load[sprint] + task.duration > capacity:
+                sprint += 1
+            sprint_of[task.name] = sprint
+            load[sprint] += task.duration
+
+        breakdown = {f"Sprint {i}": [] for i in range(1, sprints + 1)}
+        for task in ordered:
+            breakdown[f"Sprint {sprint_of[task.name] + 1}"].append(task.name)
+
+        return breakdown
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Benchmark for pushing candidate pre-filtering down to MongoDB.
+Compares fetching the whole Resumes collection and filtering in Python with the
+filter and projection produced by CandidateQueryPlanner.
+
+Uses the MongoDB server at --uri when given, otherwise an in-memory mongomock client.
+"""
+
+import os
+import sys
+import random
+import time
+import argparse
+
+# Add parent directory to path so we can import from project modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo import ASCENDING
+
+from modules.employee_matching.candidate_ranker import CandidateRanker
+from modules.employee_matching.feature_materializer import FeatureMaterializer
+from modules.employee_matching.query_planner import CandidateQueryPlanner
+
+SKILLS = ["Python", "Java", "JavaScript", "TypeScript", "React", "Angular", "Vue.js", "Node.js",
+          "Django", "Flask", "Spring Boot", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Docker",
+          "Kubernetes", "AWS", "Azure", "GCP", "Go", "Rust", "C#", ".NET", "PHP", "Laravel",
+          "Swift", "Kotlin", "Flutter", "TensorFlow", "PyTorch", "Spark", "Terraform", "GraphQL"]
+ROLES = ["Software Engineer", "Frontend Developer", "Backend Developer", "Full Stack Developer",
+         "Mobile Developer", "Data Scientist", "DevOps Engineer", "QA Engineer"]
+
+PROJECT_CRITERIA = {
+    'languages': 'React, Node.js, PostgreSQL',
+    'field': 'Software Engineer',
+    'project_type': 'Web Development',
+    'people_count': 5
+}
+
+
+def generate_resumes(count, seed=42):
+    """Generate synthetic resumes with materialized features."""
+    rng = random.Random(seed)
+    resumes = []
+
+    for i in range(count):
+        experience = []
+        year = rng.randint(2000, 2020)
+        for _ in range(rng.randint(1, 4)):
+            end_year = year + rng.randint(1, 4)
+            experience.append({
+                "Role": rng.choice(ROLES),
+                "Company": f"Company {rng.randint(1, 500)}",
+                "Duration": f"{year}-{rng.randint(1, 12):02d} - {end_year}-{rng.randint(1, 12):02d}",
+                "Responsibilities": ["Developed web application features", "Maintained backend services"]
+            })
+            year = end_year
+
+        resume = {
+            "Name": f"Employee {i}",
+            "Skills": rng.sample(SKILLS, rng.randint(2, 6)),
+            "Experience": experience,
+            "Education": [{"Degree": "B.S. Computer Science", "Institution": "University"}]
+        }
+        resumes.append(FeatureMaterializer.materialize(resume))
+
+    return resumes
+
+
+def get_database(uri):
+    """Return a benchmark database on a real server or on mongomock."""
+    if uri:
+        from pymongo import MongoClient
+        return MongoClient(uri)['KPIResearchBenchmark']
+
+    import mongomock
+    return mongomock.MongoClient()['KPIResearchBenchmark']
+
+
+def time_call(func):
+    """Run func once and return (result, elapsed seconds)."""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def legacy_match(collection):
+    """Previous path: fetch every full resume, then score and filter in Python."""
+    employees = list(collection.find({}))
+    ranked = CandidateRanker.rank_candidates(employees, PROJECT_CRITERIA)
+    ranked = [c for c in ranked if c['scores']['experience_relevance'] >= 0.7 and c['scores']['skill_match'] > 0]
+    return len(employees), ranked
+
+
+def planned_match(collection):
+    """Planned path: fetch only plausible candidates with only the scoring fields."""
+    query_plan = CandidateQueryPlanner.plan(PROJECT_CRITERIA)
+    employees = list(collection.find(query_plan['filter'], query_plan['projection']))
+    ranked = CandidateRanker.rank_candidates(employees, PROJECT_CRITERIA)
+    ranked = [c for c in ranked if c['scores']['experience_relevance'] >= 0.7 and c['scores']['skill_match'] > 0]
+    return len(employees), ranked
+
+
+def run_benchmark(count, uri):
+    """Load a synthetic collection and time both candidate fetch strategies."""
+    db = get_database(uri)
+    collection = db['Resumes']
+    collection.drop()
+
+    print(f"Generating {count} synthetic resumes...")
+    collection.insert_many(generate_resumes(count))
+    for field in CandidateQueryPlanner.INDEXES:
+        collection.create_index([(field, ASCENDING)])
+
+    (legacy_docs, legacy_ranked), legacy_time = time_call(lambda: legacy_match(collection))
+    (planned_docs, planned_ranked), planned_time = time_call(lambda: planned_match(collection))
+
+    print(f"  Full scan:   {legacy_docs:>7} documents fetched, {len(legacy_ranked)} matches, {legacy_time:.2f}s")
+    print(f"  Pushed down: {planned_docs:>7} documents fetched, {len(planned_ranked)} matches, {planned_time:.2f}s")
+    print(f"  Speedup: {legacy_time / planned_time:.1f}x")
+
+    top_legacy = [str(c['candidate']['_id']) for c in legacy_ranked[:PROJECT_CRITERIA['people_count']]]
+    top_planned = [str(c['candidate']['_id']) for c in planned_ranked[:PROJECT_CRITERIA['people_count']]]
+    print(f"  Same top {PROJECT_CRITERIA['people_count']}: {top_legacy == top_planned}")
+
+    collection.drop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark MongoDB candidate pre-filtering')
+    parser.add_argument('--resumes', type=int, default=100000, help='Number of synthetic resumes')
+    parser.add_argument('--uri', default=None, help='MongoDB URI (defaults to in-memory mongomock)')
+
+    args = parser.parse_args()
+
+    run_benchmark(args.resumes, args.uri)
@@ -35,7 +35,8 @@ def init_database(drop_existing=False, sample_data=False):
     # Drop existing collections if requested
     if drop_existing:
         print("Dropping existing collections...")
-        for collection in ['Resumes', 'Projects', 'ProjectKPIs', 'DevelopmentPlans']:
+        for collection in ['Resumes', 'Projects', 'ProjectKPIs', 'KPIHistory', 'KPIRollups', 'DevelopmentPlans',
+                           'WeightProfiles', 'Allocations']:
             db.drop_collection(collection)
             print(f"  Dropped collection: {collection}")
 
@@ -45,6 +46,14 @@ def init_database(drop_existing=False, sample_data=False):
     resumes_collection.create_index([('Name', ASCENDING)], background=True)
     resumes_collection.create_index([('Skills', ASCENDING)], background=True)
 
+    # Index the materialized features that candidate queries filter on
+    from modules.employee_matching.query_planner import CandidateQueryPlanner
+    for field in CandidateQueryPlanner.INDEXES:
+        resumes_collection.create_index([(field, ASCENDING)], background=True)
+
+    # Backfill materialized features on resumes written before they existed
+    materialize_resume_features(db)
+
     # Create Projects collection with indexes
     print("Setting up Projects collection...")
     projects_collection = db['Projects']
@@ -58,18 +67,88 @@ def init_database(drop_existing=False, sample_data=False):
     kpis_collection = db['ProjectKPIs']
     kpis_collection.create_index([('project_id', ASCENDING)], unique=True, background=True)
 
+    # Create KPIHistory collection with indexes for appending to and range-reading history buckets
+    print("Setting up KPIHistory collection...")
+    history_collection = db['KPIHistory']
+    history_collection.create_index([('project_id', ASCENDING), ('count', ASCENDING)], background=True)
+    history_collection.create_index([('project_id', ASCENDING), ('first', ASCENDING), ('last', ASCENDING)],
+                                    background=True)
+
     # Create DevelopmentPlans collection with indexes
     print("Setting up DevelopmentPlans collection...")
     plans_collection = db['DevelopmentPlans']
     plans_collection.create_index([('employee_id', ASCENDING)], background=True)
 
+    # Create WeightProfiles collection with indexes
+    print("Setting up WeightProfiles collection...")
+    profiles_collection = db['WeightProfiles']
+    profiles_collection.create_index([('name', ASCENDING)], unique=True, background=True)
+    profiles_collection.create_index([('project_type', ASCENDING)], background=True)
+
+    # Create Allocations collection with indexes
+    print("Setting up Allocations collection...")
+    allocations_collection = db['Allocations']
+    allocations_collection.create_index([('employee_id', ASCENDING), ('project_id', ASCENDING)],
+                                        unique=True, background=True)
+    allocations_collection.create_index([('project_id', ASCENDING)], background=True)
+
+    # Record allocations for teams staffed before allocations were tracked
+    build_allocations(db)
+
     # Insert sample data if requested
     if sample_data:
         insert_sample_data(db)
 
+    # Recompute the portfolio KPI rollups from every project's KPIs
+    print("Setting up KPIRollups collection...")
+    build_kpi_rollups(db)
+
     print("Database initialization complete!")
 
 
+def materialize_resume_features(db):
+    """Derive matching features for resumes that are missing them or have a stale version."""
+    from modules.employee_matching.feature_materializer import FeatureMaterializer
+
+    updated = 0
+
+    for resume in db['Resumes'].find(FeatureMaterializer.stale_query()):
+        FeatureMaterializer.materialize(resume)
+        db['Resumes'].update_one({'_id': resume['_id']}, {'$set': {'_derived': resume['_derived']}})
+        updated += 1
+
+    print(f"  Materialized matching features for {updated} resumes")
+
+
+def build_allocations(db):
+    """Rebuild the Allocations collection from every project's team."""
+    from modules.employee_matching.allocation_index import AllocationIndex
+
+    entries = []
+    for project in db['Projects'].find({}):
+        entries.extend(AllocationIndex.build_entries(project))
+
+    db['Allocations'].delete_many({})
+    if entries:
+        db['Allocations'].insert_many(entries)
+
+    # Make running workers reload their allocation index
+    db['Versions'].update_one({'_id': 'Allocations'}, {'$inc': {'version': 1}}, upsert=True)
+
+    print(f"  Recorded {len(entries)} project allocations")
+
+
+def build_kpi_rollups(db):
+    """Rebuild the portfolio KPI rollups from every project's KPIs."""
+    from modules.kpi_generation.kpi_rollups import KPIRollups
+
+    kpi_docs = list(db['ProjectKPIs'].find({}, {'kpis': 1}))
+    rollup = KPIRollups.build([kpi_doc.get('kpis') for kpi_doc in kpi_docs])
+    db[KPIRollups.COLLECTION].update_one({'_id': KPIRollups.PORTFOLIO_ID}, {'$set': rollup}, upsert=True)
+
+    print(f"  Rolled up KPIs of {rollup['projects']} projects")
+
+
 def insert_sample_data(db):
     """Insert sample data for development and testing purposes."""
     print("Adding sample data...")
@@ -182,6 +261,11 @@ def insert_sample_data(db):
         }
     ]
 
+    # Materialize matching features the same way the API does on write
+    from modules.employee_matching.feature_materializer import FeatureMaterializer
+    for resume in sample_resumes:
+        FeatureMaterializer.materialize(resume)
+
     # Insert sample resume data
     if db['Resumes'].count_documents({}) == 0:
         db['Resumes'].insert_many(sample_resumes)
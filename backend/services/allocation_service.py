@@ -0,0 +1,84 @@
+import threading
+
+from services.mongodb_service import mongodb_service
+from modules.employee_matching.allocation_index import AllocationIndex
+
+
+class AllocationService:
+    """
+    Service keeping the Allocations collection and the in-memory AllocationIndex in step.
+    The index is loaded from MongoDB and updated per project on team changes. Every write
+    bumps the collection's version, so each worker process reloads the index when another
+    process changed allocations.
+    """
+
+    COLLECTION = 'Allocations'
+
+    def __init__(self):
+        """Initialize the service with an index that is loaded lazily."""
+        self.index = AllocationIndex()
+        self._version = None
+        self._lock = threading.RLock()
+
+    def get_index(self):
+        """Get the allocation index, reloading it from MongoDB if allocations changed since it was loaded."""
+        version = mongodb_service.get_version(self.COLLECTION)
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self.index.load(mongodb_service.find_many(self.COLLECTION, projection={'_id': 0}))
+                    self._version = version
+
+        return self.index
+
+    def _written(self, version):
+        """Record that this process applied its own write, unless another process also wrote meanwhile."""
+        with self._lock:
+            if self._version is not None and version == self._version + 1:
+                self._version = version
+
+    def sync_project(self, project):
+        """
+        Record the allocations implied by a project's current team.
+
+        Args:
+            project: Project document, including its updated 'team'.
+
+        Returns:
+            list: IDs of employees who are no longer allocated to the project.
+        """
+        project_id = str(project['_id'])
+        entries = AllocationIndex.build_entries(project)
+        index = self.get_index()
+
+        collection = mongodb_service.get_collection(self.COLLECTION)
+        collection.delete_many({
+            'project_id': project_id,
+            'employee_id': {'$nin': [entry['employee_id'] for entry in entries]}
+        })
+        mongodb_service.bulk_update(self.COLLECTION, [
+            ({'employee_id': entry['employee_id'], 'project_id': project_id}, {'$set': dict(entry)})
+            for entry in entries
+        ], upsert=True)
+        version = mongodb_service.bump_version(self.COLLECTION)
+
+        # Hold the lock so a concurrent reload can't interleave with this update
+        with self._lock:
+            released = index.sync_project(project_id, entries)
+            self._written(version)
+        return released
+
+    def remove_project(self, project_id):
+        """Remove every allocation to a deleted project."""
+        index = self.get_index()
+
+        mongodb_service.get_collection(self.COLLECTION).delete_many({'project_id': str(project_id)})
+        version = mongodb_service.bump_version(self.COLLECTION)
+
+        with self._lock:
+            index.remove_project(project_id)
+            self._written(version)
+
+
+# Singleton instance of allocation service
+allocation_service = AllocationService()
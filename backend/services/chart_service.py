@@ -2,8 +2,10 @@ import matplotlib.pyplot as plt
 import os
 import numpy as np
 from datetime import datetime
-import random
 from config import active_config
+from modules.kpi_generation.kpi_model import KPI
+from modules.kpi_generation.project_scheduler import ScheduledTask
+from utils.seeding import get_rng
 
 
 class ChartService:
@@ -43,10 +45,8 @@ class ChartService:
         fig, ax = plt.subplots(figsize=(14, 10))
 
         # Extract tasks and sort by start day
-        tasks = [(task["Task"],
-                  int(task["Start"].split(" ")[1]),
-                  int(task["End"].split(" ")[1]))
-                 for task in gantt_data]
+        tasks = [(task.name, task.start_day, task.end_day)
+                 for task in map(ScheduledTask.from_dict, gantt_data)]
 
         # Sort tasks by start date and then by task name
         tasks.sort(key=lambda x: (x[1], x[0]))
@@ -145,6 +145,9 @@ class ChartService:
         Returns:
             str: Path to the generated chart image.
         """
+        # Seed the simulated progress from the project and chart parameters
+        rng = get_rng(project_id, 'burndown', timeline, sprints)
+
         # Calculate key parameters
         sprint_days = timeline // sprints
         x = [i * sprint_days for i in range(sprints + 1)]
@@ -165,11 +168,11 @@ class ChartService:
                                                                                                              sprints // 2) * sprint_days * 1.3,
             # Fast start, slow finish
             "consistent_delay": lambda i, sprint_days: i * sprint_days * 0.85,  # Consistently behind
-            "intermittent": lambda i, sprint_days: i * sprint_days + random.randint(-10, 5)  # Variable progress
+            "intermittent": lambda i, sprint_days: i * sprint_days + rng.randint(-10, 5)  # Variable progress
         }
 
         # Select a random pattern
-        selected_pattern = random.choice(list(patterns.keys()))
+        selected_pattern = rng.choice(list(patterns.keys()))
         pattern_func = patterns[selected_pattern]
 
         # Generate actual burndown based on selected pattern
@@ -248,6 +251,9 @@ class ChartService:
         Returns:
             str: Path to the generated chart image.
         """
+        # Seed the simulated velocities from the project and chart parameters
+        rng = get_rng(project_id, 'velocity', sprints, team_size)
+
         # Calculate expected velocity based on team size and typical per-developer velocity
         expected_velocity = team_size * 10
 
@@ -257,15 +263,15 @@ class ChartService:
         # Generate velocity patterns
         velocity_patterns = {
             "improving": [expected_velocity * (0.7 + 0.1 * i) for i in range(sprints)],  # Team improves over time
-            "consistent": [expected_velocity + random.randint(-5, 5) for _ in range(sprints)],
+            "consistent": [expected_velocity + rng.randint(-5, 5) for _ in range(sprints)],
             # Consistent with minor variations
-            "variable": [expected_velocity * random.uniform(0.7, 1.3) for _ in range(sprints)],  # More variable
+            "variable": [expected_velocity * rng.uniform(0.7, 1.3) for _ in range(sprints)],  # More variable
             "declining": [expected_velocity * (1.1 - 0.05 * i) for i in range(sprints)]
             # Declining (e.g., increasing complexity)
         }
 
         # Choose a pattern
-        selected_pattern = random.choice(list(velocity_patterns.keys()))
+        selected_pattern = rng.choice(list(velocity_patterns.keys()))
         velocities = velocity_patterns[selected_pattern]
 
         # Round velocities to integers
@@ -344,40 +350,17 @@ class ChartService:
         Returns:
             str: Path to the generated chart image.
         """
-        # Calculate average scores for each KPI category
-        categories = list(kpis.keys())
+        # Calculate average scores for each KPI category, scoring each KPI by its status
+        kpi_list = KPI.parse_all(kpis)
+        categories = [category for category, category_kpis in kpis.items()
+                      if isinstance(category_kpis, dict) and not category.startswith('_')]
         scores = []
 
         for category in categories:
-            category_kpis = kpis[category]
-            category_score = 0
-            kpi_count = 0
-
-            # Track individual KPI scores for detailed display
-            kpi_scores = {}
-
-            for kpi_name, kpi_data in category_kpis.items():
-                status = kpi_data.get('status', '')
-
-                # Convert status to score
-                if status == 'On Track':
-                    kpi_score = 1.0
-                elif status == 'At Risk':
-                    kpi_score = 0.6
-                elif status == 'Below Target':
-                    kpi_score = 0.3
-                else:
-                    kpi_score = 0.5  # Default for unknown status
-
-                # Store individual KPI score
-                kpi_scores[kpi_name] = kpi_score
-
-                # Add to category total
-                category_score += kpi_score
-                kpi_count += 1
+            kpi_scores = [kpi.status_score for kpi in kpi_list if kpi.category == category]
 
             # Calculate average score for the category
-            avg_score = category_score / kpi_count if kpi_count > 0 else 0
+            avg_score = sum(kpi_scores) / len(kpi_scores) if kpi_scores else 0
             scores.append(avg_score)
 
         # Number of variables/categories
@@ -540,6 +523,9 @@ class ChartService:
         Returns:
             str: Path to the generated chart image.
         """
+        # Seed the simulated task flow from the project and chart parameters
+        rng = get_rng(project_id, 'cumulative_flow', timeline, sprints)
+
         # Generate days array
         days = np.arange(0, timeline + 1)
 
@@ -581,10 +567,10 @@ class ChartService:
             done_new = done_init + testing_to_done
 
             # Add some randomness to simulate real-world variation
-            backlog_new = max(0, backlog_new + random.uniform(-1, 1))
-            todo_new = max(0, todo_new + random.uniform(-0.5, 0.5))
-            in_progress_new = max(0, in_progress_new + random.uniform(-0.3, 0.3))
-            testing_new = max(0, testing_new + random.uniform(-0.2, 0.2))
+            backlog_new = max(0, backlog_new + rng.uniform(-1, 1))
+            todo_new = max(0, todo_new + rng.uniform(-0.5, 0.5))
+            in_progress_new = max(0, in_progress_new + rng.uniform(-0.3, 0.3))
+            testing_new = max(0, testing_new + rng.uniform(-0.2, 0.2))
 
             # Update state values
             backlog.append(backlog_new)
@@ -656,6 +642,9 @@ class ChartService:
         Returns:
             str: Path to the generated chart image.
         """
+        # Seed the simulated flow times from the project and chart parameters
+        rng = get_rng(project_id, 'lead_cycle_time', timeline, sprints)
+
         # Calculate sprint durations
         sprint_duration = timeline // sprints
         sprint_numbers = list(range(1, sprints + 1))
@@ -665,18 +654,18 @@ class ChartService:
         # Both typically decrease as the team improves, then may increase as complexity increases
 
         # Lead time (time from task creation to completion)
-        lead_time_pattern = random.choice(['improving', 'worsening', 'variable'])
+        lead_time_pattern = rng.choice(['improving', 'worsening', 'variable'])
 
         if lead_time_pattern == 'improving':
-            lead_times = [max(1, 8 - 0.8 * i + random.uniform(-0.5, 0.5)) for i in range(sprints)]
+            lead_times = [max(1, 8 - 0.8 * i + rng.uniform(-0.5, 0.5)) for i in range(sprints)]
         elif lead_time_pattern == 'worsening':
-            lead_times = [max(1, 3 + 0.7 * i + random.uniform(-0.5, 0.5)) for i in range(sprints)]
+            lead_times = [max(1, 3 + 0.7 * i + rng.uniform(-0.5, 0.5)) for i in range(sprints)]
         else:  # variable
-            lead_times = [max(1, 5 + random.uniform(-2, 2)) for i in range(sprints)]
+            lead_times = [max(1, 5 + rng.uniform(-2, 2)) for i in range(sprints)]
 
         # Cycle time (time from starting work to completion)
         # Typically lower than lead time and follows similar pattern
-        cycle_times = [max(0.5, lt * 0.6 + random.uniform(-0.3, 0.3)) for lt in lead_times]
+        cycle_times = [max(0.5, lt * 0.6 + rng.uniform(-0.3, 0.3)) for lt in lead_times]
 
         # Create the chart
         plt.figure(figsize=(12, 8))
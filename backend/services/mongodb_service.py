@@ -1,4 +1,4 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument, UpdateOne
 from config import active_config
 from utils.json_utils import serialize_mongo
 
@@ -6,6 +6,9 @@ from utils.json_utils import serialize_mongo
 class MongoDBService:
     """Service for MongoDB operations."""
 
+    # Version counters of data that processes cache in memory
+    VERSIONS_COLLECTION = 'Versions'
+
     def __init__(self, database_name=None):
         """Initialize MongoDB connection."""
         self.client = MongoClient(active_config.MONGO_URI)
@@ -41,10 +44,19 @@ class MongoDBService:
         results = list(cursor)
         return serialize_mongo(results) if serialize else results
 
-    def update_one(self, collection_name, query, update):
+    def update_one(self, collection_name, query, update, upsert=False):
         """Update a single document in the collection."""
         collection = self.get_collection(collection_name)
-        result = collection.update_one(query, update)
+        result = collection.update_one(query, update, upsert=upsert)
+        return result.modified_count
+
+    def bulk_update(self, collection_name, updates, upsert=False):
+        """Apply (query, update) pairs to the collection in a single round trip."""
+        if not updates:
+            return 0
+        collection = self.get_collection(collection_name)
+        result = collection.bulk_write([UpdateOne(query, update, upsert=upsert) for query, update in updates],
+                                       ordered=False)
         return result.modified_count
 
     def delete_one(self, collection_name, query):
@@ -53,6 +65,18 @@ class MongoDBService:
         result = collection.delete_one(query)
         return result.deleted_count
 
+    def get_version(self, name):
+        """Get the version counter of a cached dataset, 0 if it never changed."""
+        document = self.get_collection(self.VERSIONS_COLLECTION).find_one({'_id': name})
+        return document['version'] if document else 0
+
+    def bump_version(self, name):
+        """Increment the version counter of a cached dataset, so other processes reload it."""
+        document = self.get_collection(self.VERSIONS_COLLECTION).find_one_and_update(
+            {'_id': name}, {'$inc': {'version': 1}}, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        return document['version']
+
     def close(self):
         """Close the MongoDB connection."""
         self.client.close()
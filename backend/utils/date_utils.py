@@ -0,0 +1,242 @@
+import re
+from datetime import datetime
+
+import numpy as np
+
+# Words that mark an ongoing position (e.g., "2020 - Present")
+PRESENT_KEYWORDS = ('present', 'current', 'now', 'today', 'ongoing', 'date')
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'sept': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+# One alternative per supported date format, tried left to right at each position
+DATE_TOKEN_PATTERN = re.compile(
+    r"\b(?P<month_name>jan|feb|mar|apr|may|jun|jul|aug|sept|sep|oct|nov|dec)[a-z]*\.?,?\s*(?P<name_year>\d{4})"
+    r"|(?P<ym_year>\d{4})[-/.](?P<ym_month>\d{1,2})(?!\d)"
+    r"|(?P<my_month>\d{1,2})[-/.](?P<my_year>\d{4})"
+    r"|(?P<year>\d{4})"
+    r"|\b(?P<present>" + "|".join(PRESENT_KEYWORDS) + r")\b",
+    re.IGNORECASE
+)
+
+
+def to_month_index(year, month=1):
+    """
+    Convert a year and month to a month index (months since year 0).
+
+    Args:
+        year: Calendar year.
+        month: Calendar month (1-12).
+
+    Returns:
+        int: Month index.
+    """
+    return int(year) * 12 + int(month) - 1
+
+
+def month_index_to_date(month_index):
+    """
+    Convert a month index back to a datetime on the first of that month.
+
+    Args:
+        month_index: Month index as returned by to_month_index.
+
+    Returns:
+        datetime: First day of the month.
+    """
+    year, month = divmod(int(month_index), 12)
+    return datetime(year, month + 1, 1)
+
+
+def date_to_month_index(date):
+    """
+    Convert a date or datetime to a month index.
+
+    Args:
+        date: Date or datetime.
+
+    Returns:
+        int: Month index.
+    """
+    return to_month_index(date.year, date.month)
+
+
+def _token_to_month_index(match, now_index, is_end=False):
+    """
+    Convert a DATE_TOKEN_PATTERN match to a month index.
+    End tokens give the month after the range: a named or numeric end month and the current
+    month for "Present" count in full, while a year alone ends the range at that year's start.
+    """
+    if match.group('present'):
+        return now_index + 1 if is_end else now_index
+
+    if match.group('month_name'):
+        month_index = to_month_index(match.group('name_year'), MONTHS[match.group('month_name').lower()])
+        return month_index + 1 if is_end else month_index
+
+    if match.group('ym_year'):
+        year, month = match.group('ym_year'), int(match.group('ym_month'))
+    elif match.group('my_year'):
+        year, month = match.group('my_year'), int(match.group('my_month'))
+    else:
+        year, month = match.group('year'), 1
+
+    # Out-of-range months (e.g., "2019-13") fall back to the year alone
+    if not 1 <= month <= 12:
+        return to_month_index(year)
+
+    month_index = to_month_index(year, month)
+    return month_index + 1 if is_end and not match.group('year') else month_index
+
+
+def parse_date_range(duration, now=None):
+    """
+    Parse a duration string into a start and end month.
+
+    Handles years, numeric months ("2017-03", "03/2017"), month names ("Mar 2017",
+    "March, 2017"), any separator (hyphen, en dash, em dash, "to") and keywords such
+    as "Present" relative to the current date.
+
+    Args:
+        duration: Duration string (e.g., "Jan 2020 – Present").
+        now: Date used for "Present". Defaults to today.
+
+    Returns:
+        tuple: (start_month_index, end_month_index, is_current), or (None, None, False)
+               if the duration can't be parsed. The end is exclusive, so "Jan 2020 - Dec 2020"
+               covers 12 months.
+    """
+    if not duration or not isinstance(duration, str):
+        return None, None, False
+
+    now_index = date_to_month_index(now or datetime.now())
+
+    tokens = list(DATE_TOKEN_PATTERN.finditer(duration))
+    if len(tokens) < 2 or tokens[0].group('present'):
+        return None, None, False
+
+    start = _token_to_month_index(tokens[0], now_index)
+    end = _token_to_month_index(tokens[1], now_index, is_end=True)
+    is_current = bool(tokens[1].group('present'))
+
+    # Ranges ending before they start are treated as unparseable
+    if end < start:
+        return None, None, False
+
+    return start, end, is_current
+
+
+def parse_date_ranges(durations, now=None):
+    """
+    Parse a list of duration strings into start and end month arrays.
+
+    Args:
+        durations: List of duration strings.
+        now: Date used for "Present". Defaults to today.
+
+    Returns:
+        tuple: (starts, ends, is_current) arrays. Starts and exclusive ends are float month
+               indices, NaN where unparseable; is_current flags ranges ending at "Present".
+    """
+    now = now or datetime.now()
+
+    starts = np.full(len(durations), np.nan)
+    ends = np.full(len(durations), np.nan)
+    is_current = np.zeros(len(durations), dtype=bool)
+
+    for i, duration in enumerate(durations):
+        start, end, current = parse_date_range(duration, now)
+        if start is not None:
+            starts[i] = start
+            ends[i] = end
+            is_current[i] = current
+
+    return starts, ends, is_current
+
+
+def merge_intervals(starts, ends):
+    """
+    Merge overlapping month intervals.
+
+    Args:
+        starts: Array of interval start months. NaN entries are ignored.
+        ends: Array of exclusive interval end months.
+
+    Returns:
+        tuple: (merged_starts, merged_ends) arrays of disjoint intervals, sorted by start.
+    """
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+
+    valid = ~(np.isnan(starts) | np.isnan(ends))
+    starts, ends = starts[valid], ends[valid]
+
+    if starts.size == 0:
+        return starts, ends
+
+    order = np.argsort(starts, kind='stable')
+    starts, ends = starts[order], ends[order]
+
+    # An interval opens a new group when it starts after everything before it has ended
+    running_end = np.maximum.accumulate(ends)
+    new_group = np.empty(starts.size, dtype=bool)
+    new_group[0] = True
+    new_group[1:] = starts[1:] > running_end[:-1]
+
+    group_ids = np.cumsum(new_group) - 1
+    merged_starts = starts[new_group]
+    merged_ends = np.zeros(merged_starts.size)
+    np.maximum.at(merged_ends, group_ids, ends)
+
+    return merged_starts, merged_ends
+
+
+def total_months(starts, ends, merge_overlaps=True):
+    """
+    Calculate the total months covered by a set of month intervals.
+
+    Args:
+        starts: Array of interval start months. NaN entries are ignored.
+        ends: Array of exclusive interval end months.
+        merge_overlaps: Count overlapping periods only once.
+
+    Returns:
+        float: Total months.
+    """
+    if merge_overlaps:
+        starts, ends = merge_intervals(starts, ends)
+
+    return float(np.nansum(np.asarray(ends, dtype=float) - np.asarray(starts, dtype=float)))
+
+
+def total_years(starts, ends, merge_overlaps=True):
+    """
+    Calculate the total years covered by a set of month intervals.
+
+    Args:
+        starts: Array of interval start months. NaN entries are ignored.
+        ends: Array of exclusive interval end months.
+        merge_overlaps: Count overlapping periods only once.
+
+    Returns:
+        float: Total years, rounded to one decimal place.
+    """
+    return round(total_months(starts, ends, merge_overlaps) / 12.0, 1)
+
+
+def total_years_of_experience(durations, now=None, merge_overlaps=True):
+    """
+    Calculate total years of experience from a list of duration strings.
+
+    Args:
+        durations: List of duration strings.
+        now: Date used for "Present". Defaults to today.
+        merge_overlaps: Count overlapping jobs only once.
+
+    Returns:
+        float: Total years of experience.
+    """
+    starts, ends, _ = parse_date_ranges(durations, now)
+    return total_years(starts, ends, merge_overlaps)
@@ -5,7 +5,7 @@ class APIError(Exception):
     """Base class for API errors."""
 
     def __init__(self, message, status_code=None, payload=None):
-        super().__init__(self)
+        super().__init__(message)
         self.message = message
         self.status_code = status_code or 400
         self.payload = payload
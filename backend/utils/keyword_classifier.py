@@ -0,0 +1,124 @@
+import re
+
+# Keywords identifying the project type of an experience item
+PROJECT_TYPE_KEYWORDS = {
+    "Web Development": ["web", "frontend", "backend", "full stack", "website", "web application"],
+    "Mobile Development": ["mobile", "android", "ios", "app development", "mobile application"],
+    "Data Science": ["data science", "machine learning", "data analysis", "big data", "analytics"],
+    "Cloud": ["cloud", "aws", "azure", "gcp", "devops", "infrastructure"],
+    "Enterprise": ["enterprise", "erp", "crm", "business application", "saas"]
+}
+
+# Keywords grouping skills into categories, checked in order
+SKILL_CATEGORY_KEYWORDS = {
+    "programming": ["python", "java", "javascript", "c++", "c#", "ruby", "php"],
+    "frameworks": ["react", "angular", "vue", "django", "flask", "spring", "laravel"],
+    "databases": ["sql", "mongodb", "postgresql", "mysql", "oracle", "nosql"]
+}
+
+
+class KeywordClassifier:
+    """
+    Class for classifying text by the keywords it contains.
+    The keyword sets are compiled once into a single regex shaped like a prefix tree, so each
+    text is scanned once however many keywords there are. A text belongs to a category if any
+    of the category's keywords occurs in it as a case-insensitive substring.
+    """
+
+    def __init__(self, categories):
+        """
+        Compile a classifier.
+
+        Args:
+            categories: Dictionary mapping each category to its keywords, in priority order.
+        """
+        self.categories = list(categories)
+
+        trie = {}
+        keyword_categories = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                keyword_categories.setdefault(keyword, set()).add(category)
+
+                node = trie
+                for char in keyword:
+                    node = node.setdefault(char, {})
+                node[""] = {}
+
+        # The regex reports the longest keyword at each position; every shorter keyword
+        # starting there is a prefix of it, so its categories are folded in here
+        self._categories_by_keyword = {
+            keyword: {category for length in range(1, len(keyword) + 1)
+                      for category in keyword_categories.get(keyword[:length], ())}
+            for keyword in keyword_categories
+        }
+
+        # Lookahead so keywords overlapping each other are all found
+        self._pattern = re.compile(f"(?=({KeywordClassifier._trie_pattern(trie)}))") if trie else None
+
+    @staticmethod
+    def _trie_pattern(node):
+        """Build the regex matching the keywords below a prefix tree node, longest first."""
+        branches = [re.escape(char) + KeywordClassifier._trie_pattern(child)
+                    for char, child in sorted(node.items()) if char]
+
+        if not branches:
+            return ""
+
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+        return f"(?:{body})?" if "" in node else body
+
+    def classify(self, text):
+        """
+        Get the categories whose keywords occur in a text.
+
+        Args:
+            text: Text to classify.
+
+        Returns:
+            set: Matching categories.
+        """
+        return self.classify_many([text])[0]
+
+    def classify_many(self, texts):
+        """
+        Get the categories of many texts, e.g. every experience item of a resume, in one call.
+
+        Args:
+            texts: List of texts to classify.
+
+        Returns:
+            list: Set of matching categories for each text.
+        """
+        if self._pattern is None:
+            return [set() for _ in texts]
+
+        return [set().union(*[self._categories_by_keyword[keyword]
+                              for keyword in self._pattern.findall(text.lower())])
+                for text in texts]
+
+    def categorize(self, items, default="other"):
+        """
+        Group items by their first matching category.
+
+        Args:
+            items: List of strings, e.g. skills.
+            default: Category for items matching none.
+
+        Returns:
+            dict: Items per category, with every category and the default present.
+        """
+        grouped = {category: [] for category in self.categories}
+        grouped[default] = []
+
+        for item, matched in zip(items, self.classify_many(items)):
+            category = next((category for category in self.categories if category in matched), default)
+            grouped[category].append(item)
+
+        return grouped
+
+
+project_type_classifier = KeywordClassifier(PROJECT_TYPE_KEYWORDS)
+skill_category_classifier = KeywordClassifier(SKILL_CATEGORY_KEYWORDS)
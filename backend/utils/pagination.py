@@ -0,0 +1,91 @@
+import base64
+import hashlib
+import json
+
+from utils.error_handlers import ValidationError
+
+
+def make_fingerprint(*parts):
+    """
+    Build a short fingerprint of the inputs a result list was computed from.
+
+    Args:
+        *parts: JSON-serializable values, e.g. criteria and weights.
+
+    Returns:
+        str: Fingerprint that changes whenever any part changes.
+    """
+    source = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]
+
+
+def encode_cursor(offset, fingerprint):
+    """
+    Encode an opaque cursor pointing at an offset in a result list.
+
+    Args:
+        offset: Index of the first item of the next page.
+        fingerprint: Fingerprint of the result list.
+
+    Returns:
+        str: URL-safe cursor.
+    """
+    payload = json.dumps({'offset': offset, 'fingerprint': fingerprint})
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, fingerprint):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string.
+        fingerprint: Fingerprint of the current result list.
+
+    Returns:
+        int: Offset of the first item of the page.
+
+    Raises:
+        ValidationError: If the cursor is malformed or belongs to different results.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        offset = int(payload['offset'])
+    except (ValueError, KeyError, TypeError, AttributeError):
+        raise ValidationError("Invalid cursor")
+
+    if payload.get('fingerprint') != fingerprint or offset < 0:
+        raise ValidationError("Cursor does not belong to these results; restart without a cursor")
+
+    return offset
+
+
+def paginate(items, cursor=None, page_size=None, fingerprint=''):
+    """
+    Get one page of a result list.
+
+    Args:
+        items: Full result list.
+        cursor: Cursor from the previous page, or None for the first page.
+        page_size: Maximum number of items per page, or None for all remaining items.
+        fingerprint: Fingerprint of the result list.
+
+    Returns:
+        tuple: (page items, cursor for the next page or None if this is the last page)
+    """
+    offset = decode_cursor(cursor, fingerprint) if cursor else 0
+
+    if page_size is None:
+        end = len(items)
+    else:
+        try:
+            page_size = int(page_size)
+        except (TypeError, ValueError):
+            raise ValidationError("page_size must be an integer")
+        if page_size <= 0:
+            raise ValidationError("page_size must be greater than zero")
+        end = offset + page_size
+
+    next_cursor = encode_cursor(end, fingerprint) if end < len(items) else None
+
+    return items[offset:end], next_cursor
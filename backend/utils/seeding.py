@@ -0,0 +1,36 @@
+import hashlib
+import json
+import random
+
+from config import active_config
+
+
+def derive_seed(*parts):
+    """
+    Derive a stable RNG seed from a project id and the parameters a result depends on.
+
+    Args:
+        *parts: JSON-serializable values, e.g. project id, result kind and parameters.
+
+    Returns:
+        int: 64-bit seed that is the same for the same parts in every process.
+    """
+    source = json.dumps(parts, sort_keys=True, default=str)
+    return int.from_bytes(hashlib.sha256(source.encode('utf-8')).digest()[:8], 'big')
+
+
+def get_rng(*parts):
+    """
+    Get the random number generator for generating a result.
+
+    Args:
+        *parts: Project id, result kind and parameters, as for derive_seed.
+
+    Returns:
+        random.Random: Generator seeded from the parts, so identical inputs give identical
+                       results; the global random module if seeded generation is disabled.
+    """
+    if not getattr(active_config, 'SEEDED_GENERATION', True):
+        return random
+
+    return random.Random(derive_seed(*parts))